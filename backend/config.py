@@ -2,7 +2,7 @@
 Configuration settings for the news ingestion pipeline.
 """
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Dict, List, Optional
 import os
 
 
@@ -21,10 +21,56 @@ class Settings(BaseSettings):
     openai_model: str = "gpt-3.5-turbo"
     openai_max_tokens: int = 2000
     openai_temperature: float = 0.3
+    openai_fast_max_tokens: int = 600  # Fast pass (no long summary) on the standard route; scaled for other routes
+    progressive_enrichment: bool = True  # Publish fast fields first, long summary in a deferred task
+    openai_repair_attempts: int = 2  # Targeted re-asks for missing or invalid fields before giving up
+    openai_repair_max_tokens: int = 900
+    openai_input_token_budget: int = 1500  # Article text tokens per enrichment prompt
+    prompt_lead_sentences: int = 3  # Always kept when the text is cut to the budget
+    
+    # Model routing by article length, category guess and queue backlog
+    enrichment_routing_enabled: bool = True
+    enrichment_route_light_model: str = ""  # Empty uses openai_model
+    enrichment_route_light_max_tokens: int = 1200
+    enrichment_route_light_input_budget: int = 800
+    enrichment_route_heavy_model: str = ""
+    enrichment_route_heavy_max_tokens: int = 2000
+    enrichment_route_heavy_input_budget: int = 3000
+    enrichment_route_short_tokens: int = 600  # Articles up to this many tokens take the light route
+    enrichment_route_long_tokens: int = 3000  # and from this many the heavy route
+    enrichment_route_backlog_threshold: int = 200  # Queued messages before routes step down
+    enrichment_route_backlog_refresh_seconds: int = 15
+    enrichment_route_category_overrides: Dict[str, str] = {"recall": "standard", "regulation": "standard"}
+    openai_model_prices: Dict[str, List[float]] = {  # USD per 1K prompt / completion tokens
+        "gpt-3.5-turbo": [0.0005, 0.0015],
+        "gpt-4o-mini": [0.00015, 0.0006],
+        "gpt-4o": [0.005, 0.015],
+        "gpt-4-turbo": [0.01, 0.03],
+    }
+    
+    # OpenAI rate limiting, shared by all workers
+    openai_rate_limiter: str = "redis"  # redis, memory (per process) or off
+    openai_rpm_limit: int = 3500
+    openai_tpm_limit: int = 90000
+    openai_concurrency_initial: int = 8
+    openai_concurrency_min: int = 1
+    openai_concurrency_max: int = 64
+    openai_latency_target_seconds: float = 30.0  # Slower calls shrink the concurrency limit
+    openai_slot_ttl_seconds: int = 120  # Slots of crashed workers are reclaimed after this
+    openai_rate_limit_retries: int = 4
+    openai_backoff_base_seconds: float = 2.0
     
     # RSS settings
     rss_url: str = "https://news.google.com/rss/search?hl=en-US&gl=US&ceid=US:en&q=automotive"
     poll_interval_seconds: int = 120
+    feed_known_run_limit: int = 10  # Stop parsing after this many already-seen items
+    feed_known_window_hours: int = 72
+    
+    # Poller sharding
+    poller_sharding_enabled: bool = True
+    poller_lease_ttl_seconds: int = 30
+    poller_ring_replicas: int = 64
+    poller_source_lease_seconds: int = 300
     
     # API settings
     api_host: str = "0.0.0.0"
@@ -39,6 +85,102 @@ class Settings(BaseSettings):
     request_timeout: int = 30
     min_article_length: int = 250
     
+    # Scraper connection pool
+    scrape_shared_pool: bool = True
+    scrape_pool_size: int = 100
+    scrape_per_host_limit: int = 4
+    scrape_dns_cache_seconds: int = 300
+    scrape_keepalive_seconds: int = 30
+    scrape_politeness_delay_seconds: float = 0.5
+    
+    # Article download guards
+    scrape_max_bytes: int = 2_000_000
+    scrape_chunk_bytes: int = 65536
+    scrape_stop_after_article: bool = True
+    scrape_min_article_bytes: int = 10000  # Only stop at an </article> spanning this much HTML
+    
+    # Adaptive per-host timeouts and hedged requests
+    host_latency_window: int = 200
+    host_latency_min_samples: int = 20
+    scrape_connect_timeout_factor: float = 2.0  # x p95 time-to-response
+    scrape_read_timeout_factor: float = 3.0  # x p99 time-to-response
+    scrape_min_connect_timeout: float = 2.0
+    scrape_min_read_timeout: float = 5.0
+    scrape_hedging_enabled: bool = True
+    scrape_hedge_budget: float = 0.05  # Max share of requests that may be hedged
+    
+    # Per-domain scrape circuit breaker
+    breaker_failure_threshold: int = 3
+    breaker_base_cooldown_seconds: int = 300
+    breaker_max_cooldown_seconds: int = 86400
+    scrape_description_fallback: bool = True  # Use the feed description when a domain is in cool-down
+    description_fallback_min_length: int = 80
+    
+    # Text extraction (0 workers runs extraction inline on the event loop)
+    extraction_pool_workers: int = 2
+    extraction_queue_per_worker: int = 4
+    extraction_engine: str = "lxml"  # "lxml" (single parse) or "cascade"
+    extractor_skip_after_failures: int = 5  # Drop a method for a domain after this many straight misses
+    extractor_stats_refresh_seconds: int = 600
+    extractor_stats_ttl_days: int = 30  # Forget stale outcomes so site redesigns are relearned
+    
+    # Per-domain boilerplate stripping (paragraphs repeated across pages)
+    boilerplate_enabled: bool = True
+    boilerplate_min_pages: int = 5  # Distinct pages of a domain a paragraph must appear on
+    boilerplate_refresh_seconds: int = 600
+    boilerplate_ttl_days: int = 30  # Paragraphs not seen since are forgotten
+    
+    # Raw HTML blob store
+    html_store_backend: str = "gridfs"  # "gridfs" or "disk"
+    html_store_path: str = "./data/html"
+    html_compression_level: int = 9
+    html_retention_days: int = 30
+    
+    # Near-duplicate detection (MinHash + LSH over recent enrichments)
+    near_duplicate_enabled: bool = True
+    near_duplicate_threshold: float = 0.8
+    near_duplicate_num_perm: int = 128
+    near_duplicate_bands: int = 16  # 8 rows per band; candidate pairs from ~0.7 similarity
+    near_duplicate_shingle_words: int = 5
+    near_duplicate_window_hours: int = 72
+    
+    # Extractive enrichment fallback while OpenAI is throttled or down
+    fallback_mode: str = "auto"  # auto (by thresholds), on or off
+    fallback_queue_backlog: int = 1000  # Queued ai_processing messages that switch it on
+    fallback_error_rate: float = 0.5  # Share of failed OpenAI enrichments that switches it on
+    fallback_min_calls: int = 10  # Calls in the window before the error rate counts
+    fallback_error_window_minutes: int = 5
+    fallback_check_seconds: int = 15
+    fallback_upgrade_batch_size: int = 50  # Provisional articles re-enriched per upgrade run
+    
+    # Relevance pre-filter (local TF-IDF model, before AI enrichment)
+    relevance_filter_enabled: bool = True
+    relevance_drop_below: float = 0.15  # Scores are ~1.0 for a typical enriched article
+    relevance_deprioritize_below: float = 0.35
+    relevance_low_priority: int = 9  # Celery priority for low-relevance items (0 is highest)
+    relevance_training_size: int = 2000
+    relevance_min_training_documents: int = 50
+    relevance_vocabulary_size: int = 5000
+    relevance_min_document_frequency: int = 3
+    relevance_model_refresh_seconds: int = 3600
+    
+    # Batch enrichment (backfills and bursts)
+    batch_max_articles: int = 4  # Articles per request; bounded by the model's output limit
+    batch_article_token_budget: int = 600  # Longer articles are enriched one per request
+    batch_output_tokens_per_article: int = 900
+    batch_task_size: int = 20  # Articles per process_articles_batch task
+    batch_backfill_limit: int = 5000
+    
+    # Enrichment cache
+    enrichment_cache_enabled: bool = True
+    enrichment_cache_ttl_days: int = 30
+    
+    # Retention
+    article_archive_after_days: int = 90
+    archive_batch_size: int = 500
+    failed_fetch_retention_days: int = 14  # Longer than feed_known_window_hours so items aren't re-ingested
+    url_resolution_retention_days: int = 30
+    
     # Logging
     log_level: str = "INFO"
     
@@ -53,8 +53,14 @@ async def create_indexes():
     # Raw articles indexes
     await db.raw_articles.create_index("feed_item_id", unique=True)
     await db.raw_articles.create_index("source_id")
+    await db.raw_articles.create_index([("source_id", 1), ("last_seen", -1)])
     await db.raw_articles.create_index("created_at")
     await db.raw_articles.create_index("fetch_status")
+    await db.raw_articles.create_index(
+        "canonical_url",
+        unique=True,
+        partialFilterExpression={"canonical_url": {"$type": "string"}}
+    )
     
     # AI articles indexes
     await db.ai_articles.create_index("raw_article_id", unique=True)
@@ -65,11 +71,64 @@ async def create_indexes():
     await db.ai_articles.create_index("sentiment_label")
     await db.ai_articles.create_index("tags")
     await db.ai_articles.create_index([("industry", 1), ("category", 1), ("published_at", -1)])
+    await db.ai_articles.create_index(
+        "created_at", name="provisional_created_at", partialFilterExpression={"provisional": True}
+    )
+    
+    # MinHash fingerprints of recent enrichments, for near-duplicate reuse
+    await db.content_fingerprints.create_index("raw_article_id", unique=True)
+    await db.content_fingerprints.create_index("bands")
+    await db.content_fingerprints.create_index(
+        "created_at", expireAfterSeconds=settings.near_duplicate_window_hours * 3600
+    )
+    
+    # Cached enrichment results, keyed on text hash, model and prompt version
+    await db.enrichment_cache.create_index(
+        "created_at", expireAfterSeconds=settings.enrichment_cache_ttl_days * 86400
+    )
+    
+    # Archived AI articles (moved by workers.retention.archive_old_articles)
+    await db.ai_articles_archive.create_index("raw_article_id", unique=True)
+    await db.ai_articles_archive.create_index("created_at")
+    await db.ai_articles_archive.create_index([("industry", 1), ("category", 1), ("published_at", -1)])
+    
+    # Failed fetches carry an expire_at and are dropped by TTL
+    await db.raw_articles.create_index("expire_at", expireAfterSeconds=0)
     
     # Sources indexes
     await db.sources.create_index("name", unique=True)
     await db.sources.create_index("industry")
     
+    # Resolved redirect URL cache
+    await db.url_resolutions.create_index("source_key", unique=True)
+    await db.url_resolutions.create_index(
+        "resolved_at", expireAfterSeconds=settings.url_resolution_retention_days * 86400
+    )
+    
+    # Publisher directory indexes
+    await db.publishers.create_index("domain", unique=True)
+    
+    # Raw HTML blob metadata (pruned by workers.storage.prune_html_blobs)
+    await db.html_blobs.create_index("last_used_at")
+    await db.raw_articles.create_index("raw_html_ref", sparse=True)
+    
+    # Per-domain scrape circuit breaker
+    await db.domain_health.create_index("domain", unique=True)
+    
+    # Per-domain extraction outcomes; skipped methods age out and are retried
+    await db.extractor_stats.create_index([("domain", 1), ("method", 1)], unique=True)
+    await db.extractor_stats.create_index(
+        "updated_at", expireAfterSeconds=settings.extractor_stats_ttl_days * 86400
+    )
+    
+    # Learned per-domain boilerplate paragraphs and the tokens they saved
+    await db.boilerplate_paragraphs.create_index([("domain", 1), ("fingerprint", 1)], unique=True)
+    await db.boilerplate_paragraphs.create_index(
+        "last_seen", expireAfterSeconds=settings.boilerplate_ttl_days * 86400
+    )
+    await db.boilerplate_domains.create_index("domain", unique=True)
+    await db.boilerplate_domains.create_index("tokens_saved")
+    
     # App config indexes
     await db.app_config.create_index("config_name", unique=True)
 
@@ -4,7 +4,7 @@ FastAPI application for news ingestion pipeline.
 from fastapi import FastAPI, HTTPException, Depends, Query, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from contextlib import asynccontextmanager
 import asyncio
 import json
@@ -17,6 +17,7 @@ from backend.models import (
     ArticleResponse, PaginatedResponse, WebSocketMessage,
     CategoryEnum, SentimentEnum
 )
+from utils.metrics import metrics_response
 from workers.celery_app import celery_app
 from workers.notifications import get_websocket_connections, add_websocket_connection, remove_websocket_connection
 
@@ -120,6 +121,13 @@ async def health_check():
         raise HTTPException(status_code=503, detail="Service unhealthy")
 
 
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics endpoint."""
+    body, content_type = metrics_response()
+    return Response(content=body, media_type=content_type)
+
+
 @app.get("/articles", response_model=PaginatedResponse)
 async def get_articles(
     industry: str = Query("automotive", description="Industry filter"),
@@ -129,7 +137,8 @@ async def get_articles(
     search: Optional[str] = Query(None, description="Search query"),
     page: int = Query(1, ge=1, description="Page number"),
     per_page: int = Query(50, ge=1, le=100, description="Items per page"),
-    sort: str = Query("latest", description="Sort order: latest, oldest, sentiment")
+    sort: str = Query("latest", description="Sort order: latest, oldest, sentiment"),
+    include_archive: bool = Query(False, description="Also search archived articles")
 ):
     """Get articles with filtering and pagination."""
     try:
@@ -165,17 +174,21 @@ async def get_articles(
             sort_field = "sentiment_score"
             sort_direction = -1
         
-        # Get total count
-        total = await db.ai_articles.count_documents(query)
+        skip = (page - 1) * per_page
+        
+        if include_archive:
+            total, articles = await _find_with_archive(db, query, sort_field, sort_direction, skip, per_page)
+        else:
+            # Get total count
+            total = await db.ai_articles.count_documents(query)
+            
+            # Get articles
+            cursor = db.ai_articles.find(query).sort(sort_field, sort_direction).skip(skip).limit(per_page)
+            articles = await cursor.to_list(length=per_page)
         
         # Calculate pagination
-        skip = (page - 1) * per_page
         pages = (total + per_page - 1) // per_page
         
-        # Get articles
-        cursor = db.ai_articles.find(query).sort(sort_field, sort_direction).skip(skip).limit(per_page)
-        articles = await cursor.to_list(length=per_page)
-        
         # Get URLs from raw articles
         article_responses = []
         for article in articles:
@@ -192,6 +205,8 @@ async def get_articles(
                 category=article["category"],
                 short_summary=article["short_summary"],
                 long_summary=article["long_summary"],
+                long_summary_status=article.get("long_summary_status", "ready"),
+                provisional=article.get("provisional", False),
                 sentiment_label=article["sentiment_label"],
                 sentiment_score=article["sentiment_score"],
                 entities=article["entities"],
@@ -214,8 +229,30 @@ async def get_articles(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+async def _find_with_archive(db, query: Dict[str, Any], sort_field: str, sort_direction: int,
+                             skip: int, limit: int):
+    """Count and page through hot and archived articles as one result set."""
+    union = {"$unionWith": {"coll": "ai_articles_archive", "pipeline": [{"$match": query}]}}
+    
+    counted = await db.ai_articles.aggregate([
+        {"$match": query}, union, {"$count": "total"}
+    ]).to_list(length=1)
+    total = counted[0]["total"] if counted else 0
+    
+    articles = await db.ai_articles.aggregate([
+        {"$match": query}, union,
+        {"$sort": {sort_field: sort_direction}},
+        {"$skip": skip},
+        {"$limit": limit}
+    ]).to_list(length=limit)
+    return total, articles
+
+
 @app.get("/articles/{article_id}", response_model=ArticleResponse)
-async def get_article(article_id: str):
+async def get_article(
+    article_id: str,
+    include_archive: bool = Query(False, description="Also look in archived articles")
+):
     """Get a specific article by ID."""
     try:
         from bson import ObjectId
@@ -223,6 +260,8 @@ async def get_article(article_id: str):
         db = await get_database()
         
         article = await db.ai_articles.find_one({"_id": ObjectId(article_id)})
+        if not article and include_archive:
+            article = await db.ai_articles_archive.find_one({"_id": ObjectId(article_id)})
         
         if not article:
             raise HTTPException(status_code=404, detail="Article not found")
@@ -241,6 +280,8 @@ async def get_article(article_id: str):
             category=article["category"],
             short_summary=article["short_summary"],
             long_summary=article["long_summary"],
+            long_summary_status=article.get("long_summary_status", "ready"),
+            provisional=article.get("provisional", False),
             sentiment_label=article["sentiment_label"],
             sentiment_score=article["sentiment_score"],
             entities=article["entities"],
@@ -309,9 +350,39 @@ async def get_stats():
         # Total articles
         total_articles = await db.ai_articles.count_documents({})
         
+        # Share of recent articles that reused a near-duplicate's enrichment
+        recent_duplicates = await db.ai_articles.count_documents({
+            "created_at": {"$gte": yesterday},
+            "duplicate_of": {"$exists": True}
+        })
+        
+        # Extractive fallback articles still waiting for an OpenAI upgrade
+        provisional_count = await db.ai_articles.count_documents({"provisional": True})
+        
+        # Enrichment cost and latency by model route over the last day
+        route_stats = await db.ai_articles.aggregate([
+            {"$match": {"created_at": {"$gte": yesterday}, "enrichment_route.route": {"$exists": True}}},
+            {"$group": {
+                "_id": "$enrichment_route.route",
+                "count": {"$sum": 1},
+                "avg_latency_seconds": {"$avg": "$enrichment_route.latency_seconds"},
+                "cost_usd": {"$sum": "$enrichment_route.cost_usd"}
+            }}
+        ]).to_list(length=None)
+        
         return {
             "total_articles": total_articles,
             "recent_articles": recent_count,
+            "recent_near_duplicate_rate": round(recent_duplicates / recent_count, 3) if recent_count else 0.0,
+            "provisional_articles": provisional_count,
+            "recent_enrichment_routes": {
+                item["_id"]: {
+                    "count": item["count"],
+                    "avg_latency_seconds": round(item["avg_latency_seconds"] or 0.0, 2),
+                    "cost_usd": round(item["cost_usd"], 4)
+                }
+                for item in route_stats
+            },
             "category_distribution": {item["_id"]: item["count"] for item in category_stats},
             "sentiment_distribution": {item["_id"]: item["count"] for item in sentiment_stats},
             "websocket_connections": len(manager.active_connections),
@@ -362,6 +433,97 @@ async def reprocess_article(raw_article_id: str):
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+@app.post("/admin/enrich/backfill")
+async def backfill_enrichment(limit: Optional[int] = Query(None, ge=1, description="Maximum articles to queue")):
+    """Batch-enrich scraped articles that have no AI article yet (admin endpoint)."""
+    try:
+        from workers.ai_processor import backfill_enrichment
+        
+        task = backfill_enrichment.delay(limit)
+        
+        return {
+            "message": "Enrichment backfill triggered",
+            "task_id": task.id,
+            "timestamp": datetime.utcnow().isoformat()
+        }
+    
+    except Exception as e:
+        logger.error("Error triggering enrichment backfill", error=str(e))
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@app.post("/admin/relevance/train")
+async def train_relevance_model():
+    """Retrain the local relevance pre-filter (admin endpoint)."""
+    try:
+        from workers.ai_processor import train_relevance_model
+        
+        task = train_relevance_model.delay()
+        
+        return {
+            "message": "Relevance model training triggered",
+            "task_id": task.id,
+            "timestamp": datetime.utcnow().isoformat()
+        }
+    
+    except Exception as e:
+        logger.error("Error triggering relevance model training", error=str(e))
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@app.get("/admin/boilerplate")
+async def get_boilerplate_savings(limit: int = Query(20, ge=1, le=200, description="Number of domains")):
+    """Domains saving the most prompt tokens from boilerplate stripping (admin endpoint)."""
+    try:
+        db = await get_database()
+        
+        domains = await db.boilerplate_domains.find(
+            {}, {"_id": 0, "domain": 1, "pages_cleaned": 1, "paragraphs_stripped": 1, "tokens_saved": 1}
+        ).sort("tokens_saved", -1).limit(limit).to_list(length=limit)
+        
+        return {
+            "domains": domains,
+            "total_tokens_saved": sum(item.get("tokens_saved", 0) for item in domains),
+            "timestamp": datetime.utcnow().isoformat()
+        }
+    
+    except Exception as e:
+        logger.error("Error fetching boilerplate savings", error=str(e))
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@app.put("/admin/publishers/{domain}")
+async def set_publisher_name(domain: str, name: str = Query(..., min_length=1, description="Publisher display name")):
+    """Pin the publisher name used for a domain (admin endpoint)."""
+    try:
+        db = await get_database()
+        
+        domain = domain.lower()
+        if domain.startswith("www."):
+            domain = domain[4:]
+        
+        now = datetime.utcnow()
+        await db.publishers.update_one(
+            {"domain": domain},
+            {
+                "$set": {"name": name, "origin": "manual", "updated_at": now},
+                "$setOnInsert": {"created_at": now}
+            },
+            upsert=True
+        )
+        
+        return {
+            "message": "Publisher name updated",
+            "domain": domain,
+            "name": name,
+            "timestamp": now.isoformat()
+        }
+    
+    except Exception as e:
+        logger.error("Error updating publisher", domain=domain, error=str(e))
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
 @app.websocket("/ws/articles")
 async def websocket_endpoint(websocket: WebSocket):
     """WebSocket endpoint for real-time updates."""
@@ -80,12 +80,26 @@ class RawArticle(BaseModel):
     source_id: PyObjectId
     feed_item_id: str  # Unique identifier from RSS item
     url: str
+    canonical_url: Optional[str] = None  # Unique; one record per real article
+    feed_url: Optional[str] = None  # Link as it appeared in the feed, before redirect resolution
+    alias_feed_item_ids: List[str] = []  # Other feed items that pointed at this article
+    duplicate_of: Optional[PyObjectId] = None
+    title: Optional[str] = None
+    description: Optional[str] = None
+    publisher: Optional[str] = None
+    published_at: Optional[datetime] = None
     raw_xml_item: str
-    raw_html: Optional[str] = None
+    raw_html: Optional[str] = None  # Legacy inline copy; new pages use raw_html_ref
+    raw_html_ref: Optional[str] = None
+    raw_html_size: Optional[int] = None
     scraped_text: Optional[str] = None
     scraped_at: Optional[datetime] = None
-    fetch_status: Literal["fetched", "failed"] = "fetched"
+    fetch_status: Literal["fetched", "failed", "description_fallback"] = "fetched"
     fetch_error: Optional[str] = None
+    relevance_score: Optional[float] = None  # Local pre-filter score; ~1.0 is typical on-topic
+    relevance_decision: Optional[Literal["keep", "deprioritize", "drop"]] = None
+    boilerplate_tokens_saved: Optional[int] = None  # Tokens of learned site boilerplate stripped from scraped_text
+    expire_at: Optional[datetime] = None  # Set on failed fetches and dropped items; TTL-deleted
     created_at: datetime = Field(default_factory=datetime.utcnow)
     last_seen: datetime = Field(default_factory=datetime.utcnow)
 
@@ -106,12 +120,17 @@ class AIArticle(BaseModel):
     industry: str = "automotive"
     category: CategoryEnum
     short_summary: str = Field(..., max_length=600)  # <= 120 words
-    long_summary: str = Field(..., min_length=300, max_length=2500)  # 300-500 words
+    long_summary: str = Field("", max_length=2500)  # 300-500 words; empty until the deferred pass
+    long_summary_status: Literal["pending", "ready", "failed"] = "ready"
     sentiment_label: SentimentEnum
     sentiment_score: float = Field(..., ge=0.0, le=1.0)
     entities: List[Entity] = []
     tags: List[str] = []
     ai_raw_response: Dict[str, Any]
+    token_usage: Dict[str, int] = {}  # prompt_tokens / completion_tokens for this article's completion
+    enrichment_route: Dict[str, Any] = {}  # route, model, latency_seconds and cost_usd of the enrichment
+    duplicate_of: Optional[PyObjectId] = None  # AI article whose enrichment this near-duplicate reuses
+    provisional: bool = False  # Extractive fallback enrichment, upgraded by OpenAI later
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
@@ -147,6 +166,8 @@ class ArticleResponse(BaseModel):
     category: str
     short_summary: str
     long_summary: str
+    long_summary_status: str = "ready"
+    provisional: bool = False
     sentiment_label: str
     sentiment_score: float
     entities: List[Entity]
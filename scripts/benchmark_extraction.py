@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark the single-parse lxml extractor against the newspaper3k/readability/
+BeautifulSoup cascade on a recorded corpus of article pages.
+
+Each page is stored as NAME.html, with its URL in NAME.url. An optional
+NAME.txt holds hand-checked article text used as the quality reference;
+without it the two engines are scored against each other.
+
+Usage:
+    python scripts/benchmark_extraction.py --record urls.txt --corpus corpus/
+    python scripts/benchmark_extraction.py --corpus corpus/ --repeat 5
+"""
+import argparse
+import hashlib
+import re
+import statistics
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from utils.extraction import extract_text_cascade, extract_text_lxml
+from utils.http_pool import DEFAULT_HEADERS
+
+ENGINES = {"cascade": extract_text_cascade, "lxml": extract_text_lxml}
+TOKEN = re.compile(r"\w+")
+
+
+def record(url_file: Path, corpus: Path):
+    """Download each URL in url_file into the corpus directory."""
+    import requests
+    
+    corpus.mkdir(parents=True, exist_ok=True)
+    for url in url_file.read_text().split():
+        name = hashlib.sha256(url.encode()).hexdigest()[:16]
+        try:
+            response = requests.get(url, headers=DEFAULT_HEADERS, timeout=30)
+            response.raise_for_status()
+        except Exception as e:
+            print(f"skip {url}: {e}")
+            continue
+        (corpus / f"{name}.html").write_bytes(response.content)
+        (corpus / f"{name}.url").write_text(url)
+        print(f"recorded {url} -> {name}.html ({len(response.content)} bytes)")
+
+
+def token_f1(candidate: str, reference: str) -> float:
+    """Bag-of-tokens F1 between extracted and reference text."""
+    candidate_tokens = Counter(TOKEN.findall((candidate or "").lower()))
+    reference_tokens = Counter(TOKEN.findall((reference or "").lower()))
+    overlap = sum((candidate_tokens & reference_tokens).values())
+    if not overlap:
+        return 0.0
+    precision = overlap / sum(candidate_tokens.values())
+    recall = overlap / sum(reference_tokens.values())
+    return 2 * precision * recall / (precision + recall)
+
+
+def run(corpus: Path, repeat: int):
+    """Extract every page with both engines and print quality and CPU time."""
+    pages = sorted(corpus.glob("*.html"))
+    if not pages:
+        sys.exit(f"no .html pages in {corpus}")
+    
+    cpu = {name: [] for name in ENGINES}
+    quality = {name: [] for name in ENGINES}
+    failures = Counter()
+    
+    for page in pages:
+        html = page.read_bytes()
+        url_file = page.with_suffix(".url")
+        url = url_file.read_text().strip() if url_file.exists() else f"https://example.com/{page.stem}"
+        
+        outputs = {}
+        for name, engine in ENGINES.items():
+            timings = []
+            for _ in range(repeat):
+                start = time.process_time()
+                outputs[name] = engine(html, url)
+                timings.append(time.process_time() - start)
+            cpu[name].append(statistics.median(timings))
+            if not outputs[name]:
+                failures[name] += 1
+        
+        gold_file = page.with_suffix(".txt")
+        if gold_file.exists():
+            gold = gold_file.read_text()
+            for name in ENGINES:
+                quality[name].append(token_f1(outputs[name], gold))
+        else:
+            agreement = token_f1(outputs["lxml"], outputs["cascade"])
+            quality["lxml"].append(agreement)
+    
+    print(f"pages: {len(pages)}, repeats: {repeat}")
+    for name in ENGINES:
+        times = sorted(cpu[name])
+        p95 = times[min(len(times) - 1, int(len(times) * 0.95))]
+        scores = quality[name]
+        score = f"{statistics.mean(scores):.3f}" if scores else "n/a"
+        print(f"{name:>8}: cpu/page mean {statistics.mean(times) * 1000:7.1f} ms  "
+              f"p95 {p95 * 1000:7.1f} ms  failures {failures[name]:3d}  token F1 {score}")
+    if not any(page.with_suffix(".txt").exists() for page in pages):
+        print("(no .txt references; lxml F1 is agreement with the cascade)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", type=Path, required=True, help="directory of recorded pages")
+    parser.add_argument("--record", type=Path, help="file of URLs to download into the corpus first")
+    parser.add_argument("--repeat", type=int, default=3, help="timing repetitions per page")
+    args = parser.parse_args()
+    
+    if args.record:
+        record(args.record, args.corpus)
+    run(args.corpus, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Benchmark the streaming feed parser against the previous ElementTree parser.
+Reports throughput and peak memory on recorded (or synthetic) RSS feeds.
+
+Usage:
+    python scripts/benchmark_feed_parser.py recorded/*.xml
+    python scripts/benchmark_feed_parser.py --synthetic-items 20000
+"""
+import argparse
+import multiprocessing
+import re
+import resource
+import sys
+import time
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta
+from pathlib import Path
+from urllib.parse import urlparse
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from utils.feed_parser import iter_feed_items, parse_feed_date
+from utils.publishers import PublisherDirectory
+
+
+def _legacy_parse(content: bytes) -> int:
+    """The pre-streaming parser: decode to str, build the whole tree, dateutil + regex per item."""
+    from dateutil import parser as date_parser
+    
+    root = ET.fromstring(content.decode("utf-8"))
+    count = 0
+    for item in root.findall(".//item"):
+        title = item.findtext("title")
+        link = item.findtext("link")
+        description = item.findtext("description")
+        pub_date = item.findtext("pubDate")
+        if not title or not link:
+            continue
+        if pub_date:
+            date_parser.parse(pub_date)
+        for pattern in (r'via\s+([A-Za-z\s]+)', r'from\s+([A-Za-z\s]+)', r'by\s+([A-Za-z\s]+)'):
+            if description and re.search(pattern, description, re.IGNORECASE):
+                break
+        else:
+            urlparse(link).netloc
+        count += 1
+    return count
+
+
+def _streaming_parse(content: bytes) -> int:
+    """The streaming parser with fast-path dates and the publisher directory."""
+    publishers = PublisherDirectory()
+    
+    count = 0
+    for fields in iter_feed_items(content):
+        if fields["pub_date"]:
+            parse_feed_date(fields["pub_date"])
+        publishers.resolve(fields["source_name"], fields["source_url"],
+                           fields["description"], fields["link"])
+        count += 1
+    return count
+
+
+PARSERS = {"legacy": _legacy_parse, "streaming": _streaming_parse}
+
+
+def synthetic_feed(items: int) -> bytes:
+    """Build a Google News shaped RSS document with the given item count."""
+    start = datetime(2024, 1, 1)
+    parts = ['<?xml version="1.0" encoding="UTF-8"?>\n'
+             '<rss version="2.0" xmlns:media="http://search.yahoo.com/mrss/"><channel>'
+             '<title>"automotive" - Google News</title>']
+    for i in range(items):
+        published = (start + timedelta(minutes=i)).strftime("%a, %d %b %Y %H:%M:%S GMT")
+        parts.append(
+            f'<item><title>Automaker {i} announces new EV platform - Publisher {i % 50}</title>'
+            f'<link>https://news.google.com/rss/articles/CBMi{i:08d}?oc=5</link>'
+            f'<guid isPermaLink="false">CBMi{i:08d}</guid>'
+            f'<pubDate>{published}</pubDate>'
+            f'<description>&lt;a href="https://news.google.com/rss/articles/CBMi{i:08d}?oc=5"&gt;'
+            f'Automaker {i} announces new EV platform&lt;/a&gt;&amp;nbsp;&amp;nbsp;'
+            f'&lt;font color="#6f6f6f"&gt;Publisher {i % 50}&lt;/font&gt;</description>'
+            f'<source url="https://publisher{i % 50}.example.com">Publisher {i % 50}</source></item>'
+        )
+    parts.append("</channel></rss>")
+    return "".join(parts).encode("utf-8")
+
+
+def _measure(name: str, content: bytes, repeat: int, queue):
+    """Run one parser in a fresh process and report timing and peak RSS."""
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    parser = PARSERS[name]
+    parser(content)  # Warm up imports
+    
+    started = time.perf_counter()
+    for _ in range(repeat):
+        items = parser(content)
+    elapsed = (time.perf_counter() - started) / repeat
+    
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    queue.put((items, elapsed, max(0, peak_kb - baseline_kb)))
+
+
+def run(name: str, content: bytes, repeat: int):
+    """Measure a parser in an isolated child process."""
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    process = ctx.Process(target=_measure, args=(name, content, repeat, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("feeds", nargs="*", help="Recorded RSS/Atom files")
+    arg_parser.add_argument("--synthetic-items", type=int, default=0,
+                            help="Also benchmark a generated feed with this many items")
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    args = arg_parser.parse_args()
+    
+    inputs = [(path, Path(path).read_bytes()) for path in args.feeds]
+    if args.synthetic_items or not inputs:
+        items = args.synthetic_items or 10000
+        inputs.append((f"synthetic-{items}", synthetic_feed(items)))
+    
+    print(f"{'feed':<32}{'parser':<12}{'items':>8}{'ms':>10}{'items/s':>12}{'MB/s':>8}{'peak MB':>10}")
+    for label, content in inputs:
+        size_mb = len(content) / 1e6
+        for name in PARSERS:
+            items, elapsed, peak_kb = run(name, content, args.repeat)
+            print(f"{label[-31:]:<32}{name:<12}{items:>8}{elapsed * 1000:>10.1f}"
+                  f"{items / elapsed:>12.0f}{size_mb / elapsed:>8.1f}{peak_kb / 1024:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
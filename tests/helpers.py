@@ -0,0 +1,22 @@
+"""
+Shared test doubles for Motor collections.
+"""
+
+
+class AsyncCursor:
+    """Async iterator over canned documents, standing in for a Motor cursor."""
+    
+    def __init__(self, docs):
+        self.docs = list(docs)
+    
+    def limit(self, count):
+        self.docs = self.docs[:count]
+        return self
+    
+    def __aiter__(self):
+        return self
+    
+    async def __anext__(self):
+        if not self.docs:
+            raise StopAsyncIteration
+        return self.docs.pop(0)
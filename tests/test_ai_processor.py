@@ -164,6 +164,106 @@ class TestAIProcessor:
                 "Test Publisher"
             )
     
+    def test_parse_ai_response_fast_pass(self):
+        """Test parsing a fast-pass response without a long summary."""
+        processor = AIProcessor()
+        
+        fast_response = {
+            "ai_title": "Ford Recalls F-150 Trucks",
+            "category": "recall",
+            "short_summary": "Ford is recalling F-150 trucks over a brake defect.",
+            "sentiment_label": "negative",
+            "sentiment_score": 0.2,
+            "entities": [{"type": "company", "name": "Ford"}],
+            "tags": ["recall"]
+        }
+        
+        result = processor._parse_ai_response(
+            json.dumps(fast_response),
+            "Ford recalls trucks",
+            "Ford is recalling F-150 trucks.",
+            "https://example.com/ford",
+            "Test Publisher",
+            fast=True
+        )
+        
+        assert result["long_summary"] == ""
+        assert result["long_summary_status"] == "pending"
+        assert result["category"] == "recall"
+    
+    def test_create_prompt_fast_pass(self):
+        """Test the fast-pass prompt does not ask for a long summary."""
+        from utils.ai_processor import FAST_INSTRUCTIONS
+        processor = AIProcessor()
+        
+        prompt = processor._create_prompt("Title", "Some text.", "https://example.com/a", "Publisher", FAST_INSTRUCTIONS)
+        
+        assert "long_summary" not in prompt
+        assert "max 120 words" in prompt
+    
+    def test_cache_version_tracks_budgets(self):
+        """Results cached under other input or completion budgets are not reused."""
+        from utils.ai_processor import PROMPT_VERSION, settings
+        processor = AIProcessor()
+        
+        version = processor._cache_version(PROMPT_VERSION, 2000)
+        
+        assert version.startswith(PROMPT_VERSION)
+        assert processor._cache_version(PROMPT_VERSION, 600) != version
+        with patch.object(settings, "prompt_lead_sentences", 5):
+            assert processor._cache_version(PROMPT_VERSION, 2000) != version
+    
+    def test_route_scales_fast_pass_and_cache_version(self):
+        """Routes get their own fast-pass limit and never share cached results."""
+        from utils.ai_processor import PROMPT_VERSION, settings
+        from utils.model_router import Route
+        standard = AIProcessor()
+        light = AIProcessor(route=Route("light", standard.model, settings.openai_max_tokens // 2,
+                                        standard.route.input_budget))
+        
+        assert standard.fast_max_tokens == settings.openai_fast_max_tokens
+        assert light.fast_max_tokens == round(settings.openai_fast_max_tokens / 2)
+        assert light._cache_version(PROMPT_VERSION, 600) != standard._cache_version(PROMPT_VERSION, 600)
+    
+    def test_salvage_fields_truncated_response(self):
+        """Fields before the point where a response was cut off are still read."""
+        processor = AIProcessor()
+        
+        truncated = '{"ai_title": "Ford Recalls F-150 Trucks", "category": "recall", "long_summary": "Ford is recal'
+        
+        data = processor._salvage_fields(truncated)
+        
+        assert data == {"ai_title": "Ford Recalls F-150 Trucks", "category": "recall"}
+    
+    @pytest.mark.asyncio
+    async def test_repair_fields_reasks_only_failing_fields(self):
+        """Only the invalid long summary is re-asked and merged into the valid fields."""
+        processor = AIProcessor()
+        data = {
+            "ai_title": "Ford Recalls F-150 Trucks",
+            "category": "recall",
+            "long_summary": "Too short."
+        }
+        
+        repair_response = Mock()
+        repair_response.choices = [Mock()]
+        repair_response.choices[0].message.content = json.dumps({"long_summary": " ".join(["word"] * 320)})
+        repair_response.usage = Mock(prompt_tokens=400, completion_tokens=450, total_tokens=850)
+        
+        with patch.object(processor, '_complete', AsyncMock(return_value=repair_response)) as mock_complete:
+            merged, repaired, usage = await processor._repair_fields(
+                data, ["ai_title", "category", "long_summary"],
+                "Ford recalls trucks", "Ford is recalling F-150 trucks.", "https://example.com/ford", "Test Publisher"
+            )
+        
+        prompt = mock_complete.call_args[0][0]
+        assert '"long_summary"' in prompt
+        assert '"ai_title"' not in prompt
+        assert repaired == ["long_summary"]
+        assert len(merged["long_summary"].split()) == 320
+        assert merged["ai_title"] == "Ford Recalls F-150 Trucks"
+        assert usage == {"prompt_tokens": 400, "completion_tokens": 450}
+    
     def test_count_words(self):
         """Test word counting functionality."""
         processor = AIProcessor()
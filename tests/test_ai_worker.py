@@ -0,0 +1,98 @@
+"""
+Unit tests for the AI processing worker.
+"""
+import pytest
+from bson import ObjectId
+from unittest.mock import AsyncMock, Mock, patch
+import workers.ai_processor as ai_worker
+
+RAW_ID = ObjectId()
+TEXT = "Ford is recalling more than 10,000 F-150 pickup trucks because rear brake hoses can rupture. " * 5
+
+
+def _original(**fields):
+    """An enriched article a near-duplicate can reuse."""
+    return {
+        "_id": ObjectId(),
+        "similarity": 0.93,
+        "ai_title": "Ford Recalls F-150 Trucks",
+        "industry": "automotive",
+        "category": "recall",
+        "short_summary": "Ford is recalling F-150 trucks.",
+        "long_summary": "",
+        "long_summary_status": "pending",
+        "sentiment_label": "negative",
+        "sentiment_score": 0.3,
+        "entities": [],
+        "tags": ["recall"],
+        "ai_raw_response": {"model": "gpt-3.5-turbo"},
+        "token_usage": {"prompt_tokens": 900, "completion_tokens": 300},
+        "enrichment_route": {"route": "standard", "model": "gpt-3.5-turbo",
+                             "latency_seconds": 2.5, "cost_usd": 0.0012},
+        **fields
+    }
+
+
+def _db(original, current=None):
+    db = Mock()
+    db.ai_articles.find_one = AsyncMock(side_effect=[None, current or original])
+    db.ai_articles.insert_one = AsyncMock(return_value=Mock(inserted_id=ObjectId()))
+    db.ai_articles.update_one = AsyncMock()
+    db.raw_articles.find_one = AsyncMock(return_value={"_id": RAW_ID, "scraped_text": TEXT})
+    return db
+
+
+async def _process_copy(db, original):
+    """Run the worker on an article whose text near-duplicates original."""
+    with patch.object(ai_worker, "get_database", AsyncMock(return_value=db)), \
+         patch.object(ai_worker, "_find_enriched_duplicate", AsyncMock(return_value=original)), \
+         patch.object(ai_worker, "send_article_notification"), \
+         patch.object(ai_worker, "complete_long_summary") as complete_long_summary:
+        result = await ai_worker._process_article_with_ai_async(
+            str(RAW_ID), "Ford recalls pickups", "https://example.com/ford", "Wire", "2024-01-05T10:00:00Z"
+        )
+    
+    assert result["duplicate_of"] == str(original["_id"])
+    complete_long_summary.delay.assert_not_called()
+    return db.ai_articles.insert_one.call_args[0][0]
+
+
+class TestNearDuplicateCopies:
+    """Test cases for articles that reuse a near-duplicate's enrichment."""
+    
+    @pytest.mark.asyncio
+    async def test_copy_carries_no_cost(self):
+        """A copy paid for no completion, so it has no token usage or route stats."""
+        original = _original(long_summary="Summary.", long_summary_status="ready")
+        
+        copy = await _process_copy(_db(original), original)
+        
+        assert copy["duplicate_of"] == original["_id"]
+        assert copy["token_usage"] == {}
+        assert copy["enrichment_route"] == {}
+    
+    @pytest.mark.asyncio
+    async def test_copy_after_long_pass_finished_takes_summary(self):
+        """A copy inserted pending after the original's long pass completed is filled in."""
+        original = _original()
+        current = {"_id": original["_id"], "long_summary": "Ford is recalling... " * 50,
+                   "long_summary_status": "ready"}
+        db = _db(original, current)
+        
+        copy = await _process_copy(db, original)
+        
+        assert copy["long_summary_status"] == "pending"
+        query, update = db.ai_articles.update_one.call_args[0]
+        assert query["long_summary_status"] == "pending"
+        assert update["$set"]["long_summary_status"] == "ready"
+        assert update["$set"]["long_summary"] == current["long_summary"]
+    
+    @pytest.mark.asyncio
+    async def test_copy_of_pending_original_waits(self):
+        """While the original's long pass is still running its completion updates the copy."""
+        original = _original()
+        db = _db(original, {"_id": original["_id"], "long_summary_status": "pending"})
+        
+        await _process_copy(db, original)
+        
+        db.ai_articles.update_one.assert_not_called()
@@ -0,0 +1,85 @@
+"""
+Unit tests for packed multi-article enrichment requests.
+"""
+import json
+import pytest
+from unittest.mock import patch
+from backend.config import settings
+from utils.batch_enrichment import (
+    BatchItem, FakeBatchProvider, build_batch_prompt, is_batchable, pack_batches, run_batch,
+    split_batch_response
+)
+
+
+def _items(count):
+    return [
+        BatchItem(f"raw{index}", f"Title {index}", f"Automaker news story number {index}.",
+                  f"https://example.com/{index}", "Example News")
+        for index in range(count)
+    ]
+
+
+class TestPacking:
+    """Test cases for grouping and prompting."""
+    
+    def test_pack_batches_respects_max_articles(self):
+        """Requests hold at most batch_max_articles articles."""
+        with patch.object(settings, "batch_max_articles", 4):
+            batches = pack_batches(_items(10))
+        
+        assert [len(batch) for batch in batches] == [4, 4, 2]
+    
+    def test_long_articles_are_not_batchable(self):
+        """Articles over the per-article budget are left to the single path."""
+        long_item = _items(1)[0]._replace(text="word " * 5000)
+        
+        assert is_batchable(_items(1)[0])
+        assert not is_batchable(long_item)
+    
+    def test_prompt_numbers_articles(self):
+        """Every article appears under its batch-local id."""
+        prompt = build_batch_prompt(_items(3))
+        
+        assert "### Article 1" in prompt and "### Article 3" in prompt
+        assert "Title 2" in prompt
+
+
+class TestSplitBatchResponse:
+    """Test cases for mapping results back to raw_article_ids."""
+    
+    def test_maps_ids_and_ignores_unknown(self):
+        """Objects map by position id; unknown or malformed ids are dropped."""
+        batch = _items(2)
+        content = json.dumps({"articles": [
+            {"id": "2", "ai_title": "Second"},
+            {"id": "7", "ai_title": "Out of range"},
+            {"id": "x", "ai_title": "Malformed"},
+            {"id": 1, "ai_title": "First"}
+        ]})
+        
+        results = split_batch_response(content, batch)
+        
+        assert results == {"raw1": {"ai_title": "Second"}, "raw0": {"ai_title": "First"}}
+
+
+class TestRunBatch:
+    """Test cases for run_batch with the fake provider."""
+    
+    @pytest.mark.asyncio
+    async def test_every_article_comes_back(self):
+        """One request answers the whole batch."""
+        provider = FakeBatchProvider()
+        
+        results, usage = await run_batch(_items(3), provider)
+        
+        assert provider.calls == 1
+        assert set(results) == {"raw0", "raw1", "raw2"}
+        assert results["raw1"]["ai_title"] == "Fake enrichment of article 2"
+        assert usage["prompt_tokens"] > 0
+    
+    @pytest.mark.asyncio
+    async def test_missing_articles_are_absent(self):
+        """Articles the provider leaves out are absent, for the caller to retry singly."""
+        results, _ = await run_batch(_items(3), FakeBatchProvider(drop=1))
+        
+        assert set(results) == {"raw1", "raw2"}
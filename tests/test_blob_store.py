@@ -0,0 +1,107 @@
+"""
+Unit tests for the compressed raw HTML blob store.
+"""
+from datetime import datetime
+import pytest
+from unittest.mock import AsyncMock, Mock
+from utils.blob_store import DiskBlobBackend, HtmlBlobStore, compress, decompress, load_raw_html
+from tests.helpers import AsyncCursor
+
+PAGE = "<html><body>" + "<p>Automaker recalls 10,000 trucks over brake issue.</p>" * 200 + "</body></html>"
+
+
+def _mock_db(meta=None):
+    """Mock database exposing html_blobs and raw_articles."""
+    db = Mock()
+    db.html_blobs.find_one_and_update = AsyncMock(return_value=meta)
+    db.html_blobs.find_one = AsyncMock(return_value=meta)
+    db.html_blobs.update_one = AsyncMock()
+    db.html_blobs.delete_many = AsyncMock()
+    db.raw_articles.update_many = AsyncMock()
+    return db
+
+
+class TestCompression:
+    """Test cases for compress/decompress."""
+    
+    def test_round_trip(self):
+        """Compressed pages decompress to the original bytes and shrink."""
+        codec, payload = compress(PAGE.encode())
+        
+        assert decompress(codec, payload) == PAGE.encode()
+        assert len(payload) < len(PAGE) / 10
+
+
+class TestHtmlBlobStore:
+    """Test cases for HtmlBlobStore."""
+    
+    @pytest.mark.asyncio
+    async def test_put_and_get(self, tmp_path):
+        """Pages are stored under their content hash and read back lazily."""
+        backend = DiskBlobBackend(str(tmp_path))
+        db = _mock_db()
+        store = HtmlBlobStore(db, backend)
+        
+        key = await store.put(PAGE)
+        
+        assert len(key) == 64
+        meta = db.html_blobs.update_one.call_args.args[1]["$setOnInsert"]
+        assert meta["size"] == len(PAGE)
+        assert meta["stored_size"] < meta["size"]
+        
+        db.html_blobs.find_one.return_value = {"_id": key, "codec": meta["codec"]}
+        assert await store.get(key) == PAGE
+    
+    @pytest.mark.asyncio
+    async def test_identical_pages_are_stored_once(self, tmp_path):
+        """A page whose hash is already stored only refreshes last_used_at."""
+        backend = Mock()
+        backend.write = AsyncMock()
+        db = _mock_db(meta={"_id": "x", "codec": "zstd"})
+        
+        await HtmlBlobStore(db, backend).put(PAGE)
+        
+        backend.write.assert_not_called()
+        db.html_blobs.update_one.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_pruned_blob(self, tmp_path):
+        """References to pruned blobs load as None."""
+        store = HtmlBlobStore(_mock_db(), DiskBlobBackend(str(tmp_path)))
+        
+        assert await store.get("0" * 64) is None
+        assert await store.get(None) is None
+    
+    @pytest.mark.asyncio
+    async def test_prune(self, tmp_path):
+        """Stale blobs are deleted along with their references."""
+        backend = DiskBlobBackend(str(tmp_path))
+        db = _mock_db()
+        store = HtmlBlobStore(db, backend)
+        key = await store.put(PAGE)
+        batches = [[{"_id": key}], []]
+        db.html_blobs.find = Mock(side_effect=lambda *args: AsyncCursor(batches.pop(0)))
+        
+        assert await store.prune(datetime.utcnow()) == 1
+        
+        assert backend._read(key) is None
+        db.raw_articles.update_many.assert_awaited_once_with(
+            {"raw_html_ref": {"$in": [key]}}, {"$unset": {"raw_html_ref": ""}}
+        )
+
+
+class TestLoadRawHtml:
+    """Test cases for load_raw_html."""
+    
+    @pytest.mark.asyncio
+    async def test_legacy_inline_html(self):
+        """Documents from before the blob store still return their HTML."""
+        db = _mock_db()
+        
+        assert await load_raw_html(db, {"raw_html": PAGE}) == PAGE
+        db.html_blobs.find_one.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_no_html(self):
+        """Articles that were never fetched have no HTML."""
+        assert await load_raw_html(_mock_db(), {"url": "https://example.com/"}) is None
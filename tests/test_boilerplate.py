@@ -0,0 +1,123 @@
+"""
+Unit tests for per-domain boilerplate stripping.
+"""
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+import utils.boilerplate as boilerplate
+from utils.boilerplate import BoilerplateFilter, fingerprint, split_paragraphs
+from tests.helpers import AsyncCursor
+
+NEWSLETTER = "Sign up for our daily newsletter to get the latest automotive news in your inbox."
+RELATED = "Related: 10 best electric SUVs of 2024"
+STORY = (
+    "Ford is recalling more than 10,000 F-150 pickup trucks because rear brake hoses can rupture.\n\n"
+    f"{NEWSLETTER}\n\n"
+    "Dealers will replace the hoses free of charge, the automaker said.\n\n"
+    f"{RELATED}"
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_cache():
+    boilerplate._cache.clear()
+    yield
+    boilerplate._cache.clear()
+
+
+def _db(known):
+    db = Mock()
+    db.boilerplate_paragraphs.bulk_write = AsyncMock()
+    db.boilerplate_paragraphs.find = Mock(return_value=AsyncCursor({"fingerprint": key} for key in known))
+    db.boilerplate_domains.update_one = AsyncMock()
+    return db
+
+
+class TestFingerprint:
+    """Test cases for paragraph fingerprints."""
+    
+    def test_ignores_case_whitespace_and_numbers(self):
+        """Blurbs that differ only in dates or spacing share a fingerprint."""
+        assert fingerprint(RELATED) == fingerprint("related:  10 best electric SUVs of 2025")
+        assert fingerprint(RELATED) != fingerprint(NEWSLETTER)
+    
+    def test_split_paragraphs(self):
+        """Extracted text splits on blank lines."""
+        assert len(split_paragraphs(STORY)) == 4
+
+
+class TestBoilerplateFilter:
+    """Test cases for learning and stripping boilerplate."""
+    
+    @pytest.mark.asyncio
+    async def test_strips_known_paragraphs(self):
+        """Known boilerplate is removed, the story is kept and savings are recorded."""
+        db = _db([fingerprint(NEWSLETTER), fingerprint(RELATED)])
+        
+        cleaned, saved = await BoilerplateFilter(db).clean("example.com", STORY)
+        
+        assert NEWSLETTER not in cleaned
+        assert RELATED not in cleaned
+        assert cleaned.startswith("Ford is recalling")
+        assert "Dealers will replace" in cleaned
+        assert saved > 0
+        update = db.boilerplate_domains.update_one.call_args[0]
+        assert update[0] == {"domain": "example.com"}
+        assert update[1]["$inc"]["paragraphs_stripped"] == 2
+    
+    @pytest.mark.asyncio
+    async def test_observes_each_paragraph_once(self):
+        """Every distinct paragraph of a page counts once towards its domain."""
+        db = _db([])
+        
+        cleaned, saved = await BoilerplateFilter(db).clean("example.com", STORY + "\n\n" + RELATED)
+        
+        operations = db.boilerplate_paragraphs.bulk_write.call_args[0][0]
+        assert len(operations) == 4
+        assert saved == 0
+        assert cleaned == STORY + "\n\n" + RELATED
+    
+    @pytest.mark.asyncio
+    async def test_counts_pages_not_scrapes(self):
+        """Paragraph counts come from a set of page hashes, so re-scraping a URL adds nothing."""
+        db = _db([])
+        url = "https://example.com/ford-recall"
+        
+        await BoilerplateFilter(db).clean("example.com", STORY, url)
+        
+        operation = db.boilerplate_paragraphs.bulk_write.call_args[0][0][0]
+        pipeline = operation._doc
+        page_set = pipeline[0]["$set"]["page_hashes"]["$slice"][0]["$setUnion"]
+        assert page_set[1] == [boilerplate.page_hash(url)]
+        assert pipeline[1] == {"$set": {"pages": {"$size": "$page_hashes"}}}
+        assert "$inc" not in str(pipeline)
+    
+    @pytest.mark.asyncio
+    async def test_never_empties_a_page(self):
+        """A page made only of known paragraphs is left as it was."""
+        db = _db([fingerprint(NEWSLETTER)])
+        
+        cleaned, saved = await BoilerplateFilter(db).clean("example.com", NEWSLETTER)
+        
+        assert cleaned == NEWSLETTER
+        assert saved == 0
+    
+    @pytest.mark.asyncio
+    async def test_database_errors_keep_text(self):
+        """A failing database leaves the text untouched."""
+        db = _db([fingerprint(NEWSLETTER)])
+        db.boilerplate_paragraphs.bulk_write = AsyncMock(side_effect=Exception("down"))
+        
+        cleaned, saved = await BoilerplateFilter(db).clean("example.com", STORY)
+        
+        assert (cleaned, saved) == (STORY, 0)
+    
+    @pytest.mark.asyncio
+    async def test_disabled(self):
+        """Stripping can be switched off."""
+        db = _db([fingerprint(NEWSLETTER)])
+        
+        with patch.object(boilerplate.settings, "boilerplate_enabled", False):
+            cleaned, saved = await BoilerplateFilter(db).clean("example.com", STORY)
+        
+        assert (cleaned, saved) == (STORY, 0)
+        db.boilerplate_paragraphs.bulk_write.assert_not_called()
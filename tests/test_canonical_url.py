@@ -0,0 +1,78 @@
+"""
+Unit tests for URL canonicalization.
+"""
+from utils.canonical_url import canonicalize_url, extract_canonical_url, is_plausible_canonical
+
+
+class TestCanonicalizeUrl:
+    """Test cases for canonicalize_url."""
+    
+    def test_strips_tracking_params_only(self):
+        """Tracking parameters go, content parameters stay."""
+        url = "https://example.com/article?id=42&utm_source=google&fbclid=abc&page=2"
+        
+        assert canonicalize_url(url) == "https://example.com/article?id=42&page=2"
+    
+    def test_lowercases_host_and_drops_fragment_and_default_port(self):
+        """Scheme and host are case-insensitive; fragments never reach the server."""
+        url = "HTTPS://WWW.Example.COM:443/News/Story#comments"
+        
+        assert canonicalize_url(url) == "https://www.example.com/News/Story"
+    
+    def test_keeps_non_default_port(self):
+        """Explicit non-default ports are part of the identity."""
+        assert canonicalize_url("http://example.com:8080/a") == "http://example.com:8080/a"
+    
+    def test_query_order_is_normalized(self):
+        """Equivalent queries in a different order compare equal."""
+        assert canonicalize_url("https://example.com/a?b=2&a=1") == canonicalize_url("https://example.com/a?a=1&b=2")
+    
+    def test_empty_path(self):
+        """A bare host gets a root path."""
+        assert canonicalize_url("https://example.com") == "https://example.com/"
+
+
+class TestExtractCanonicalUrl:
+    """Test cases for extract_canonical_url."""
+    
+    def test_link_rel_canonical(self):
+        """rel=canonical is read and resolved against the page URL."""
+        html = '<html><head><link rel="canonical" href="/autos/story?utm_medium=x"></head><body></body></html>'
+        
+        assert extract_canonical_url(html, "https://example.com/amp/story") == "https://example.com/autos/story"
+    
+    def test_og_url_fallback(self):
+        """og:url is used when no canonical link exists."""
+        html = "<head><meta property='og:url' content='https://example.com/story'></head>"
+        
+        assert extract_canonical_url(html, "https://m.example.com/story") == "https://example.com/story"
+    
+    def test_ignores_body_links(self):
+        """Only the head is considered."""
+        html = '<head></head><body><link rel="canonical" href="https://other.com/x"></body>'
+        
+        assert extract_canonical_url(html, "https://example.com/story") is None
+    
+    def test_missing_html(self):
+        """Empty pages have no canonical URL."""
+        assert extract_canonical_url("", "https://example.com/") is None
+        assert extract_canonical_url(None, "https://example.com/") is None
+
+
+class TestIsPlausibleCanonical:
+    """Test cases for is_plausible_canonical."""
+    
+    def test_same_site_article(self):
+        """A canonical on the same host or a mobile/AMP subdomain is trusted."""
+        assert is_plausible_canonical("https://example.com/autos/story", "https://example.com/amp/story")
+        assert is_plausible_canonical("https://example.com/story", "https://m.example.com/story")
+    
+    def test_home_page_is_rejected(self):
+        """A canonical pointing at the home page would merge every article of the site."""
+        assert not is_plausible_canonical("https://example.com/", "https://example.com/autos/story")
+        assert not is_plausible_canonical("https://example.com", "https://example.com/autos/story")
+    
+    def test_other_host_is_rejected(self):
+        """A canonical on another site is not adopted."""
+        assert not is_plausible_canonical("https://other.com/autos/story", "https://example.com/autos/story")
+        assert not is_plausible_canonical("https://notexample.com/story", "https://example.com/story")
@@ -0,0 +1,133 @@
+"""
+Unit tests for the per-domain scrape circuit breaker.
+"""
+from datetime import datetime, timedelta
+import pytest
+from unittest.mock import AsyncMock, MagicMock, Mock
+from backend.config import settings
+from utils import circuit_breaker
+from utils.circuit_breaker import DomainCircuitBreaker, cooldown_for, counts_against_domain
+from utils.scraper import ArticleScraper
+
+
+def _mock_db(health=None, after_failure=None, claimed=None):
+    """Mock database exposing the domain_health collection."""
+    db = Mock()
+    db.domain_health.find_one = AsyncMock(return_value=health)
+    db.domain_health.update_one = AsyncMock(return_value=Mock(modified_count=1))
+    db.domain_health.find_one_and_update = AsyncMock(side_effect=[after_failure or claimed])
+    return db
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    circuit_breaker._open_until.clear()
+    yield
+    circuit_breaker._open_until.clear()
+
+
+class TestPolicy:
+    """Test cases for failure classification and cool-downs."""
+    
+    def test_blocking_statuses_count(self):
+        """Paywall and bot-blocking responses trip the breaker; missing pages do not."""
+        assert counts_against_domain("http_403")
+        assert counts_against_domain("http_429")
+        assert counts_against_domain("timeout")
+        assert not counts_against_domain("http_404")
+        assert not counts_against_domain(None)
+    
+    def test_exponential_cooldown(self):
+        """Cool-down doubles per failure past the threshold, up to the cap."""
+        threshold = settings.breaker_failure_threshold
+        base = settings.breaker_base_cooldown_seconds
+        
+        assert cooldown_for(threshold) == timedelta(seconds=base)
+        assert cooldown_for(threshold + 2) == timedelta(seconds=base * 4)
+        assert cooldown_for(threshold + 100) == timedelta(seconds=settings.breaker_max_cooldown_seconds)
+
+
+class TestDomainCircuitBreaker:
+    """Test cases for DomainCircuitBreaker."""
+    
+    @pytest.mark.asyncio
+    async def test_unknown_domain_is_allowed(self):
+        """Domains without history are scraped."""
+        assert await DomainCircuitBreaker(_mock_db()).allow("example.com")
+    
+    @pytest.mark.asyncio
+    async def test_open_domain_fails_fast(self):
+        """An open breaker blocks scrapes and is remembered in process."""
+        health = {"domain": "example.com", "state": "open", "open_until": datetime.utcnow() + timedelta(hours=1)}
+        db = _mock_db(health)
+        breaker = DomainCircuitBreaker(db)
+        
+        assert not await breaker.allow("example.com")
+        assert not await breaker.allow("example.com")
+        db.domain_health.find_one.assert_awaited_once()
+    
+    @pytest.mark.asyncio
+    async def test_half_open_lets_one_probe_through(self):
+        """After the cool-down one caller claims the probe."""
+        health = {"domain": "example.com", "state": "open", "open_until": datetime.utcnow() - timedelta(seconds=1)}
+        db = _mock_db(health, claimed=health)
+        
+        assert await DomainCircuitBreaker(db).allow("example.com")
+        update = db.domain_health.find_one_and_update.call_args.args[1]["$set"]
+        assert update["state"] == "half_open"
+    
+    @pytest.mark.asyncio
+    async def test_opens_at_threshold(self):
+        """Reaching the failure threshold opens the breaker."""
+        db = _mock_db(after_failure={"consecutive_failures": settings.breaker_failure_threshold})
+        breaker = DomainCircuitBreaker(db)
+        
+        await breaker.record_failure("example.com", "http_403")
+        
+        update = db.domain_health.update_one.call_args.args[1]["$set"]
+        assert update["state"] == "open"
+        assert update["open_until"] > datetime.utcnow()
+        assert not await breaker.allow("example.com")
+    
+    @pytest.mark.asyncio
+    async def test_below_threshold_stays_closed(self):
+        """Isolated failures only increment the counter."""
+        db = _mock_db(after_failure={"consecutive_failures": 1})
+        
+        await DomainCircuitBreaker(db).record_failure("example.com", "timeout")
+        
+        db.domain_health.update_one.assert_not_called()
+
+
+class TestScraperIntegration:
+    """Test cases for the breaker inside ArticleScraper."""
+    
+    @pytest.mark.asyncio
+    async def test_open_breaker_skips_request(self):
+        """No request is made while the domain cools down."""
+        breaker = Mock()
+        breaker.allow = AsyncMock(return_value=False)
+        session = Mock()
+        
+        async with ArticleScraper(session=session, circuit_breaker=breaker) as scraper:
+            result = await scraper.fetch_article("https://www.example.com/story")
+        
+        assert result == (None, None, False)
+        assert scraper.last_failure == "circuit_open"
+        breaker.allow.assert_awaited_once_with("example.com")
+        session.get.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_blocked_response_is_recorded(self, monkeypatch):
+        """A 403 counts against the domain."""
+        monkeypatch.setattr(settings, "scrape_politeness_delay_seconds", 0)
+        breaker = Mock()
+        breaker.allow = AsyncMock(return_value=True)
+        breaker.record_failure = AsyncMock()
+        session = Mock()
+        session.get = AsyncMock(return_value=MagicMock(status=403))
+        
+        async with ArticleScraper(session=session, circuit_breaker=breaker) as scraper:
+            await scraper.fetch_article("https://example.com/story")
+        
+        breaker.record_failure.assert_awaited_once_with("example.com", "http_403")
@@ -0,0 +1,51 @@
+"""
+Unit tests for the enrichment result cache.
+"""
+import pytest
+from unittest.mock import AsyncMock, Mock
+from utils.enrichment_cache import EnrichmentCache, cache_key
+
+TEXT = "Ford is recalling 10,000 F-150 trucks over a brake hose defect."
+
+
+class TestCacheKey:
+    """Test cases for cache_key."""
+    
+    def test_whitespace_does_not_change_key(self):
+        """Re-scraped text that differs only in whitespace hits the same entry."""
+        assert cache_key(TEXT, "gpt-3.5-turbo", "v1") == cache_key(f"  {TEXT.replace(' ', chr(10), 2)}\n", "gpt-3.5-turbo", "v1")
+    
+    def test_model_and_prompt_version_change_key(self):
+        """A new model or prompt template never reuses old results."""
+        key = cache_key(TEXT, "gpt-3.5-turbo", "v1")
+        
+        assert key != cache_key(TEXT, "gpt-4", "v1")
+        assert key != cache_key(TEXT, "gpt-3.5-turbo", "v2")
+        assert key != cache_key(TEXT + " Shares fell.", "gpt-3.5-turbo", "v1")
+
+
+class TestEnrichmentCache:
+    """Test cases for EnrichmentCache."""
+    
+    @pytest.mark.asyncio
+    async def test_put_then_get(self):
+        """Stored results are returned for the same input."""
+        data = {"ai_title": "Ford Recalls F-150 Trucks", "category": "recall"}
+        db = Mock()
+        db.enrichment_cache.replace_one = AsyncMock()
+        db.enrichment_cache.find_one = AsyncMock(return_value={"data": data})
+        cache = EnrichmentCache(db)
+        
+        await cache.put(TEXT, "gpt-3.5-turbo", "v1", data)
+        stored_key = db.enrichment_cache.replace_one.call_args[0][0]["_id"]
+        
+        assert await cache.get(TEXT, "gpt-3.5-turbo", "v1") == data
+        assert db.enrichment_cache.find_one.call_args[0][0] == {"_id": stored_key}
+    
+    @pytest.mark.asyncio
+    async def test_lookup_error_is_a_miss(self):
+        """A failing cache never blocks enrichment."""
+        db = Mock()
+        db.enrichment_cache.find_one = AsyncMock(side_effect=Exception("connection reset"))
+        
+        assert await EnrichmentCache(db).get(TEXT, "gpt-3.5-turbo", "v1") is None
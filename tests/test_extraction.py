@@ -0,0 +1,214 @@
+"""
+Unit tests for off-loop article text extraction.
+"""
+import asyncio
+import multiprocessing
+import os
+import pytest
+from backend.config import settings
+from utils import extraction
+from utils.extraction import (
+    extract_article_text, extract_text_async, extract_text_cascade, extract_text_lxml,
+    run_extraction, shutdown_extraction_pool,
+)
+
+def _extraction_pid(html, url, encoding="utf-8", order=None):
+    """Stands in for run_extraction, reporting the process it ran in."""
+    return extraction.ExtractionResult(str(os.getpid()), "pid", [])
+
+
+def _extract_in_daemon(results):
+    """Body of a daemonic process set up like a Celery prefork child."""
+    extraction.run_extraction = _extraction_pid
+    settings.extraction_pool_workers = 1
+    extraction.start_extraction_pool()
+    try:
+        result = asyncio.run(extract_text_async(b"<html></html>", "https://example.com/story"))
+        results.put((os.getpid(), result.text, extraction._pool_disabled))
+    finally:
+        shutdown_extraction_pool()
+
+
+PARAGRAPH = "The automaker said the new battery plant will employ two thousand workers and start production next year. "
+
+ARTICLE_HTML = f"""
+<html>
+    <head><title>Battery plant</title></head>
+    <body>
+        <nav>Home | Autos | EVs</nav>
+        <article>
+            <h1>Automaker opens battery plant</h1>
+            <p>{PARAGRAPH * 3}</p>
+            <p>{PARAGRAPH * 3}</p>
+        </article>
+        <footer>Copyright</footer>
+    </body>
+</html>
+"""
+
+
+class TestExtractArticleText:
+    """Test cases for extract_article_text."""
+    
+    def test_extracts_article_body(self):
+        """Article paragraphs are returned without page chrome."""
+        text = extract_article_text(ARTICLE_HTML.encode(), "https://example.com/story")
+        
+        assert text is not None
+        assert "battery plant will employ" in text
+        assert "Copyright" not in text
+    
+    def test_decodes_declared_encoding(self):
+        """Bytes are decoded with the response charset."""
+        html = ARTICLE_HTML.replace("Automaker", "Citroën").encode("latin-1")
+        
+        text = extract_article_text(html, "https://example.com/story", "latin-1")
+        
+        assert text is not None
+        assert "�" not in text
+    
+    def test_short_page(self):
+        """Pages without enough text yield None."""
+        html = b"<html><body><p>Too short.</p></body></html>"
+        
+        assert extract_article_text(html, "https://example.com/story") is None
+
+
+NOISY_HTML = f"""
+<html>
+    <body>
+        <header><nav><a href="/">Home</a> <a href="/ev">EVs</a></nav></header>
+        <div class="layout">
+            <div class="story-content">
+                <p>{PARAGRAPH * 2}</p>
+                <p>{PARAGRAPH * 2}</p>
+                <div class="ad-slot">Advertisement</div>
+            </div>
+            <aside class="sidebar"><p>{"Sidebar promo text that should never be included. " * 3}</p></aside>
+            <ul class="links">
+                <li><a href="/a">A related story about trucks and their sales figures</a></li>
+                <li><a href="/b">Another related story about recalls and suppliers</a></li>
+            </ul>
+            <div class="comments"><p>{"Reader comment that is long enough to score. " * 3}</p></div>
+        </div>
+    </body>
+</html>
+"""
+
+
+class TestExtractTextLxml:
+    """Test cases for the single-parse lxml engine."""
+    
+    def test_picks_article_container(self):
+        """Sidebars, comments, ads and link lists are left out."""
+        text = extract_text_lxml(NOISY_HTML.encode(), "https://example.com/story")
+        
+        assert text.count("battery plant will employ") == 4
+        assert "Sidebar" not in text
+        assert "Reader comment" not in text
+        assert "Advertisement" not in text
+        assert "related story" not in text
+    
+    def test_paragraphs_are_separated(self):
+        """Text blocks are joined with blank lines."""
+        text = extract_text_lxml(ARTICLE_HTML.encode(), "https://example.com/story")
+        
+        assert text.split("\n\n")[0] == "Automaker opens battery plant"
+        assert len(text.split("\n\n")) == 3
+    
+    @pytest.mark.parametrize("method", ["readability", "soup"])
+    def test_other_methods_separate_paragraphs(self, method):
+        """Every content method emits blank-line separated blocks for boilerplate learning."""
+        result = run_extraction(ARTICLE_HTML.encode(), "https://example.com/story", order=[method])
+        
+        assert result.method == method
+        assert len(result.text.split("\n\n")) == 3
+    
+    def test_matches_cascade_content(self):
+        """The single parse recovers the same article text as the cascade."""
+        lxml_words = set(extract_text_lxml(ARTICLE_HTML.encode(), "https://example.com/story").split())
+        cascade_words = set(extract_text_cascade(ARTICLE_HTML.encode(), "https://example.com/story").split())
+        
+        assert cascade_words <= lxml_words
+    
+    def test_engine_setting(self, monkeypatch):
+        """extraction_engine selects the cascade."""
+        monkeypatch.setattr(settings, "extraction_engine", "cascade")
+        
+        assert extract_article_text(ARTICLE_HTML.encode(), "https://example.com/story") == \
+            extract_text_cascade(ARTICLE_HTML.encode(), "https://example.com/story")
+
+
+class TestRunExtraction:
+    """Test cases for ordered method selection."""
+    
+    def test_follows_given_order(self):
+        """The first method in the order that succeeds wins."""
+        result = run_extraction(ARTICLE_HTML.encode(), "https://example.com/story", order=["readability", "lxml"])
+        
+        assert result.method == "readability"
+        assert [attempt[0] for attempt in result.attempts] == ["readability"]
+    
+    def test_records_failed_attempts(self):
+        """Failed methods are reported with their timings before the winner."""
+        result = run_extraction(ARTICLE_HTML.encode(), "https://example.com/story", order=["unknown", "soup", "lxml"])
+        
+        names = [name for name, _, _ in result.attempts]
+        assert names[-1] == result.method
+        assert all(seconds >= 0 for _, seconds, _ in result.attempts)
+    
+    def test_body_fallback_when_no_method_listed(self):
+        """With every method skipped only the body text is tried."""
+        result = run_extraction(ARTICLE_HTML.encode(), "https://example.com/story", order=[])
+        
+        assert result.method == "body"
+        assert "battery plant will employ" in result.text
+    
+    def test_failure(self):
+        """Short pages report every attempt and no text."""
+        result = run_extraction(b"<html><body><p>Too short.</p></body></html>", "https://example.com/story")
+        
+        assert result.text is None
+        assert result.method is None
+        assert not any(ok for _, _, ok in result.attempts)
+
+
+class TestExtractTextAsync:
+    """Test cases for running extraction through the pool."""
+    
+    @pytest.mark.asyncio
+    async def test_inline_when_pool_disabled(self, monkeypatch):
+        """Zero workers runs extraction on the calling loop."""
+        monkeypatch.setattr(settings, "extraction_pool_workers", 0)
+        
+        assert extraction.get_extraction_pool() is None
+        result = await extract_text_async(ARTICLE_HTML.encode(), "https://example.com/story")
+        
+        assert "battery plant will employ" in result.text
+    
+    @pytest.mark.asyncio
+    async def test_runs_in_process_pool(self, monkeypatch):
+        """Extraction in a worker process matches inline extraction."""
+        monkeypatch.setattr(settings, "extraction_pool_workers", 1)
+        try:
+            result = await extract_text_async(ARTICLE_HTML.encode(), "https://example.com/story")
+            
+            assert extraction.get_extraction_pool() is not None
+            assert result.text == extract_article_text(ARTICLE_HTML.encode(), "https://example.com/story")
+            assert result.method == "lxml"
+        finally:
+            shutdown_extraction_pool()
+    
+    def test_runs_off_loop_in_daemonic_worker(self):
+        """A daemonic process, like a Celery prefork child, still extracts in the pool."""
+        # Spawned so no executor state from earlier tests is inherited
+        context = multiprocessing.get_context("spawn")
+        results = context.Queue()
+        worker = context.Process(target=_extract_in_daemon, args=(results,), daemon=True)
+        worker.start()
+        
+        worker_pid, extraction_pid, pool_disabled = results.get(timeout=30)
+        worker.join(timeout=30)
+        
+        assert not pool_disabled
+        assert extraction_pid != str(worker_pid)
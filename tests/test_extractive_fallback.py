@@ -0,0 +1,112 @@
+"""
+Unit tests for the extractive enrichment fallback.
+"""
+import pytest
+from unittest.mock import AsyncMock, patch
+import utils.extractive_fallback as extractive_fallback
+from utils.extractive_fallback import enrich_locally, fallback_active, lexicon_sentiment, summarize, textrank
+from utils.token_budget import split_sentences
+
+ARTICLE = (
+    "Ford is recalling more than 10,000 F-150 pickup trucks because rear brake hoses can rupture. "
+    "The brake hose defect can leak fluid and reduce braking performance in the F-150 pickup trucks. "
+    "Dealers will replace the brake hoses on the recalled pickup trucks free of charge. "
+    "The weather in Detroit was sunny on Tuesday. "
+    "Owners of the recalled F-150 trucks will be notified by mail next month."
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_decision():
+    extractive_fallback._decision = None
+    yield
+    extractive_fallback._decision = None
+
+
+class TestExtractiveSummary:
+    """Test cases for TextRank summaries."""
+    
+    def test_off_topic_sentence_ranks_last(self):
+        """The sentence sharing no terms with the rest gets the lowest score."""
+        sentences = split_sentences(ARTICLE)
+        
+        scores = textrank(sentences)
+        
+        assert scores.argmin() == 3
+    
+    def test_summary_keeps_order_and_word_limit(self):
+        """Chosen sentences appear in article order within the word limit."""
+        sentences = split_sentences(ARTICLE)
+        
+        summary = summarize(sentences, textrank(sentences), 40)
+        
+        assert len(summary.split()) <= 40
+        assert summary.startswith("Ford is recalling")
+        assert "weather" not in summary
+
+
+class TestLexiconSentiment:
+    """Test cases for lexicon sentiment."""
+    
+    def test_labels(self):
+        """Negative and positive vocabulary set the label; negation flips a word."""
+        assert lexicon_sentiment("Recall after crash injuries and a lawsuit")[0] == "negative"
+        assert lexicon_sentiment("Record sales growth and strong profit")[0] == "positive"
+        assert lexicon_sentiment("The meeting is on Tuesday") == ("neutral", 0.5)
+        assert lexicon_sentiment("Sales did not decline")[0] == "positive"
+
+
+class TestEnrichLocally:
+    """Test cases for provisional enrichment."""
+    
+    def test_shape(self):
+        """The result has every field of an OpenAI enrichment and is flagged provisional."""
+        data = enrich_locally("Ford recalls F-150 pickups over brake hoses", ARTICLE, "Test Publisher")
+        
+        assert data["provisional"] is True
+        assert data["category"] == "recall"
+        assert data["sentiment_label"] == "negative"
+        assert len(data["short_summary"].split()) <= 120
+        assert len(data["long_summary"]) <= 2500
+        assert "brake" in data["tags"]
+        assert data["ai_raw_response"]["model"] == "extractive-fallback"
+
+
+class TestFallbackActive:
+    """Test cases for switching the fallback on and off."""
+    
+    @pytest.mark.asyncio
+    async def test_healthy(self):
+        """A short queue and few errors keep OpenAI in use."""
+        with patch("utils.extractive_fallback.queue_backlog", AsyncMock(return_value=5)), \
+             patch("utils.extractive_fallback.recent_error_rate", AsyncMock(return_value=(0.1, 50))):
+            assert await fallback_active() is False
+    
+    @pytest.mark.asyncio
+    async def test_error_rate(self):
+        """A high error rate over enough calls switches the fallback on."""
+        with patch("utils.extractive_fallback.queue_backlog", AsyncMock(return_value=5)), \
+             patch("utils.extractive_fallback.recent_error_rate", AsyncMock(return_value=(0.8, 50))):
+            assert await fallback_active() is True
+    
+    @pytest.mark.asyncio
+    async def test_error_rate_needs_enough_calls(self):
+        """A couple of failures alone do not switch it on."""
+        with patch("utils.extractive_fallback.queue_backlog", AsyncMock(return_value=5)), \
+             patch("utils.extractive_fallback.recent_error_rate", AsyncMock(return_value=(1.0, 2))):
+            assert await fallback_active() is False
+    
+    @pytest.mark.asyncio
+    async def test_queue_backlog(self):
+        """A backed-up queue switches the fallback on."""
+        with patch("utils.extractive_fallback.queue_backlog", AsyncMock(return_value=5000)), \
+             patch("utils.extractive_fallback.recent_error_rate", AsyncMock(return_value=(0.0, 0))):
+            assert await fallback_active() is True
+    
+    @pytest.mark.asyncio
+    async def test_forced_modes(self):
+        """fallback_mode on and off override the thresholds."""
+        with patch.object(extractive_fallback.settings, "fallback_mode", "off"):
+            assert await fallback_active() is False
+        with patch.object(extractive_fallback.settings, "fallback_mode", "on"):
+            assert await fallback_active() is True
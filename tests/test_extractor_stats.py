@@ -0,0 +1,106 @@
+"""
+Unit tests for per-domain extractor selection.
+"""
+import pytest
+from unittest.mock import AsyncMock, Mock
+from utils import extractor_stats
+from utils.extractor_stats import ExtractorStats, order_methods
+from tests.helpers import AsyncCursor
+
+DEFAULT_ORDER = ["lxml", "newspaper", "readability", "soup"]
+
+
+def _record(attempts, successes, seconds):
+    return {"attempts": attempts, "successes": successes, "total_seconds": seconds}
+
+
+def _mock_db(docs=()):
+    db = Mock()
+    db.extractor_stats.find = Mock(side_effect=lambda query: AsyncCursor(docs))
+    db.extractor_stats.bulk_write = AsyncMock()
+    return db
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    extractor_stats._cache.clear()
+    yield
+    extractor_stats._cache.clear()
+
+
+class TestOrderMethods:
+    """Test cases for order_methods."""
+    
+    def test_no_history_keeps_default(self):
+        """Unknown domains use the engine's order."""
+        assert order_methods({}, DEFAULT_ORDER) == DEFAULT_ORDER
+    
+    def test_winner_goes_first(self):
+        """A method that has worked is tried before untried ones."""
+        stats = {"readability": _record(10, 10, 0.5)}
+        
+        assert order_methods(stats, DEFAULT_ORDER) == ["readability", "lxml", "newspaper", "soup"]
+    
+    def test_rank_by_success_then_time(self):
+        """Higher success rate wins; equal rates prefer the faster method."""
+        stats = {
+            "lxml": _record(10, 9, 0.01),
+            "newspaper": _record(10, 10, 1.0),
+            "readability": _record(10, 10, 0.5),
+        }
+        
+        assert order_methods(stats, DEFAULT_ORDER)[:3] == ["readability", "newspaper", "lxml"]
+    
+    def test_never_working_methods_are_skipped(self):
+        """Methods with enough attempts and no success are dropped."""
+        stats = {"lxml": _record(5, 0, 0.1), "newspaper": _record(2, 0, 0.5), "soup": _record(5, 5, 0.2)}
+        
+        assert order_methods(stats, DEFAULT_ORDER) == ["soup", "readability", "newspaper"]
+    
+    def test_other_methods_only_where_they_won(self):
+        """Methods outside a single-method default run only on domains that need them."""
+        candidates = DEFAULT_ORDER
+        
+        assert order_methods({}, ["lxml"], candidates) == DEFAULT_ORDER
+        assert order_methods({"lxml": _record(10, 10, 0.01)}, ["lxml"], candidates) == ["lxml"]
+        assert order_methods(
+            {"lxml": _record(10, 9, 0.01), "readability": _record(1, 1, 0.5)}, ["lxml"], candidates
+        ) == ["readability", "lxml"]
+
+
+class TestExtractorStats:
+    """Test cases for ExtractorStats."""
+    
+    @pytest.mark.asyncio
+    async def test_order_uses_stored_stats(self):
+        """Stats are read from extractor_stats and cached per domain."""
+        db = _mock_db([
+            {"domain": "example.com", "method": "newspaper", "attempts": 3, "successes": 3, "total_seconds": 0.3},
+        ])
+        stats = ExtractorStats(db)
+        
+        assert (await stats.method_order("example.com", DEFAULT_ORDER))[0] == "newspaper"
+        await stats.method_order("example.com", DEFAULT_ORDER)
+        
+        db.extractor_stats.find.assert_called_once_with({"domain": "example.com"})
+    
+    @pytest.mark.asyncio
+    async def test_record_updates_cache_and_store(self):
+        """Recorded attempts reorder methods immediately and are persisted."""
+        db = _mock_db()
+        stats = ExtractorStats(db)
+        await stats.method_order("example.com", DEFAULT_ORDER)
+        
+        await stats.record("example.com", [("lxml", 0.01, False), ("readability", 0.2, True)])
+        
+        assert (await stats.method_order("example.com", DEFAULT_ORDER))[0] == "readability"
+        operations = db.extractor_stats.bulk_write.call_args.args[0]
+        assert len(operations) == 2
+    
+    @pytest.mark.asyncio
+    async def test_missing_domain(self):
+        """URLs without a host fall back to the default order."""
+        db = _mock_db()
+        
+        assert await ExtractorStats(db).method_order(None, DEFAULT_ORDER) == DEFAULT_ORDER
+        db.extractor_stats.find.assert_not_called()
@@ -0,0 +1,137 @@
+"""
+Unit tests for the streaming feed parser.
+"""
+from datetime import datetime
+from utils.feed_parser import iter_feed_items, parse_feed_date
+
+
+GOOGLE_NEWS_RSS = b"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:media="http://search.yahoo.com/mrss/">
+<channel>
+<title>"automotive" - Google News</title>
+<item>
+<title>Ford recalls 100,000 trucks - Reuters</title>
+<link>https://news.google.com/rss/articles/CBMiAAA?oc=5</link>
+<guid isPermaLink="false">CBMiAAA</guid>
+<pubDate>Mon, 01 Jan 2024 10:00:00 GMT</pubDate>
+<description>&lt;a href="https://news.google.com/rss/articles/CBMiAAA?oc=5"&gt;Ford recalls&lt;/a&gt;</description>
+<source url="https://www.reuters.com">Reuters</source>
+</item>
+<item>
+<title>Toyota expands hybrid lineup</title>
+<link>https://news.google.com/rss/articles/CBMiBBB?oc=5</link>
+<pubDate>Mon, 01 Jan 2024 09:00:00 GMT</pubDate>
+</item>
+<item>
+<title></title>
+<link>https://news.google.com/rss/articles/CBMiCCC?oc=5</link>
+</item>
+</channel>
+</rss>"""
+
+ATOM_FEED = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+<title>Automotive blog</title>
+<entry>
+<title>EV charging standards converge</title>
+<link rel="self" href="https://example.com/feed/entry/1"/>
+<link rel="alternate" href="https://example.com/ev-charging"/>
+<id>tag:example.com,2024:1</id>
+<updated>2024-01-02T08:00:00Z</updated>
+<summary>Charging news</summary>
+</entry>
+</feed>"""
+
+RDF_FEED = b"""<?xml version="1.0" encoding="ISO-8859-1"?>
+<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+         xmlns="http://purl.org/rss/1.0/"
+         xmlns:dc="http://purl.org/dc/elements/1.1/">
+<item rdf:about="https://example.de/artikel">
+<title>Gr\xfcne Autos</title>
+<link>https://example.de/artikel</link>
+<dc:date>2024-01-03T12:00:00+01:00</dc:date>
+</item>
+</rdf:RDF>"""
+
+
+class TestIterFeedItems:
+    """Test cases for iter_feed_items."""
+    
+    def test_parses_google_news_rss(self):
+        """RSS items yield their fields, including the Google News source element."""
+        items = list(iter_feed_items(GOOGLE_NEWS_RSS))
+        
+        # The item without a title is skipped
+        assert len(items) == 2
+        first = items[0]
+        assert first["title"] == "Ford recalls 100,000 trucks - Reuters"
+        assert first["link"] == "https://news.google.com/rss/articles/CBMiAAA?oc=5"
+        assert first["pub_date"] == "Mon, 01 Jan 2024 10:00:00 GMT"
+        assert first["guid"] == "CBMiAAA"
+        assert first["source_name"] == "Reuters"
+        assert first["source_url"] == "https://www.reuters.com"
+        assert items[1]["source_name"] is None
+    
+    def test_parses_atom_entries(self):
+        """Atom entries use the alternate link href and fall back to updated."""
+        items = list(iter_feed_items(ATOM_FEED))
+        
+        assert len(items) == 1
+        assert items[0]["link"] == "https://example.com/ev-charging"
+        assert items[0]["pub_date"] == "2024-01-02T08:00:00Z"
+        assert items[0]["description"] == "Charging news"
+    
+    def test_parses_namespaced_rdf_with_declared_encoding(self):
+        """RSS 1.0 items in a default namespace decode using the XML declaration."""
+        items = list(iter_feed_items(RDF_FEED))
+        
+        assert len(items) == 1
+        assert items[0]["title"] == "Grüne Autos"
+        assert items[0]["pub_date"] == "2024-01-03T12:00:00+01:00"
+    
+    def test_stops_after_run_of_known_items(self):
+        """Parsing stops once the configured run of known items is reached."""
+        feed = b"<rss><channel>" + b"".join(
+            b"<item><title>t%d</title><link>https://example.com/%d</link></item>" % (i, i)
+            for i in range(10)
+        ) + b"</channel></rss>"
+        known = {f"https://example.com/{i}" for i in range(2, 10)}
+        seen = []
+        
+        def is_known(fields):
+            seen.append(fields["link"])
+            return fields["link"] in known
+        
+        items = list(iter_feed_items(feed, is_known=is_known, known_run_limit=3))
+        
+        assert [item["title"] for item in items] == ["t0", "t1", "t2", "t3"]
+        assert len(seen) == 5
+    
+    def test_invalid_xml_yields_nothing(self):
+        """Garbage input does not raise."""
+        assert list(iter_feed_items(b"not xml at all")) == []
+
+
+class TestParseFeedDate:
+    """Test cases for parse_feed_date."""
+    
+    def test_rfc822(self):
+        """RSS pubDate values are converted to naive UTC."""
+        assert parse_feed_date("Mon, 01 Jan 2024 10:00:00 GMT") == datetime(2024, 1, 1, 10, 0)
+        assert parse_feed_date("Mon, 01 Jan 2024 10:00:00 -0500") == datetime(2024, 1, 1, 15, 0)
+    
+    def test_iso8601(self):
+        """Atom timestamps, with or without offsets, are converted to naive UTC."""
+        assert parse_feed_date("2024-01-02T08:00:00Z") == datetime(2024, 1, 2, 8, 0)
+        assert parse_feed_date("2024-01-03T12:00:00+01:00") == datetime(2024, 1, 3, 11, 0)
+        assert parse_feed_date("2024-01-04") == datetime(2024, 1, 4)
+    
+    def test_dateutil_fallback(self):
+        """Non-standard formats still parse through dateutil."""
+        assert parse_feed_date("January 5, 2024 3:30 PM") == datetime(2024, 1, 5, 15, 30)
+    
+    def test_unparseable_returns_now(self):
+        """Garbage falls back to the current time."""
+        before = datetime.utcnow()
+        parsed = parse_feed_date("not a date")
+        assert before <= parsed <= datetime.utcnow()
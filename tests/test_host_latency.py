@@ -0,0 +1,182 @@
+"""
+Unit tests for per-host latency tracking and hedged requests.
+"""
+import asyncio
+import pytest
+from unittest.mock import Mock
+from backend.config import settings
+from utils.host_latency import HostLatencyTracker, hedged_get
+
+
+class _SlowSession:
+    """Session whose successive GETs take the given delays."""
+    
+    def __init__(self, *delays):
+        self.delays = list(delays)
+        self.calls = 0
+        self.responses = []
+    
+    def get(self, url, timeout=None):
+        delay = self.delays[self.calls]
+        self.calls += 1
+        
+        async def _respond():
+            await asyncio.sleep(delay)
+            response = Mock(name=f"response-{delay}")
+            self.responses.append(response)
+            return response
+        
+        return _respond()
+
+
+class TestHostLatencyTracker:
+    """Test cases for HostLatencyTracker."""
+    
+    def test_no_history_uses_global_timeout(self):
+        """Unknown hosts keep request_timeout and no hedge."""
+        tracker = HostLatencyTracker(min_samples=5)
+        
+        timeout = tracker.timeout_for("example.com")
+        
+        assert timeout.total == settings.request_timeout
+        assert timeout.sock_read is None
+        assert tracker.hedge_delay("example.com") is None
+    
+    def test_fast_host_gets_tight_timeouts(self):
+        """Timeouts follow the host's percentiles, clamped to the minimums."""
+        tracker = HostLatencyTracker(min_samples=5)
+        for _ in range(20):
+            tracker.record("fast.com", 0.2)
+        tracker.record("fast.com", 3.0)
+        
+        timeout = tracker.timeout_for("fast.com")
+        
+        assert timeout.connect == settings.scrape_min_connect_timeout
+        assert timeout.sock_read == max(settings.scrape_min_read_timeout, 3.0 * settings.scrape_read_timeout_factor)
+        assert timeout.sock_read <= settings.request_timeout
+    
+    def test_percentiles_use_sliding_window(self):
+        """Old samples fall out of the window."""
+        tracker = HostLatencyTracker(window=10, min_samples=5)
+        for _ in range(10):
+            tracker.record("example.com", 9.0)
+        for _ in range(10):
+            tracker.record("example.com", 1.0)
+        
+        assert tracker.percentile("example.com", 0.99) == 1.0
+    
+    def test_hedge_budget(self, monkeypatch):
+        """No more than the budgeted share of requests are hedged."""
+        monkeypatch.setattr(settings, "scrape_hedge_budget", 0.1)
+        tracker = HostLatencyTracker(min_samples=1)
+        tracker.record("example.com", 1.0)
+        
+        hedges = 0
+        for _ in range(100):
+            if tracker.hedge_delay("example.com") is not None:
+                tracker.hedge_fired()
+                hedges += 1
+        
+        assert hedges == 10
+
+
+class TestHedgedGet:
+    """Test cases for hedged_get."""
+    
+    @pytest.mark.asyncio
+    async def test_fast_primary_is_not_hedged(self):
+        """A response before the hedge delay is returned directly."""
+        session = _SlowSession(0.0)
+        
+        response = await hedged_get(session, "https://example.com/", None, 0.5)
+        
+        assert session.calls == 1
+        assert response is session.responses[0]
+    
+    @pytest.mark.asyncio
+    async def test_hedge_wins_over_slow_primary(self):
+        """A slow primary is raced by a second request, which wins."""
+        session = _SlowSession(5.0, 0.01)
+        
+        response = await asyncio.wait_for(hedged_get(session, "https://example.com/", None, 0.05), 1.0)
+        
+        assert session.calls == 2
+        assert response is session.responses[0]
+        assert response._mock_name == "response-0.01"
+    
+    @pytest.mark.asyncio
+    async def test_hedge_waits_for_throttle(self):
+        """The hedge is only fired once the host's throttle allows another request."""
+        session = _SlowSession(5.0, 0.01)
+        waited = []
+        
+        class _Throttle:
+            async def wait(self, url):
+                waited.append(session.calls)
+        
+        response = await asyncio.wait_for(
+            hedged_get(session, "https://example.com/", None, 0.05, throttle=_Throttle()), 1.0
+        )
+        
+        assert waited == [1]
+        assert session.calls == 2
+        assert response._mock_name == "response-0.01"
+    
+    @pytest.mark.asyncio
+    async def test_failure_falls_back_to_other_request(self):
+        """If one request errors the other one's response is used."""
+        session = _SlowSession(0.2, 0.01)
+        original_get = session.get
+        
+        def _get(url, timeout=None):
+            if session.calls == 1:
+                session.calls += 1
+                
+                async def _fail():
+                    raise ConnectionError("reset")
+                return _fail()
+            return original_get(url, timeout)
+        
+        session.get = _get
+        
+        response = await hedged_get(session, "https://example.com/", None, 0.05)
+        
+        assert response._mock_name == "response-0.2"
+    
+    @pytest.mark.asyncio
+    async def test_both_failing_raises_last_error(self):
+        """When primary and hedge both fail the caller sees a real exception."""
+        session = Mock()
+        
+        def _get(url, timeout=None):
+            async def _fail():
+                await asyncio.sleep(0.1)
+                raise ConnectionError("reset")
+            return _fail()
+        
+        session.get = _get
+        
+        with pytest.raises(ConnectionError):
+            await hedged_get(session, "https://example.com/", None, 0.05)
+    
+    @pytest.mark.asyncio
+    async def test_cancelled_primary_is_not_a_winner(self):
+        """A primary cancelled from outside is skipped and the hedge's response is used."""
+        session = _SlowSession(None, 0.2)
+        original_get = session.get
+        
+        def _get(url, timeout=None):
+            if session.calls == 0:
+                session.calls += 1
+                
+                async def _cancelled():
+                    await asyncio.sleep(0.1)
+                    raise asyncio.CancelledError()
+                return _cancelled()
+            return original_get(url, timeout)
+        
+        session.get = _get
+        
+        response = await asyncio.wait_for(hedged_get(session, "https://example.com/", None, 0.05), 1.0)
+        
+        assert response._mock_name == "response-0.2"
@@ -0,0 +1,92 @@
+"""
+Unit tests for the shared scraping HTTP pool.
+"""
+import asyncio
+import time
+import pytest
+from unittest.mock import AsyncMock, MagicMock, Mock
+from backend.config import settings
+from utils.http_pool import HostThrottle, close_pool, get_session, get_throttle
+from utils.scraper import ArticleScraper
+
+
+class TestHostThrottle:
+    """Test cases for HostThrottle."""
+    
+    @pytest.mark.asyncio
+    async def test_same_host_is_spaced(self):
+        """Back-to-back requests to one host wait out the interval."""
+        throttle = HostThrottle(0.05)
+        
+        start = time.monotonic()
+        await throttle.wait("https://example.com/a")
+        await throttle.wait("https://example.com/b")
+        
+        assert time.monotonic() - start >= 0.05
+    
+    @pytest.mark.asyncio
+    async def test_different_hosts_do_not_wait(self):
+        """Requests to different hosts are not serialized."""
+        throttle = HostThrottle(1.0)
+        
+        start = time.monotonic()
+        await asyncio.gather(
+            throttle.wait("https://a.example.com/"),
+            throttle.wait("https://b.example.com/"),
+        )
+        
+        assert time.monotonic() - start < 0.5
+    
+    @pytest.mark.asyncio
+    async def test_disabled(self):
+        """A zero interval never sleeps."""
+        throttle = HostThrottle(0)
+        
+        await throttle.wait("https://example.com/")
+        assert throttle._next_allowed == {}
+
+
+class TestSharedPool:
+    """Test cases for the per-loop pooled session."""
+    
+    @pytest.mark.asyncio
+    async def test_session_is_reused_within_a_loop(self):
+        """Every caller on a loop shares one connector."""
+        try:
+            session = get_session()
+            
+            assert get_session() is session
+            assert get_throttle() is get_throttle()
+            assert session.connector.limit == settings.scrape_pool_size
+            assert session.connector.limit_per_host == settings.scrape_per_host_limit
+        finally:
+            await close_pool()
+        
+        assert session.closed
+    
+    @pytest.mark.asyncio
+    async def test_scraper_does_not_close_shared_session(self):
+        """Leaving the scraper context keeps pooled connections alive."""
+        try:
+            async with ArticleScraper() as scraper:
+                session = scraper.session
+            
+            assert session is get_session()
+            assert not session.closed
+        finally:
+            await close_pool()
+    
+    @pytest.mark.asyncio
+    async def test_scraper_throttles_before_fetching(self, monkeypatch):
+        """fetch_article waits on the host throttle before each request."""
+        throttle = Mock()
+        throttle.wait = AsyncMock()
+        monkeypatch.setattr("utils.scraper.get_throttle", lambda: throttle)
+        
+        session = Mock()
+        session.get = AsyncMock(return_value=MagicMock(status=404))
+        
+        async with ArticleScraper(session=session) as scraper:
+            await scraper.fetch_article("https://example.com/story")
+        
+        throttle.wait.assert_awaited_once_with("https://example.com/story")
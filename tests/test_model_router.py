@@ -0,0 +1,102 @@
+"""
+Unit tests for enrichment model routing.
+"""
+import pytest
+from unittest.mock import AsyncMock, patch
+import utils.model_router as model_router
+from utils.model_router import (
+    HEAVY, LIGHT, STANDARD, Route, choose_route, completion_cost, guess_category, record_route, route_article,
+)
+
+
+class TestCategoryGuess:
+    """Test cases for the local keyword category guess."""
+    
+    def test_recall(self):
+        """Recall vocabulary, weighted by the title, wins."""
+        title = "Ford recalls 10,000 pickups"
+        text = "The NHTSA said brake hoses can rupture. Dealers will replace them."
+        
+        assert guess_category(title, text) == "recall"
+    
+    def test_no_keywords(self):
+        """Text without category vocabulary has no guess."""
+        assert guess_category("Weekend weather", "Sunny with light winds.") is None
+
+
+class TestChooseRoute:
+    """Test cases for picking a route."""
+    
+    def test_by_length(self):
+        """Short articles go light, long ones heavy, the rest standard."""
+        assert choose_route(200, None, 0).name == LIGHT
+        assert choose_route(1500, None, 0).name == STANDARD
+        assert choose_route(5000, None, 0).name == HEAVY
+    
+    def test_backlog_steps_down(self):
+        """A backed-up queue moves articles one route lighter."""
+        with patch.object(model_router.settings, "enrichment_route_backlog_threshold", 100):
+            assert choose_route(5000, None, 150).name == STANDARD
+            assert choose_route(1500, None, 150).name == LIGHT
+            assert choose_route(1500, None, 50).name == STANDARD
+    
+    def test_category_override(self):
+        """Overridden categories keep their route regardless of length and backlog."""
+        with patch.object(model_router.settings, "enrichment_route_category_overrides", {"recall": STANDARD}):
+            assert choose_route(100, "recall", 10_000).name == STANDARD
+            assert choose_route(100, "opinion", 0).name == LIGHT
+    
+    def test_route_models_and_budgets(self):
+        """Routes carry their own model and budgets; unset models use openai_model."""
+        with patch.object(model_router.settings, "enrichment_route_light_model", "gpt-4o-mini"), \
+             patch.object(model_router.settings, "enrichment_route_heavy_model", ""):
+            light = choose_route(100, None, 0)
+            heavy = choose_route(5000, None, 0)
+        
+        assert light.model == "gpt-4o-mini"
+        assert light.input_budget == model_router.settings.enrichment_route_light_input_budget
+        assert heavy.model == model_router.settings.openai_model
+
+
+class TestRouteAccounting:
+    """Test cases for cost and latency recording."""
+    
+    def test_cost_from_prices(self):
+        """Cost uses per-1K-token prompt and completion prices."""
+        with patch.object(model_router.settings, "openai_model_prices", {"m": [0.001, 0.002]}):
+            cost = completion_cost("m", {"prompt_tokens": 1000, "completion_tokens": 500})
+            unpriced = completion_cost("other", {"prompt_tokens": 1000, "completion_tokens": 500})
+        
+        assert cost == pytest.approx(0.002)
+        assert unpriced == 0.0
+    
+    def test_record_route(self):
+        """The stored record names the route and model with latency and cost."""
+        route = Route(LIGHT, "gpt-3.5-turbo", 1200, 800)
+        
+        record = record_route(route, {"prompt_tokens": 2000, "completion_tokens": 1000}, 1.23456)
+        
+        assert record["route"] == LIGHT
+        assert record["model"] == "gpt-3.5-turbo"
+        assert record["latency_seconds"] == 1.235
+        assert record["cost_usd"] > 0
+
+
+class TestRouteArticle:
+    """Test cases for routing a scraped article."""
+    
+    @pytest.mark.asyncio
+    async def test_backlog_unavailable(self):
+        """Without Redis the backlog counts as empty."""
+        with patch("utils.model_router.queue_backlog", AsyncMock(side_effect=ConnectionError("down"))):
+            route = await route_article("Tesla quarterly earnings", "Tesla reported revenue. " * 10)
+        
+        assert route.name == LIGHT
+    
+    @pytest.mark.asyncio
+    async def test_disabled(self):
+        """With routing off every article takes the standard route."""
+        with patch.object(model_router.settings, "enrichment_routing_enabled", False):
+            route = await route_article("Title", "Short text.")
+        
+        assert route.name == STANDARD
@@ -0,0 +1,77 @@
+"""
+Unit tests for MinHash near-duplicate detection.
+"""
+import pytest
+from unittest.mock import Mock
+from utils.near_duplicates import NearDuplicateIndex, band_keys, minhash, similarity
+from tests.helpers import AsyncCursor
+
+STORY = (
+    "Ford is recalling more than 10,000 F-150 pickup trucks because the rear brake "
+    "hoses can rupture and leak fluid, reducing braking performance and increasing the "
+    "risk of a crash, the National Highway Traffic Safety Administration said on Tuesday. "
+    "Dealers will replace the hoses free of charge and owners will be notified by mail "
+    "starting next month, the automaker said in a filing with the regulator. "
+    "The company said it was not aware of any accidents or injuries related to the issue."
+)
+
+SYNDICATED = STORY.replace("on Tuesday", "on Tuesday, according to Reuters") + " Shares were little changed."
+
+UNRELATED = (
+    "Toyota plans to open a new battery plant in North Carolina that will supply cells for "
+    "hybrid and fully electric vehicles, creating about 1,750 jobs, the company announced. "
+    "Production is expected to start in 2025 with capacity rising through the end of the decade."
+)
+
+
+class TestMinHash:
+    """Test cases for signatures and LSH bands."""
+    
+    def test_syndicated_copy_is_similar(self):
+        """A lightly edited copy scores close to the original and shares LSH bands."""
+        original, copy = minhash(STORY), minhash(SYNDICATED)
+        
+        assert similarity(original, copy) >= 0.8
+        assert set(band_keys(original)) & set(band_keys(copy))
+    
+    def test_unrelated_story_is_not_similar(self):
+        """Different stories score low and share no bands."""
+        original, other = minhash(STORY), minhash(UNRELATED)
+        
+        assert similarity(original, other) < 0.2
+        assert not set(band_keys(original)) & set(band_keys(other))
+    
+    def test_signature_is_deterministic(self):
+        """Signatures are stable so fingerprints stored by one worker match another's."""
+        assert (minhash(STORY) == minhash(STORY)).all()
+    
+    def test_short_text_has_no_signature(self):
+        """Texts shorter than one shingle cannot be fingerprinted."""
+        assert minhash("Too short") is None
+
+
+class TestNearDuplicateIndex:
+    """Test cases for NearDuplicateIndex."""
+    
+    @pytest.mark.asyncio
+    async def test_find_returns_best_match_above_threshold(self):
+        """Only candidates at or above the threshold are returned, with their score."""
+        candidates = [
+            {"ai_article_id": "other", "signature": minhash(UNRELATED).tolist()},
+            {"ai_article_id": "wire", "signature": minhash(STORY).tolist()},
+        ]
+        db = Mock()
+        db.content_fingerprints.find = Mock(return_value=AsyncCursor(candidates))
+        
+        match = await NearDuplicateIndex(db).find(minhash(SYNDICATED))
+        
+        assert match["ai_article_id"] == "wire"
+        assert match["similarity"] >= 0.8
+    
+    @pytest.mark.asyncio
+    async def test_find_without_candidates(self):
+        """No bucket collision means no match."""
+        db = Mock()
+        db.content_fingerprints.find = Mock(return_value=AsyncCursor([]))
+        
+        assert await NearDuplicateIndex(db).find(minhash(STORY)) is None
@@ -0,0 +1,66 @@
+"""
+Unit tests for publisher resolution.
+"""
+import pytest
+from unittest.mock import AsyncMock, Mock
+from utils.publishers import PublisherDirectory, domain_of, guess_publisher
+
+
+class TestPublisherHelpers:
+    """Test cases for publisher helper functions."""
+    
+    def test_domain_of(self):
+        """Hosts are lowercased and stripped of www. and ports."""
+        assert domain_of("https://WWW.Reuters.com:443/business") == "reuters.com"
+        assert domain_of("") is None
+        assert domain_of(None) is None
+    
+    def test_guess_publisher(self):
+        """Descriptions are searched before falling back to the domain."""
+        assert guess_publisher("Story via Automotive News", None) == "Automotive News"
+        assert guess_publisher("", "https://www.caranddriver.com/news") == "Caranddriver"
+        assert guess_publisher(None, None) == "Unknown"
+
+
+class TestPublisherDirectory:
+    """Test cases for PublisherDirectory."""
+    
+    def test_feed_source_is_used_and_remembered(self):
+        """A <source> name wins and is remembered for its domain."""
+        directory = PublisherDirectory()
+        
+        name = directory.resolve("Reuters", "https://www.reuters.com",
+                                 None, "https://news.google.com/rss/articles/x")
+        
+        assert name == "Reuters"
+        assert directory.resolve(link="https://www.reuters.com/markets/story") == "Reuters"
+    
+    def test_manual_entry_overrides_feed_name(self):
+        """Manual corrections take precedence over feed-provided names."""
+        directory = PublisherDirectory({"reuters.com": {"name": "Reuters", "origin": "manual"}})
+        
+        assert directory.resolve("REUTERS - Business", "https://reuters.com") == "Reuters"
+    
+    def test_aggregator_domain_is_not_memoized(self):
+        """Google News links never become a publisher mapping."""
+        directory = PublisherDirectory()
+        
+        directory.resolve("Some Outlet", None, None, "https://news.google.com/rss/articles/x")
+        
+        assert "news.google.com" not in directory.entries
+    
+    @pytest.mark.asyncio
+    async def test_flush_writes_new_mappings_once(self):
+        """Only mappings learned since the last flush are written."""
+        db = Mock()
+        db.publishers.bulk_write = AsyncMock()
+        directory = PublisherDirectory()
+        directory.resolve("Reuters", "https://www.reuters.com")
+        directory.resolve("Reuters", "https://www.reuters.com")
+        
+        await directory.flush(db)
+        await directory.flush(db)
+        
+        db.publishers.bulk_write.assert_awaited_once()
+        operations = db.publishers.bulk_write.call_args.args[0]
+        assert len(operations) == 1
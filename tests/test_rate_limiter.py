@@ -0,0 +1,92 @@
+"""
+Unit tests for the OpenAI rate limiter.
+"""
+import pytest
+from unittest.mock import patch
+from backend.config import settings
+from utils.rate_limiter import (
+    ERROR, OK, SLOW, THROTTLED, MemoryLimiterBackend, RateLimiter, next_limit
+)
+
+
+class TestNextLimit:
+    """Test cases for the AIMD concurrency step."""
+    
+    def test_grows_additively_and_halves_on_throttle(self):
+        """Successes add 1/limit; a 429 halves the limit."""
+        assert next_limit(8.0, OK) == pytest.approx(8.125)
+        assert next_limit(8.0, THROTTLED) == 4.0
+        assert next_limit(8.0, SLOW) == pytest.approx(7.2)
+    
+    def test_clamped_to_bounds(self):
+        """The limit never leaves [min, max]."""
+        assert next_limit(settings.openai_concurrency_min, THROTTLED) == settings.openai_concurrency_min
+        assert next_limit(settings.openai_concurrency_max, OK) == settings.openai_concurrency_max
+
+
+class TestMemoryLimiterBackend:
+    """Test cases for the in-memory backend."""
+    
+    @pytest.mark.asyncio
+    async def test_token_bucket_asks_to_wait_when_empty(self):
+        """Once the minute's tokens are spent, callers are told how long to wait."""
+        with patch.object(settings, "openai_tpm_limit", 6000):
+            backend = MemoryLimiterBackend()
+            
+            assert await backend.try_acquire("a", 6000) == 0
+            await backend.release("a", 0)
+            wait = await backend.try_acquire("b", 3000)
+        
+        assert 25 < wait <= 30
+    
+    @pytest.mark.asyncio
+    async def test_refund_returns_unused_tokens(self):
+        """Tokens estimated but not used go back into the bucket."""
+        with patch.object(settings, "openai_tpm_limit", 6000):
+            backend = MemoryLimiterBackend()
+            await backend.try_acquire("a", 6000)
+            await backend.release("a", 4000)
+            
+            assert await backend.try_acquire("b", 3000) == 0
+    
+    @pytest.mark.asyncio
+    async def test_concurrency_limit(self):
+        """No more slots than the concurrency limit are handed out."""
+        with patch.object(settings, "openai_concurrency_initial", 2):
+            backend = MemoryLimiterBackend()
+            
+            assert await backend.try_acquire("a", 1) == 0
+            assert await backend.try_acquire("b", 1) == 0
+            assert await backend.try_acquire("c", 1) == -1
+
+
+class TestRateLimiter:
+    """Test cases for RateLimiter."""
+    
+    @pytest.mark.asyncio
+    async def test_throttle_halves_limit_and_errors_do_not(self):
+        """429s shrink concurrency; unrelated failures leave it alone."""
+        backend = MemoryLimiterBackend()
+        limiter = RateLimiter(backend)
+        start = backend.limit
+        
+        slot = await limiter.acquire(100)
+        await limiter.release(slot, ERROR)
+        assert backend.limit == start
+        
+        slot = await limiter.acquire(100)
+        await limiter.release(slot, THROTTLED)
+        assert backend.limit == start / 2
+        assert not backend.in_flight
+    
+    @pytest.mark.asyncio
+    async def test_slow_success_counts_as_slow(self):
+        """Calls slower than the latency target shrink the limit."""
+        backend = MemoryLimiterBackend()
+        limiter = RateLimiter(backend)
+        start = backend.limit
+        
+        slot = await limiter.acquire(100)
+        await limiter.release(slot, OK, latency=settings.openai_latency_target_seconds + 1)
+        
+        assert backend.limit < start
@@ -0,0 +1,120 @@
+"""
+Unit tests for the local relevance pre-filter.
+"""
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+import utils.relevance as relevance
+from utils.relevance import DEPRIORITIZE, DROP, KEEP, RelevanceFilter, RelevanceModel, decide
+from tests.helpers import AsyncCursor
+
+MAKERS = ["Ford", "Toyota", "Honda", "Tesla", "Volkswagen", "Hyundai"]
+TOPICS = [
+    "{maker} is recalling pickup trucks because brake hoses can leak fluid, the safety regulator said.",
+    "{maker} reported quarterly vehicle sales and electric vehicle deliveries ahead of analyst estimates.",
+    "{maker} unveiled a new hybrid sedan with a larger battery and longer driving range at the auto show.",
+    "{maker} will build a battery plant to supply electric vehicle production for dealers nationwide.",
+    "{maker} dealers expect higher car prices as vehicle inventory tightens and automaker incentives shrink.",
+]
+OFF_TOPIC = (
+    "The recipe calls for flour, butter and sugar; bake the cookies until golden and "
+    "serve them warm with tea at the garden party."
+)
+
+
+def _corpus():
+    return [
+        f"{topic.format(maker=maker)} {TOPICS[(index + 1) % len(TOPICS)].format(maker=maker)}"
+        for maker in MAKERS
+        for index, topic in enumerate(TOPICS)
+    ] * 2
+
+
+@pytest.fixture(autouse=True)
+def reset_cache():
+    relevance._cache = None
+    yield
+    relevance._cache = None
+
+
+class TestRelevanceModel:
+    """Test cases for training and scoring."""
+    
+    def test_on_topic_scores_high_and_off_topic_low(self):
+        """An automotive story scores near 1.0 and an unrelated one near 0."""
+        model = RelevanceModel.train(_corpus())
+        
+        on_topic = model.score("Honda recalls vehicles after brake fluid leak, the regulator said.")
+        off_topic = model.score(OFF_TOPIC)
+        
+        assert on_topic > 0.35
+        assert off_topic < 0.15
+        assert decide(on_topic) == KEEP
+        assert decide(off_topic) == DROP
+    
+    def test_too_few_documents(self):
+        """Training needs relevance_min_training_documents articles."""
+        assert RelevanceModel.train(_corpus()[:10]) is None
+    
+    def test_round_trips_through_document(self):
+        """The stored form scores exactly like the trained model."""
+        model = RelevanceModel.train(_corpus())
+        restored = RelevanceModel.from_document(model.to_document())
+        
+        text = "Tesla battery plant will supply electric vehicle production."
+        assert restored.score(text) == pytest.approx(model.score(text))
+    
+    def test_decision_thresholds(self):
+        """Scores map to drop, deprioritize and keep; no score keeps the article."""
+        assert decide(None) == KEEP
+        assert decide(0.05) == DROP
+        assert decide(0.25) == DEPRIORITIZE
+        assert decide(0.9) == KEEP
+
+
+class TestRelevanceFilter:
+    """Test cases for scoring against the stored model."""
+    
+    @pytest.mark.asyncio
+    async def test_no_model_keeps_everything(self):
+        """Until a model is trained nothing is filtered."""
+        db = Mock()
+        db.app_config.find_one = AsyncMock(return_value=None)
+        
+        score, decision = await RelevanceFilter(db).assess("Title", OFF_TOPIC)
+        
+        assert score is None
+        assert decision == KEEP
+    
+    @pytest.mark.asyncio
+    async def test_train_stores_model_and_scores(self):
+        """Training reads enriched articles' scraped text and stores the model for scoring."""
+        docs = [
+            {"title_original": "", "raw": [{"scraped_text": text}]}
+            for text in _corpus()
+        ]
+        db = Mock()
+        db.ai_articles.aggregate = Mock(return_value=AsyncCursor(docs))
+        db.app_config.update_one = AsyncMock()
+        filter_ = RelevanceFilter(db)
+        
+        model = await filter_.train()
+        
+        assert model.documents == len(docs)
+        stored = db.app_config.update_one.call_args[0]
+        assert stored[0] == {"config_name": "relevance_model"}
+        
+        score, decision = await filter_.assess("Bakery news", OFF_TOPIC)
+        assert decision == DROP
+        assert score < 0.15
+    
+    @pytest.mark.asyncio
+    async def test_disabled(self):
+        """The filter can be switched off."""
+        db = Mock()
+        db.app_config.find_one = AsyncMock()
+        
+        with patch.object(relevance.settings, "relevance_filter_enabled", False):
+            score, decision = await RelevanceFilter(db).assess("Title", OFF_TOPIC)
+        
+        assert (score, decision) == (None, KEEP)
+        db.app_config.find_one.assert_not_called()
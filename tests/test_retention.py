@@ -0,0 +1,53 @@
+"""
+Unit tests for the retention tasks.
+"""
+from datetime import datetime
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+from workers.retention import _archive_old_articles_async
+
+
+def _batches_cursor(batches):
+    """find() stand-in returning successive batches from to_list()."""
+    cursor = Mock()
+    cursor.sort.return_value = cursor
+    cursor.limit.return_value = cursor
+    cursor.to_list = AsyncMock(side_effect=batches)
+    return cursor
+
+
+class TestArchiveOldArticles:
+    """Test cases for moving old ai_articles into the archive."""
+    
+    @pytest.mark.asyncio
+    async def test_moves_batches_until_none_left(self):
+        """Each batch is upserted into the archive and then removed from the hot collection."""
+        old = [{"_id": "a1", "created_at": datetime(2020, 1, 1)}, {"_id": "a2", "created_at": datetime(2020, 1, 2)}]
+        db = Mock()
+        db.ai_articles.find.return_value = _batches_cursor([old, []])
+        db.ai_articles.delete_many = AsyncMock()
+        db.ai_articles_archive.bulk_write = AsyncMock()
+        
+        with patch("workers.retention.get_database", AsyncMock(return_value=db)):
+            result = await _archive_old_articles_async()
+        
+        assert result["archived"] == 2
+        operations = db.ai_articles_archive.bulk_write.call_args[0][0]
+        assert [op._filter for op in operations] == [{"_id": "a1"}, {"_id": "a2"}]
+        assert all("archived_at" in op._doc for op in operations)
+        db.ai_articles.delete_many.assert_called_once_with({"_id": {"$in": ["a1", "a2"]}})
+    
+    @pytest.mark.asyncio
+    async def test_nothing_to_archive(self):
+        """No writes happen when no article is past the cut-off."""
+        db = Mock()
+        db.ai_articles.find.return_value = _batches_cursor([[]])
+        db.ai_articles.delete_many = AsyncMock()
+        db.ai_articles_archive.bulk_write = AsyncMock()
+        
+        with patch("workers.retention.get_database", AsyncMock(return_value=db)):
+            result = await _archive_old_articles_async()
+        
+        assert result["archived"] == 0
+        db.ai_articles_archive.bulk_write.assert_not_called()
+        db.ai_articles.delete_many.assert_not_called()
@@ -3,7 +3,7 @@ Unit tests for article scraper functionality.
 """
 import pytest
 import asyncio
-from unittest.mock import Mock, patch, AsyncMock
+from unittest.mock import MagicMock, Mock, patch, AsyncMock
 from utils.scraper import ArticleScraper, generate_feed_item_id, normalize_url
 
 
@@ -54,54 +54,52 @@ class TestArticleScraper:
                     <h1>Test Article Title</h1>
                     <p>This is a test article with sufficient content to pass the minimum length requirement.</p>
                     <p>It contains multiple paragraphs to ensure the text extraction works correctly.</p>
+                    <p>A third paragraph takes the article past the minimum length the scraper accepts as real content.</p>
                 </article>
             </body>
         </html>
         """
         
-        with patch('aiohttp.ClientSession') as mock_session:
-            mock_response = AsyncMock()
-            mock_response.status = 200
-            mock_response.text = AsyncMock(return_value=mock_html)
-            
-            mock_session.return_value.__aenter__.return_value.get.return_value.__aenter__.return_value = mock_response
-            
-            async with ArticleScraper() as scraper:
-                raw_html, scraped_text, success = await scraper.fetch_article("https://example.com/article")
-            
-            assert success is True
-            assert raw_html == mock_html
-            assert scraped_text is not None
-            assert len(scraped_text) > 100
+        session = Mock()
+        session.get = AsyncMock(return_value=_streaming_response(mock_html.encode()))
+        
+        async with ArticleScraper(session=session) as scraper:
+            raw_html, scraped_text, success = await scraper.fetch_article("https://example.com/article")
+        
+        assert success is True
+        assert raw_html == mock_html
+        assert scraped_text is not None
+        assert len(scraped_text) > 100
     
     @pytest.mark.asyncio
     async def test_fetch_article_failure(self):
         """Test article fetching failure."""
-        with patch('aiohttp.ClientSession') as mock_session:
-            mock_response = AsyncMock()
-            mock_response.status = 404
-            
-            mock_session.return_value.__aenter__.return_value.get.return_value.__aenter__.return_value = mock_response
-            
-            async with ArticleScraper() as scraper:
-                raw_html, scraped_text, success = await scraper.fetch_article("https://example.com/notfound")
-            
-            assert success is False
-            assert raw_html is None
-            assert scraped_text is None
+        response = _streaming_response(b"<html><body>Not found</body></html>")
+        response.status = 404
+        session = Mock()
+        session.get = AsyncMock(return_value=response)
+        
+        async with ArticleScraper(session=session) as scraper:
+            raw_html, scraped_text, success = await scraper.fetch_article("https://example.com/notfound")
+        
+        assert success is False
+        assert raw_html is None
+        assert scraped_text is None
+        assert scraper.last_failure == "http_404"
     
     @pytest.mark.asyncio
     async def test_fetch_article_timeout(self):
         """Test article fetching timeout."""
-        with patch('aiohttp.ClientSession') as mock_session:
-            mock_session.return_value.__aenter__.return_value.get.side_effect = asyncio.TimeoutError()
-            
-            async with ArticleScraper() as scraper:
-                raw_html, scraped_text, success = await scraper.fetch_article("https://example.com/slow")
-            
-            assert success is False
-            assert raw_html is None
-            assert scraped_text is None
+        session = Mock()
+        session.get = AsyncMock(side_effect=asyncio.TimeoutError())
+        
+        async with ArticleScraper(session=session) as scraper:
+            raw_html, scraped_text, success = await scraper.fetch_article("https://example.com/slow")
+        
+        assert success is False
+        assert raw_html is None
+        assert scraped_text is None
+        assert scraper.last_failure == "timeout"
     
     def test_clean_text(self):
         """Test text cleaning functionality."""
@@ -139,21 +137,147 @@ class TestScraperIntegration:
                     <h1>Integration Test Article</h1>
                     <p>This is a comprehensive test article that contains enough content to meet the minimum requirements for text extraction and processing.</p>
                     <p>The article should be processed successfully by the scraper and return valid results.</p>
+                    <p>Its body is streamed through the pooled session and extracted off the event loop like any other page.</p>
                 </article>
             </body>
         </html>
         """
         
-        with patch('aiohttp.ClientSession') as mock_session:
-            mock_response = AsyncMock()
-            mock_response.status = 200
-            mock_response.text = AsyncMock(return_value=mock_html)
-            
-            mock_session.return_value.__aenter__.return_value.get.return_value.__aenter__.return_value = mock_response
-            
+        session = Mock()
+        session.get = AsyncMock(return_value=_streaming_response(mock_html.encode()))
+        
+        with patch('utils.scraper.get_session', return_value=session):
             raw_html, scraped_text, success = await scrape_article("https://example.com/integration-test")
             
             assert success is True
             assert raw_html == mock_html
             assert scraped_text is not None
             assert "Integration Test Article" in scraped_text
+
+
+class _FakeContent:
+    """Stands in for aiohttp's StreamReader."""
+    
+    def __init__(self, body: bytes, chunk: int):
+        self.body = body
+        self.chunk = chunk
+        self.read_bytes = 0
+    
+    async def iter_chunked(self, size):
+        for start in range(0, len(self.body), self.chunk):
+            piece = self.body[start:start + self.chunk]
+            self.read_bytes += len(piece)
+            yield piece
+    
+    def at_eof(self):
+        return self.read_bytes >= len(self.body)
+
+
+def _streaming_response(body: bytes, content_type: str = "text/html; charset=utf-8", chunk: int = 1024):
+    response = MagicMock()
+    response.status = 200
+    response.headers = {"Content-Type": content_type, "Content-Length": str(len(body))}
+    response.content_length = len(body)
+    response.content_type = content_type.split(";")[0]
+    response.charset = "utf-8" if "charset=utf-8" in content_type else None
+    response.url = "https://example.com/story"
+    response.content = _FakeContent(body, chunk)
+    return response
+
+
+class TestBoundedDownload:
+    """Test cases for the streaming, size-guarded article download."""
+    
+    @pytest.mark.asyncio
+    async def test_stops_at_body_end(self):
+        """Nothing after </body> is downloaded."""
+        from utils.scraper import read_html_bounded
+        
+        body = b"<html><body><p>story</p></body>" + b"<script>x</script>" * 1000 + b"</html>"
+        response = _streaming_response(body, chunk=16)
+        
+        html = await read_html_bounded(response, 1_000_000)
+        
+        assert html.startswith(b"<html><body><p>story</p></body>")
+        assert response.content.read_bytes < len(body)
+    
+    @pytest.mark.asyncio
+    async def test_stops_after_single_article(self, monkeypatch):
+        """A lone, closed <article> ends the download once it is substantial."""
+        from backend.config import settings
+        from utils.scraper import read_html_bounded
+        
+        monkeypatch.setattr(settings, "scrape_min_article_bytes", 100)
+        body = b"<html><body><article>" + b"<p>text</p>" * 50 + b"</article>" + b"<div>recirc</div>" * 500
+        response = _streaming_response(body, chunk=7)
+        
+        html = await read_html_bounded(response, 1_000_000)
+        
+        assert b"</article>" in html
+        assert len(html) < len(body)
+    
+    @pytest.mark.asyncio
+    async def test_keeps_reading_past_teaser_articles(self, monkeypatch):
+        """Small teaser articles do not end the download before the story."""
+        from backend.config import settings
+        from utils.scraper import read_html_bounded
+        
+        monkeypatch.setattr(settings, "scrape_min_article_bytes", 100)
+        body = b"<html><article>teaser</article><article>" + b"<p>main story</p>" * 20 + b"</article><div>tail</div>"
+        response = _streaming_response(body, chunk=5)
+        
+        assert await read_html_bounded(response, 1_000_000) == body
+    
+    @pytest.mark.asyncio
+    async def test_ignores_body_end_inside_script(self):
+        """A "</body>" in a script string does not cut the page short."""
+        from utils.scraper import read_html_bounded
+        
+        body = (b"<html><body><script>document.write('</body>');</script>"
+                + b"<p>story</p>" * 50 + b"</body></html>")
+        response = _streaming_response(body, chunk=16)
+        
+        assert await read_html_bounded(response, 1_000_000) == body
+    
+    @pytest.mark.asyncio
+    async def test_complete_page_is_not_counted_as_stopped(self):
+        """Reaching </html> at the end of the stream saves nothing and is not counted."""
+        from utils.scraper import SCRAPE_DOWNLOADS_STOPPED, read_html_bounded
+        
+        counter = SCRAPE_DOWNLOADS_STOPPED.labels(reason="body_end")
+        before = counter._value.get()
+        body = b"<html><body><p>story</p></body></html>"
+        
+        assert await read_html_bounded(_streaming_response(body, chunk=1024), 1_000_000) == body
+        assert counter._value.get() == before
+    
+    @pytest.mark.asyncio
+    async def test_byte_cap(self):
+        """Bodies are truncated at the cap."""
+        from utils.scraper import read_html_bounded
+        
+        response = _streaming_response(b"<html>" + b"x" * 10000, chunk=1000)
+        
+        assert len(await read_html_bounded(response, 2500)) == 2500
+    
+    @pytest.mark.asyncio
+    async def test_rejects_non_html(self):
+        """PDFs are skipped before any body bytes are read."""
+        response = _streaming_response(b"%PDF-1.7" + b"0" * 1000, content_type="application/pdf")
+        session = Mock()
+        session.get = AsyncMock(return_value=response)
+        
+        async with ArticleScraper(session=session) as scraper:
+            raw_html, scraped_text, success = await scraper.fetch_article("https://example.com/report.pdf")
+        
+        assert (raw_html, scraped_text, success) == (None, None, False)
+        assert response.content.read_bytes == 0
+    
+    def test_encoding_from_meta_tag(self):
+        """Without a header charset the page's meta charset is used."""
+        from utils.scraper import _response_encoding
+        
+        response = _streaming_response(b"", content_type="text/html")
+        
+        assert _response_encoding(response, b'<head><meta charset="iso-8859-1"></head>') == "iso-8859-1"
+        assert _response_encoding(response, b"<head></head>") == "utf-8"
@@ -0,0 +1,91 @@
+"""
+Unit tests for poller source sharding.
+"""
+from utils.sharding import ConsistentHashRing, WorkerLeaseRegistry
+
+
+class FakeRedis:
+    """Minimal in-memory stand-in for the Redis calls used by the registry."""
+    
+    def __init__(self):
+        self.store = {}
+    
+    def set(self, key, value, ex=None):
+        self.store[key] = value
+    
+    def delete(self, key):
+        self.store.pop(key, None)
+    
+    def scan_iter(self, match=None):
+        prefix = match.rstrip("*") if match else ""
+        return [key.encode() for key in self.store if key.startswith(prefix)]
+
+
+class TestConsistentHashRing:
+    """Test cases for ConsistentHashRing."""
+    
+    def test_empty_ring(self):
+        """An empty ring owns nothing."""
+        ring = ConsistentHashRing()
+        assert ring.get_node("source-1") is None
+    
+    def test_assignment_is_deterministic(self):
+        """Rings built from the same members agree on every key."""
+        ring1 = ConsistentHashRing(["worker-a", "worker-b", "worker-c"])
+        ring2 = ConsistentHashRing(["worker-c", "worker-a", "worker-b"])
+        
+        for i in range(200):
+            assert ring1.get_node(f"source-{i}") == ring2.get_node(f"source-{i}")
+    
+    def test_every_key_assigned_once(self):
+        """Each source lands in exactly one shard and all shards get work."""
+        ring = ConsistentHashRing(["worker-a", "worker-b", "worker-c"])
+        keys = [f"source-{i}" for i in range(3000)]
+        
+        assignment = ring.assign(keys)
+        
+        assert sorted(k for shard in assignment.values() for k in shard) == sorted(keys)
+        for shard in assignment.values():
+            assert len(shard) > 500
+    
+    def test_adding_worker_moves_few_keys(self):
+        """Only keys taken over by the new worker change owner."""
+        ring = ConsistentHashRing(["worker-a", "worker-b", "worker-c"])
+        keys = [f"source-{i}" for i in range(2000)]
+        before = {key: ring.get_node(key) for key in keys}
+        
+        ring.add_node("worker-d")
+        after = {key: ring.get_node(key) for key in keys}
+        
+        moved = [key for key in keys if before[key] != after[key]]
+        assert all(after[key] == "worker-d" for key in moved)
+        assert len(moved) < len(keys) / 2
+    
+    def test_removing_worker_rebalances_its_keys(self):
+        """Keys owned by a departed worker are spread over the survivors."""
+        ring = ConsistentHashRing(["worker-a", "worker-b", "worker-c"])
+        keys = [f"source-{i}" for i in range(2000)]
+        before = {key: ring.get_node(key) for key in keys}
+        
+        ring.remove_node("worker-b")
+        
+        for key in keys:
+            owner = ring.get_node(key)
+            assert owner != "worker-b"
+            if before[key] != "worker-b":
+                assert owner == before[key]
+
+
+class TestWorkerLeaseRegistry:
+    """Test cases for WorkerLeaseRegistry."""
+    
+    def test_heartbeat_and_release(self):
+        """Workers appear while leased and disappear once released."""
+        registry = WorkerLeaseRegistry(FakeRedis(), ttl_seconds=30)
+        
+        registry.heartbeat("celery@node2")
+        registry.heartbeat("celery@node1")
+        assert registry.live_workers() == ["celery@node1", "celery@node2"]
+        
+        registry.release("celery@node2")
+        assert registry.live_workers() == ["celery@node1"]
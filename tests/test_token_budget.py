@@ -0,0 +1,59 @@
+"""
+Unit tests for prompt token budgeting.
+"""
+from utils.token_budget import count_tokens, fit_to_budget, split_sentences
+
+LEAD = "Ford is recalling F-150 pickups in the United States. The problem affects the rear brakes. Dealers will fix it."
+FILLER = " ".join(f"The company also discussed general topic number {word} at some length." for word in "abcdefghijklmnopqrst")
+QUOTE = "“Safety is our priority,” a spokesperson said."
+FIGURE = "The recall covers 870,000 trucks built since 2021."
+
+
+class TestSplitSentences:
+    """Test cases for split_sentences."""
+    
+    def test_splits_on_sentence_ends_and_paragraphs(self):
+        """Sentences split after terminal punctuation and at newlines."""
+        text = "First sentence. Second one!\n“Quoted,” he said. 2024 sales rose."
+        
+        assert split_sentences(text) == ["First sentence.", "Second one!", "“Quoted,” he said.", "2024 sales rose."]
+
+
+class TestFitToBudget:
+    """Test cases for fit_to_budget."""
+    
+    def test_short_text_unchanged(self):
+        """Text within budget is sent as is."""
+        assert fit_to_budget(LEAD, budget=1000) == LEAD
+    
+    def test_long_text_keeps_lead_quotes_and_figures(self):
+        """Over budget, the lead and the quote and figure sentences win over filler."""
+        text = " ".join([LEAD, FILLER, QUOTE, FILLER, FIGURE])
+        budget = count_tokens(LEAD) + count_tokens(QUOTE) + count_tokens(FIGURE) + 20
+        
+        fitted = fit_to_budget(text, budget=budget)
+        
+        assert fitted.startswith(LEAD)
+        assert QUOTE in fitted
+        assert fitted.endswith(FIGURE)
+        assert count_tokens(fitted) <= budget
+    
+    def test_unpunctuated_text_is_cut_not_emptied(self):
+        """Over-budget text without sentence breaks falls back to its start."""
+        text = " ".join(["word"] * 5000)
+        
+        fitted = fit_to_budget(text, budget=1500)
+        
+        assert fitted
+        assert text.startswith(fitted)
+        assert count_tokens(fitted) <= 1500
+    
+    def test_oversized_lead_sentence_is_cut(self):
+        """A lead sentence larger than the budget is truncated, not dropped."""
+        long_lead = "Ford said " + " ".join(["trucks"] * 400) + "."
+        text = " ".join([long_lead, FIGURE])
+        
+        fitted = fit_to_budget(text, budget=50)
+        
+        assert fitted.startswith("Ford said trucks")
+        assert count_tokens(fitted) <= 50
@@ -0,0 +1,119 @@
+"""
+Unit tests for Google News URL resolution.
+"""
+import base64
+import pytest
+from unittest.mock import AsyncMock, Mock
+from utils.url_resolver import UrlResolver, is_google_news_url, original_url_from_metadata
+
+
+def _article_id(url: str) -> str:
+    """Build a Google News style article id wrapping a URL."""
+    encoded = url.encode()
+    length = len(encoded)
+    varint = bytes([length]) if length < 0x80 else bytes([(length & 0x7f) | 0x80, length >> 7])
+    payload = b"\x08\x13\x22" + varint + encoded + b"\xd2\x01\x00"
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def _mock_db(cached=None):
+    """Mock database exposing the url_resolutions collection."""
+    db = Mock()
+    db.url_resolutions.find_one = AsyncMock(return_value=cached)
+    db.url_resolutions.update_one = AsyncMock()
+    return db
+
+
+class TestOriginalUrlFromMetadata:
+    """Test cases for metadata-based resolution."""
+    
+    def test_decodes_article_id(self):
+        """URLs embedded in the article id are recovered exactly."""
+        url = "https://www.reuters.com/business/autos-transportation/ford-recalls-trucks"
+        link = f"https://news.google.com/rss/articles/{_article_id(url)}?oc=5"
+        
+        assert original_url_from_metadata(link) == url
+    
+    def test_decodes_long_urls(self):
+        """URLs longer than 127 bytes use a two-byte length."""
+        url = "https://example.com/" + "a" * 200
+        link = f"https://news.google.com/rss/articles/{_article_id(url)}"
+        
+        assert original_url_from_metadata(link) == url
+    
+    def test_legacy_url_parameter(self):
+        """Old redirect links carry the target in the url parameter."""
+        link = "https://news.google.com/news/url?sa=t&url=https://example.com/story&ct=ga"
+        
+        assert original_url_from_metadata(link) == "https://example.com/story"
+    
+    def test_description_link(self):
+        """A non-Google href in the description is used as a last resort."""
+        link = "https://news.google.com/rss/articles/AU_yqLopaque"
+        description = '<a href="https://news.google.com/x">x</a> <a href="https://example.com/story">y</a>'
+        
+        assert original_url_from_metadata(link, description) == "https://example.com/story"
+    
+    def test_opaque_id(self):
+        """Ids without an embedded URL are left for the network fallback."""
+        assert original_url_from_metadata("https://news.google.com/rss/articles/AU_yqLopaque") is None
+
+
+class TestUrlResolver:
+    """Test cases for UrlResolver."""
+    
+    @pytest.mark.asyncio
+    async def test_non_google_links_pass_through(self):
+        """Publisher links are returned untouched without touching the cache."""
+        db = _mock_db()
+        resolver = UrlResolver(db)
+        
+        assert await resolver.resolve("https://example.com/story") == "https://example.com/story"
+        db.url_resolutions.find_one.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_cached_resolution_is_reused(self):
+        """A stored resolution is returned without decoding or fetching."""
+        db = _mock_db({"resolved_url": "https://example.com/cached"})
+        resolver = UrlResolver(db)
+        
+        resolved = await resolver.resolve("https://news.google.com/rss/articles/AU_yqLopaque?oc=5")
+        
+        assert resolved == "https://example.com/cached"
+        db.url_resolutions.update_one.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_metadata_resolution_is_stored_once(self):
+        """A new resolution is persisted and memoized for repeat sightings."""
+        url = "https://example.com/ev-story"
+        link = f"https://news.google.com/rss/articles/{_article_id(url)}"
+        db = _mock_db()
+        resolver = UrlResolver(db)
+        
+        assert await resolver.resolve(link + "?oc=5") == url
+        assert await resolver.resolve(link + "?oc=6") == url
+        
+        db.url_resolutions.find_one.assert_awaited_once()
+        db.url_resolutions.update_one.assert_awaited_once()
+    
+    @pytest.mark.asyncio
+    async def test_redirect_fallback(self):
+        """Opaque ids are resolved by following redirects."""
+        response = Mock()
+        response.url = "https://example.com/redirected"
+        session = Mock()
+        session.get.return_value.__aenter__ = AsyncMock(return_value=response)
+        session.get.return_value.__aexit__ = AsyncMock(return_value=False)
+        db = _mock_db()
+        
+        async with UrlResolver(db, session=session) as resolver:
+            resolved = await resolver.resolve("https://news.google.com/rss/articles/AU_yqLopaque")
+        
+        assert resolved == "https://example.com/redirected"
+        stored = db.url_resolutions.update_one.call_args.args[1]["$setOnInsert"]
+        assert stored["method"] == "redirect"
+    
+    def test_is_google_news_url(self):
+        """Only Google News hosts are treated as redirects."""
+        assert is_google_news_url("https://news.google.com/rss/articles/x")
+        assert not is_google_news_url("https://www.google.com/search?q=cars")
@@ -1,27 +1,164 @@
 """
 AI processing utilities for article enrichment using OpenAI.
 """
+import asyncio
+import hashlib
 import json
 import re
-from typing import Dict, Any, List, Optional
+import time
+from typing import Dict, Any, List, Optional, Tuple
 import structlog
-from openai import AsyncOpenAI
+from openai import AsyncOpenAI, APIConnectionError, InternalServerError, RateLimitError
 from backend.config import settings
 from backend.models import CategoryEnum, SentimentEnum, Entity, EntityTypeEnum
+from utils.batch_enrichment import BatchItem, pack_batches, run_batch
+from utils.enrichment_cache import EnrichmentCache
+from utils.metrics import ENRICHMENT_REPAIRS, ENRICHMENT_TOKENS
+from utils.model_router import Route, default_route, record_route
+from utils.rate_limiter import ERROR, OK, THROTTLED, backoff_delay, get_rate_limiter
+from utils.token_budget import count_tokens, fit_to_budget
 
 logger = structlog.get_logger(__name__)
 
+SYSTEM_PROMPT = "You are an expert news analyst specializing in automotive industry content. You must respond ONLY with valid JSON."
+
+# Static instructions come first so every request shares an identical prefix
+PROMPT_INSTRUCTIONS = """Analyze the automotive industry article below and provide structured JSON output with the following fields:
+
+Required JSON Response Format:
+{
+    "ai_title": "Create a concise, engaging title (max 15 words)",
+    "published_at": "YYYY-MM-DDTHH:MM:SSZ (estimate if not provided)",
+    "industry": "automotive",
+    "category": "one of: product_launch, regulation, corporate_financial, technology, recall, market_sales, opinion",
+    "short_summary": "Brief summary (max 120 words)",
+    "long_summary": "Detailed summary (300-500 words exactly - count words carefully)",
+    "sentiment_label": "positive, neutral, or negative",
+    "sentiment_score": 0.0-1.0,
+    "entities": [
+        {"type": "company|product|person", "name": "entity_name"}
+    ],
+    "tags": ["tag1", "tag2", "tag3"]
+}
+
+IMPORTANT REQUIREMENTS:
+1. long_summary must be EXACTLY 300-500 words (count words)
+2. short_summary must be max 120 words
+3. ai_title must be max 15 words
+4. category must be one of the specified values
+5. sentiment_score must be 0.0-1.0
+6. Respond ONLY with valid JSON, no additional text
+7. Base analysis on the provided text, don't hallucinate facts
+8. If information is unclear, use "unknown" or reasonable defaults
+"""
+
+# Fast pass of progressive enrichment: everything but the long summary
+FAST_INSTRUCTIONS = """Analyze the automotive industry article below and provide structured JSON output with the following fields:
+
+Required JSON Response Format:
+{
+    "ai_title": "Create a concise, engaging title (max 15 words)",
+    "category": "one of: product_launch, regulation, corporate_financial, technology, recall, market_sales, opinion",
+    "short_summary": "Brief summary (max 120 words)",
+    "sentiment_label": "positive, neutral, or negative",
+    "sentiment_score": 0.0-1.0,
+    "entities": [
+        {"type": "company|product|person", "name": "entity_name"}
+    ],
+    "tags": ["tag1", "tag2", "tag3"]
+}
+
+IMPORTANT REQUIREMENTS:
+1. short_summary must be max 120 words
+2. ai_title must be max 15 words
+3. category must be one of the specified values
+4. sentiment_score must be 0.0-1.0
+5. Respond ONLY with valid JSON, no additional text
+6. Base analysis on the provided text, don't hallucinate facts
+"""
+
+# Deferred pass of progressive enrichment
+LONG_SUMMARY_INSTRUCTIONS = """Write a detailed summary of the automotive industry article below and respond with JSON:
+{"long_summary": "Detailed summary (300-500 words exactly - count words carefully)"}
+
+IMPORTANT REQUIREMENTS:
+1. long_summary must be EXACTLY 300-500 words (count words)
+2. Respond ONLY with valid JSON, no additional text
+3. Base the summary on the provided text, don't hallucinate facts
+"""
+
+# Targeted re-ask for the fields a response left missing or invalid
+REPAIR_INSTRUCTIONS = """Part of an earlier analysis of the automotive industry article below was missing or invalid. Provide ONLY the following fields as JSON:
+{{
+{fields}
+}}
+
+IMPORTANT REQUIREMENTS:
+{problems}
+- Respond ONLY with valid JSON containing exactly these fields, no additional text
+- Base analysis on the provided text, don't hallucinate facts
+"""
+
+FAST_FIELDS = [
+    'ai_title', 'category', 'short_summary', 'sentiment_label', 'sentiment_score', 'entities', 'tags'
+]
+REQUIRED_FIELDS = [
+    'ai_title', 'category', 'short_summary', 'long_summary',
+    'sentiment_label', 'sentiment_score', 'entities', 'tags'
+]
+
+# Field lines of the enrichment prompt, reused to re-ask single fields
+FIELD_SPECS = {
+    'ai_title': '"ai_title": "Create a concise, engaging title (max 15 words)"',
+    'category': '"category": "one of: product_launch, regulation, corporate_financial, technology, recall, market_sales, opinion"',
+    'short_summary': '"short_summary": "Brief summary (max 120 words)"',
+    'long_summary': '"long_summary": "Detailed summary (300-500 words exactly - count words carefully)"',
+    'sentiment_label': '"sentiment_label": "positive, neutral, or negative"',
+    'sentiment_score': '"sentiment_score": 0.0-1.0',
+    'entities': '"entities": [{"type": "company|product|person", "name": "entity_name"}]',
+    'tags': '"tags": ["tag1", "tag2", "tag3"]'
+}
+
+# Start of a top-level field in a response that is not valid JSON as a whole
+FIELD_START = re.compile(r'"(\w+)"\s*:\s*')
+
+ARTICLE_TEMPLATE = """
+Article Details:
+- Title: {title}
+- Publisher: {publisher}
+- URL: {url}
+- Text: {text}
+"""
+
+
+def _prompt_version(instructions: str) -> str:
+    """Hash of a prompt, so cached results from an older prompt are not reused."""
+    return hashlib.sha256((SYSTEM_PROMPT + instructions + ARTICLE_TEMPLATE).encode("utf-8")).hexdigest()[:12]
+
+
+PROMPT_VERSION = _prompt_version(PROMPT_INSTRUCTIONS)
+FAST_PROMPT_VERSION = _prompt_version(FAST_INSTRUCTIONS)
+LONG_SUMMARY_PROMPT_VERSION = _prompt_version(LONG_SUMMARY_INSTRUCTIONS)
+
 
 class AIProcessor:
     """AI processor for article enrichment using OpenAI."""
     
-    def __init__(self):
-        self.client = AsyncOpenAI(api_key=settings.openai_api_key)
-        self.model = settings.openai_model
-        self.max_tokens = settings.openai_max_tokens
+    def __init__(self, cache: Optional[EnrichmentCache] = None, route: Optional[Route] = None):
+        # Retries are ours, so throttling reaches the shared rate limiter
+        self.client = AsyncOpenAI(api_key=settings.openai_api_key, max_retries=0)
+        self.route = route or default_route()
+        self.model = self.route.model
+        self.max_tokens = self.route.max_tokens
+        # openai_fast_max_tokens is sized for the standard route's completion limit
+        self.fast_max_tokens = max(
+            1, round(settings.openai_fast_max_tokens * self.max_tokens / settings.openai_max_tokens)
+        )
         self.temperature = settings.openai_temperature
+        self.cache = cache
     
-    async def process_article(self, title: str, text: str, url: str, publisher: str) -> Dict[str, Any]:
+    async def process_article(self, title: str, text: str, url: str, publisher: str,
+                              fast: bool = False) -> Dict[str, Any]:
         """
         Process article through OpenAI for enrichment.
         
@@ -30,37 +167,55 @@ class AIProcessor:
             text: Cleaned article text
             url: Article URL
             publisher: Publisher name
+            fast: Skip the long summary, leaving it pending for generate_long_summary
             
         Returns:
             Dict containing AI-enriched data
         """
+        instructions = FAST_INSTRUCTIONS if fast else PROMPT_INSTRUCTIONS
+        max_tokens = self.fast_max_tokens if fast else self.max_tokens
+        version = self._cache_version(FAST_PROMPT_VERSION if fast else PROMPT_VERSION, max_tokens)
         try:
+            if self.cache:
+                cached = await self.cache.get(text, self.model, version)
+                if cached:
+                    logger.info("Using cached enrichment", title=title[:100], url=url)
+                    return {**cached, 'title_original': title, 'publisher': publisher,
+                            'token_usage': {'prompt_tokens': 0, 'completion_tokens': 0}}
+            
             logger.info("Processing article with AI", title=title[:100], url=url)
             
-            prompt = self._create_prompt(title, text, url, publisher)
-            
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert news analyst specializing in automotive industry content. You must respond ONLY with valid JSON."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                max_tokens=self.max_tokens,
-                temperature=self.temperature,
-                response_format={"type": "json_object"}
-            )
+            prompt = self._create_prompt(title, text, url, publisher, instructions)
+            
+            started = time.monotonic()
+            response = await self._complete(prompt, max_tokens=max_tokens)
             
             ai_response = response.choices[0].message.content
             logger.debug("Received AI response", length=len(ai_response))
+            token_usage = self._token_usage(response)
+            
+            # Re-ask only for fields that came back missing or invalid
+            data = self._salvage_fields(ai_response)
+            repaired = []
+            if data:
+                data, repaired, repair_usage = await self._repair_fields(
+                    data, FAST_FIELDS if fast else REQUIRED_FIELDS, title, text, url, publisher
+                )
+                for key, value in repair_usage.items():
+                    token_usage[key] += value
+            latency = time.monotonic() - started
             
             # Parse and validate response
-            enriched_data = self._parse_ai_response(ai_response, title, text, url, publisher)
+            enriched_data = self._parse_ai_response(json.dumps(data) if data else ai_response,
+                                                    title, text, url, publisher, fast=fast)
+            enriched_data['ai_raw_response']['raw_response'] = ai_response
+            if repaired:
+                enriched_data['ai_raw_response']['repaired_fields'] = repaired
+            enriched_data['token_usage'] = token_usage
+            
+            if self.cache:
+                await self.cache.put(text, self.model, version, enriched_data)
+            enriched_data['enrichment_route'] = record_route(self.route, enriched_data['token_usage'], latency)
             
             logger.info("Successfully processed article with AI", 
                        title=title[:100], category=enriched_data.get('category'))
@@ -72,69 +227,286 @@ class AIProcessor:
                         title=title[:100], error=str(e))
             raise
     
-    def _create_prompt(self, title: str, text: str, url: str, publisher: str) -> str:
+    async def generate_long_summary(self, title: str, text: str, url: str, publisher: str) -> Dict[str, Any]:
+        """Deferred pass of progressive enrichment: the 300-500 word long summary and its token usage."""
+        version = self._cache_version(LONG_SUMMARY_PROMPT_VERSION, self.max_tokens)
+        if self.cache:
+            cached = await self.cache.get(text, self.model, version)
+            if cached:
+                return {**cached, 'token_usage': {'prompt_tokens': 0, 'completion_tokens': 0}}
+        
+        prompt = self._create_prompt(title, text, url, publisher, LONG_SUMMARY_INSTRUCTIONS)
+        started = time.monotonic()
+        response = await self._complete(prompt)
+        token_usage = self._token_usage(response)
+        
+        data = self._salvage_fields(response.choices[0].message.content)
+        data, _, repair_usage = await self._repair_fields(data, ['long_summary'], title, text, url, publisher)
+        for key, value in repair_usage.items():
+            token_usage[key] += value
+        latency = time.monotonic() - started
+        
+        if not isinstance(data.get('long_summary'), str):
+            raise ValueError("Invalid long summary response from AI: missing long_summary")
+        
+        result = {'long_summary': self._fit_long_summary(data['long_summary'])}
+        if self.cache:
+            await self.cache.put(text, self.model, version, result)
+        
+        result['token_usage'] = token_usage
+        result['enrichment_route'] = record_route(self.route, token_usage, latency)
+        return result
+    
+    def _cache_version(self, prompt_version: str, max_tokens: int) -> str:
+        """
+        Prompt version extended with the route and budgets that shape the completion.
+        
+        The article text in the prompt depends on the input budget and lead
+        sentences, and a lower completion limit can truncate the response,
+        so results produced under other budgets are not reused.
+        """
+        budgets = f"{self.route.name}:{self.route.input_budget}:{settings.prompt_lead_sentences}:{max_tokens}"
+        return f"{prompt_version}-{hashlib.sha256(budgets.encode('utf-8')).hexdigest()[:8]}"
+    
+    def _create_prompt(self, title: str, text: str, url: str, publisher: str,
+                       instructions: str = PROMPT_INSTRUCTIONS) -> str:
         """Create structured prompt for OpenAI."""
         
-        # Truncate text if too long (keep first 4000 characters)
-        truncated_text = text[:4000] if len(text) > 4000 else text
+        # Keep the most informative sentences that fit the token budget
+        budgeted_text = fit_to_budget(text, budget=self.route.input_budget, model=self.model)
         
-        prompt = f"""
-Analyze this automotive industry article and provide structured JSON output with the following fields:
-
-Article Details:
-- Title: {title}
-- Publisher: {publisher}
-- URL: {url}
-- Text: {truncated_text}
-
-Required JSON Response Format:
-{{
-    "ai_title": "Create a concise, engaging title (max 15 words)",
-    "title_original": "{title}",
-    "publisher": "{publisher}",
-    "published_at": "YYYY-MM-DDTHH:MM:SSZ (estimate if not provided)",
-    "industry": "automotive",
-    "category": "one of: product_launch, regulation, corporate_financial, technology, recall, market_sales, opinion",
-    "short_summary": "Brief summary (max 120 words)",
-    "long_summary": "Detailed summary (300-500 words exactly - count words carefully)",
-    "sentiment_label": "positive, neutral, or negative",
-    "sentiment_score": 0.0-1.0,
-    "entities": [
-        {{"type": "company|product|person", "name": "entity_name"}}
-    ],
-    "tags": ["tag1", "tag2", "tag3"]
-}}
-
-IMPORTANT REQUIREMENTS:
-1. long_summary must be EXACTLY 300-500 words (count words)
-2. short_summary must be max 120 words
-3. ai_title must be max 15 words
-4. category must be one of the specified values
-5. sentiment_score must be 0.0-1.0
-6. Respond ONLY with valid JSON, no additional text
-7. Base analysis on the provided text, don't hallucinate facts
-8. If information is unclear, use "unknown" or reasonable defaults
-"""
-        return prompt
+        return instructions + ARTICLE_TEMPLATE.format(
+            title=title, publisher=publisher, url=url, text=budgeted_text
+        )
     
-    def _parse_ai_response(self, ai_response: str, title: str, text: str, url: str, publisher: str) -> Dict[str, Any]:
-        """Parse and validate AI response."""
+    async def complete(self, system: str, prompt: str, max_tokens: int) -> Tuple[str, Dict[str, int]]:
+        """Provider interface for batch enrichment: completion text and token usage."""
+        response = await self._complete(prompt, system=system, max_tokens=max_tokens)
+        return response.choices[0].message.content, self._token_usage(response)
+    
+    async def process_batch(self, items: List[BatchItem], provider=None) -> Dict[str, Dict[str, Any]]:
+        """
+        Enrich short articles several to a request.
+        
+        Returns validated enrichments keyed by raw_article_id. Articles whose
+        request failed or that the response left out are simply absent, for
+        the caller to enrich one at a time. Token usage is split evenly
+        across the articles of a request.
+        """
+        provider = provider or self
+        results: Dict[str, Dict[str, Any]] = {}
+        
+        for batch in pack_batches(items):
+            try:
+                fields_by_id, usage = await run_batch(batch, provider)
+            except Exception as e:
+                logger.error("Batch enrichment request failed", articles=len(batch), error=str(e))
+                continue
+            
+            share = {key: value // len(batch) for key, value in usage.items()}
+            for item in batch:
+                fields = fields_by_id.get(item.raw_article_id)
+                if fields is None:
+                    continue
+                try:
+                    data = self._parse_ai_response(json.dumps(fields), item.title, item.text, item.url, item.publisher)
+                except ValueError as e:
+                    logger.warning("Invalid article in batch response", raw_article_id=item.raw_article_id, error=str(e))
+                    continue
+                data['token_usage'] = share
+                results[item.raw_article_id] = data
+        
+        return results
+    
+    async def _complete(self, prompt: str, system: str = SYSTEM_PROMPT, max_tokens: Optional[int] = None):
+        """
+        Send the chat completion through the shared rate limiter.
+        
+        429s and transient failures are retried here with jittered
+        backoff, and each outcome adjusts the cluster's concurrency limit.
+        """
+        max_tokens = max_tokens or self.max_tokens
+        limiter = get_rate_limiter()
+        estimated_tokens = count_tokens(system + prompt, self.model) + max_tokens
+        
+        for attempt in range(settings.openai_rate_limit_retries + 1):
+            slot = await limiter.acquire(estimated_tokens) if limiter else None
+            started = time.monotonic()
+            try:
+                response = await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": system
+                        },
+                        {
+                            "role": "user",
+                            "content": prompt
+                        }
+                    ],
+                    max_tokens=max_tokens,
+                    temperature=self.temperature,
+                    response_format={"type": "json_object"}
+                )
+            except (RateLimitError, APIConnectionError, InternalServerError) as e:
+                if limiter:
+                    await limiter.release(slot, THROTTLED if isinstance(e, RateLimitError) else ERROR)
+                if attempt == settings.openai_rate_limit_retries:
+                    raise
+                
+                delay = backoff_delay(attempt)
+                logger.warning("OpenAI call failed, retrying", error=str(e), attempt=attempt + 1, delay=round(delay, 1))
+                await asyncio.sleep(delay)
+                continue
+            except Exception:
+                if limiter:
+                    await limiter.release(slot, ERROR)
+                raise
+            
+            if limiter:
+                used = getattr(getattr(response, 'usage', None), 'total_tokens', None)
+                if not isinstance(used, int):
+                    used = estimated_tokens
+                await limiter.release(slot, OK, latency=time.monotonic() - started,
+                                      refund_tokens=estimated_tokens - used)
+            return response
+    
+    def _salvage_fields(self, ai_response: str) -> Dict[str, Any]:
+        """
+        The known fields of a response, read one by one if it is not valid JSON.
+        
+        A response cut off by the token limit or broken in one value still
+        yields every field before (and after) the damage.
+        """
+        ai_response = self._strip_fences(ai_response)
+        try:
+            data = json.loads(ai_response)
+            return data if isinstance(data, dict) else {}
+        except json.JSONDecodeError:
+            pass
+        
+        decoder = json.JSONDecoder()
+        data: Dict[str, Any] = {}
+        for match in FIELD_START.finditer(ai_response):
+            field = match.group(1)
+            if field not in FIELD_SPECS or field in data:
+                continue
+            try:
+                data[field], _ = decoder.raw_decode(ai_response, match.end())
+            except json.JSONDecodeError:
+                continue
+        return data
+    
+    def _field_problems(self, data: Dict[str, Any], fields: List[str]) -> Dict[str, str]:
+        """Fields that are missing or invalid enough to re-ask, with what is wrong."""
+        problems = {}
+        for field in fields:
+            value = data.get(field)
+            if field not in data:
+                problems[field] = f"{field} was missing"
+            elif field in ('ai_title', 'short_summary') and not (isinstance(value, str) and value.strip()):
+                problems[field] = f"{field} must be a non-empty string"
+            elif field == 'long_summary':
+                words = len(value.split()) if isinstance(value, str) else 0
+                if not 300 <= words <= 500:
+                    problems[field] = f"long_summary had {words} words; it must be 300-500 words"
+            elif field == 'category' and value not in [cat.value for cat in CategoryEnum]:
+                problems[field] = f"category {value!r} is not one of the allowed values"
+            elif field == 'sentiment_label' and value not in [sent.value for sent in SentimentEnum]:
+                problems[field] = f"sentiment_label {value!r} must be positive, neutral, or negative"
+        return problems
+    
+    async def _repair_fields(self, data: Dict[str, Any], fields: List[str], title: str, text: str,
+                             url: str, publisher: str) -> Tuple[Dict[str, Any], List[str], Dict[str, int]]:
+        """
+        Re-ask for missing or invalid fields and merge the valid answers into data.
+        
+        Returns the merged fields, the fields repaired and the tokens spent.
+        Fields still invalid after openai_repair_attempts are left for
+        _parse_ai_response's defaults, or its error if they are missing.
+        """
+        data = dict(data)
+        repaired: List[str] = []
+        usage = {'prompt_tokens': 0, 'completion_tokens': 0}
+        problems = self._field_problems(data, fields)
+        
+        for _ in range(settings.openai_repair_attempts):
+            if not problems:
+                break
+            logger.info("Repairing AI response fields", fields=list(problems))
+            instructions = REPAIR_INSTRUCTIONS.format(
+                fields=",\n".join(f"    {FIELD_SPECS[field]}" for field in problems),
+                problems="\n".join(f"- {problem}" for problem in problems.values())
+            )
+            prompt = self._create_prompt(title, text, url, publisher, instructions)
+            try:
+                response = await self._complete(prompt, max_tokens=settings.openai_repair_max_tokens)
+            except Exception as e:
+                logger.warning("Field repair request failed", fields=list(problems), error=str(e))
+                break
+            for key, value in self._token_usage(response).items():
+                usage[key] += value
+            
+            answers = self._salvage_fields(response.choices[0].message.content)
+            fixed = [field for field in problems
+                     if field in answers and not self._field_problems(answers, [field])]
+            for field in fixed:
+                data[field] = answers[field]
+                repaired.append(field)
+                ENRICHMENT_REPAIRS.labels(field=field, result="repaired").inc()
+            problems = self._field_problems(data, fields)
+        
+        for field in problems:
+            ENRICHMENT_REPAIRS.labels(field=field, result="failed").inc()
+        return data, repaired, usage
+    
+    def _token_usage(self, response) -> Dict[str, int]:
+        """Prompt and completion token counts reported for a completion."""
+        usage = getattr(response, 'usage', None)
+        counts = {
+            'prompt_tokens': int(getattr(usage, 'prompt_tokens', 0) or 0),
+            'completion_tokens': int(getattr(usage, 'completion_tokens', 0) or 0)
+        }
+        ENRICHMENT_TOKENS.labels(kind="prompt").inc(counts['prompt_tokens'])
+        ENRICHMENT_TOKENS.labels(kind="completion").inc(counts['completion_tokens'])
+        return counts
+    
+    def _strip_fences(self, ai_response: str) -> str:
+        """Remove a Markdown code fence around a JSON response."""
+        ai_response = ai_response.strip()
+        if ai_response.startswith('```json'):
+            ai_response = ai_response[7:]
+        if ai_response.endswith('```'):
+            ai_response = ai_response[:-3]
+        return ai_response
+    
+    def _fit_long_summary(self, long_summary: str) -> str:
+        """Bring a long summary within 300-500 words."""
+        long_summary_words = len(long_summary.split())
+        if not 300 <= long_summary_words <= 500:
+            logger.warning("Long summary word count invalid", 
+                         words=long_summary_words, text=long_summary[:100])
+            # Truncate or pad as needed
+            if long_summary_words < 300:
+                long_summary += " " * (300 - long_summary_words)
+            elif long_summary_words > 500:
+                words = long_summary.split()[:500]
+                long_summary = " ".join(words)
+        return long_summary
+    
+    def _parse_ai_response(self, ai_response: str, title: str, text: str, url: str, publisher: str,
+                           fast: bool = False) -> Dict[str, Any]:
+        """Parse and validate AI response; a fast-pass response has no long summary yet."""
         try:
             # Clean the response
-            ai_response = ai_response.strip()
-            if ai_response.startswith('```json'):
-                ai_response = ai_response[7:]
-            if ai_response.endswith('```'):
-                ai_response = ai_response[:-3]
+            ai_response = self._strip_fences(ai_response)
             
             # Parse JSON
             data = json.loads(ai_response)
             
             # Validate required fields
-            required_fields = [
-                'ai_title', 'category', 'short_summary', 'long_summary',
-                'sentiment_label', 'sentiment_score', 'entities', 'tags'
-            ]
+            required_fields = FAST_FIELDS if fast else REQUIRED_FIELDS
             
             for field in required_fields:
                 if field not in data:
@@ -159,16 +531,11 @@ IMPORTANT REQUIREMENTS:
                 data['sentiment_score'] = 0.5
             
             # Validate word counts
-            long_summary_words = len(data['long_summary'].split())
-            if not 300 <= long_summary_words <= 500:
-                logger.warning("Long summary word count invalid", 
-                             words=long_summary_words, text=data['long_summary'][:100])
-                # Truncate or pad as needed
-                if long_summary_words < 300:
-                    data['long_summary'] += " " * (300 - long_summary_words)
-                elif long_summary_words > 500:
-                    words = data['long_summary'].split()[:500]
-                    data['long_summary'] = " ".join(words)
+            if fast:
+                data['long_summary'] = ""
+                data['long_summary_status'] = "pending"
+            else:
+                data['long_summary'] = self._fit_long_summary(data['long_summary'])
             
             short_summary_words = len(data['short_summary'].split())
             if short_summary_words > 120:
@@ -230,10 +597,26 @@ IMPORTANT REQUIREMENTS:
 
 
 # Standalone function for use in workers
-async def process_article_with_ai(title: str, text: str, url: str, publisher: str) -> Dict[str, Any]:
+async def process_article_with_ai(title: str, text: str, url: str, publisher: str,
+                                  cache: Optional[EnrichmentCache] = None, fast: bool = False,
+                                  route: Optional[Route] = None) -> Dict[str, Any]:
     """Standalone function to process article with AI."""
+    processor = AIProcessor(cache=cache, route=route)
+    return await processor.process_article(title, text, url, publisher, fast=fast)
+
+
+async def generate_long_summary(title: str, text: str, url: str, publisher: str,
+                                cache: Optional[EnrichmentCache] = None,
+                                route: Optional[Route] = None) -> Dict[str, Any]:
+    """Standalone function for the deferred long-summary pass."""
+    processor = AIProcessor(cache=cache, route=route)
+    return await processor.generate_long_summary(title, text, url, publisher)
+
+
+async def process_articles_in_batches(items: List[BatchItem], provider=None) -> Dict[str, Dict[str, Any]]:
+    """Standalone function to enrich short articles several per request."""
     processor = AIProcessor()
-    return await processor.process_article(title, text, url, publisher)
+    return await processor.process_batch(items, provider=provider)
 
 
 # Import datetime here to avoid circular imports
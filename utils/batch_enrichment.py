@@ -0,0 +1,141 @@
+"""
+Batch enrichment: several short articles packed into one structured request.
+
+Used for backfills and bursts, where per-call overhead and rate limits
+dominate. A provider is anything with
+``async complete(system, prompt, max_tokens) -> (content, usage)``;
+AIProcessor is the OpenAI one and FakeBatchProvider answers offline.
+"""
+import json
+import re
+from typing import Any, Dict, List, NamedTuple, Tuple
+import structlog
+from backend.config import settings
+from utils.token_budget import count_tokens, fit_to_budget
+
+logger = structlog.get_logger(__name__)
+
+BATCH_SYSTEM_PROMPT = (
+    "You are an expert news analyst specializing in automotive industry content. "
+    "You analyze several articles at once and must respond ONLY with valid JSON."
+)
+
+BATCH_INSTRUCTIONS = """Analyze each automotive industry article below independently and respond with JSON of the form:
+{"articles": [{"id": "<article id>", ...fields...}, ...]}
+
+Each article object must contain:
+    "id": the article id exactly as given,
+    "ai_title": "Create a concise, engaging title (max 15 words)",
+    "category": "one of: product_launch, regulation, corporate_financial, technology, recall, market_sales, opinion",
+    "short_summary": "Brief summary (max 120 words)",
+    "long_summary": "Detailed summary (300-500 words exactly - count words carefully)",
+    "sentiment_label": "positive, neutral, or negative",
+    "sentiment_score": 0.0-1.0,
+    "entities": [{"type": "company|product|person", "name": "entity_name"}],
+    "tags": ["tag1", "tag2", "tag3"]
+
+IMPORTANT REQUIREMENTS:
+1. Return exactly one object per article, in any order, never merging articles
+2. long_summary must be EXACTLY 300-500 words (count words)
+3. short_summary must be max 120 words; ai_title max 15 words
+4. Base each analysis only on that article's text, don't hallucinate facts
+"""
+
+ARTICLE_BLOCK = """
+### Article {id}
+- Title: {title}
+- Publisher: {publisher}
+- URL: {url}
+- Text: {text}
+"""
+
+ARTICLE_HEADER = re.compile(r"^### Article (\S+)$", re.MULTILINE)
+
+
+class BatchItem(NamedTuple):
+    """One article to enrich as part of a batch."""
+    raw_article_id: str
+    title: str
+    text: str
+    url: str
+    publisher: str
+
+
+def is_batchable(item: BatchItem) -> bool:
+    """True for articles short enough to share a request with others."""
+    return count_tokens(item.text) <= settings.batch_article_token_budget
+
+
+def pack_batches(items: List[BatchItem]) -> List[List[BatchItem]]:
+    """Group articles into requests of at most batch_max_articles each."""
+    size = max(1, settings.batch_max_articles)
+    return [items[start:start + size] for start in range(0, len(items), size)]
+
+
+def build_batch_prompt(batch: List[BatchItem]) -> str:
+    """The user prompt for one packed request; articles are numbered from 1."""
+    blocks = [
+        ARTICLE_BLOCK.format(
+            id=index, title=item.title, publisher=item.publisher, url=item.url,
+            text=fit_to_budget(item.text, budget=settings.batch_article_token_budget)
+        )
+        for index, item in enumerate(batch, start=1)
+    ]
+    return BATCH_INSTRUCTIONS + "".join(blocks)
+
+
+def split_batch_response(content: str, batch: List[BatchItem]) -> Dict[str, Dict[str, Any]]:
+    """Map a packed response's article objects back to raw_article_ids."""
+    data = json.loads(content)
+    articles = data.get("articles", []) if isinstance(data, dict) else data
+    
+    results: Dict[str, Dict[str, Any]] = {}
+    for article in articles if isinstance(articles, list) else []:
+        if not isinstance(article, dict):
+            continue
+        try:
+            index = int(str(article.pop("id", "")).strip())
+        except ValueError:
+            continue
+        if 1 <= index <= len(batch):
+            results[batch[index - 1].raw_article_id] = article
+    
+    missing = len(batch) - len(results)
+    if missing:
+        logger.warning("Batch response is missing articles", expected=len(batch), missing=missing)
+    return results
+
+
+async def run_batch(batch: List[BatchItem], provider) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, int]]:
+    """Send one packed request and return unvalidated fields per raw_article_id, plus token usage."""
+    max_tokens = settings.batch_output_tokens_per_article * len(batch)
+    content, usage = await provider.complete(BATCH_SYSTEM_PROMPT, build_batch_prompt(batch), max_tokens)
+    return split_batch_response(content, batch), usage
+
+
+class FakeBatchProvider:
+    """Offline provider returning well-formed enrichments for every article in a prompt."""
+    
+    def __init__(self, drop: int = 0):
+        self.drop = drop  # Leave out this many articles, to exercise fallbacks
+        self.calls = 0
+    
+    async def complete(self, system: str, prompt: str, max_tokens: int) -> Tuple[str, Dict[str, int]]:
+        self.calls += 1
+        ids = ARTICLE_HEADER.findall(prompt)
+        articles = [
+            {
+                "id": article_id,
+                "ai_title": f"Fake enrichment of article {article_id}",
+                "category": "technology",
+                "short_summary": f"Short summary of article {article_id}.",
+                "long_summary": " ".join(["summary"] * 300),
+                "sentiment_label": "neutral",
+                "sentiment_score": 0.5,
+                "entities": [{"type": "company", "name": "Example Motors"}],
+                "tags": ["fake"]
+            }
+            for article_id in ids[self.drop:]
+        ]
+        usage = {"prompt_tokens": count_tokens(system + prompt), "completion_tokens": 400 * len(articles)}
+        return json.dumps({"articles": articles}), usage
@@ -0,0 +1,199 @@
+"""
+Compressed, content-addressed storage for scraped raw HTML.
+
+Pages are compressed with zstd (zlib when zstandard is not installed) and
+stored under the SHA-256 of their bytes, in GridFS or on local disk, with
+one metadata document per blob in html_blobs. Identical pages are stored
+once; blobs unused for html_retention_days are pruned.
+"""
+import asyncio
+import hashlib
+import os
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import structlog
+from gridfs.errors import NoFile
+from motor.motor_asyncio import AsyncIOMotorGridFSBucket
+from pymongo.errors import DuplicateKeyError
+from backend.config import settings
+from utils.metrics import HTML_BLOB_BYTES
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zlib fallback
+    zstandard = None
+
+logger = structlog.get_logger(__name__)
+
+
+def compress(data: bytes) -> Tuple[str, bytes]:
+    """Compress bytes, returning the codec name and payload."""
+    if zstandard is not None:
+        return "zstd", zstandard.ZstdCompressor(level=settings.html_compression_level).compress(data)
+    return "zlib", zlib.compress(data, 6)
+
+
+def decompress(codec: str, payload: bytes) -> bytes:
+    """Reverse compress() for the given codec."""
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read zstd-compressed HTML")
+        return zstandard.ZstdDecompressor().decompress(payload)
+    if codec == "zlib":
+        return zlib.decompress(payload)
+    return payload
+
+
+class DiskBlobBackend:
+    """Blobs as files under a root directory, fanned out by hash prefix."""
+    
+    def __init__(self, root: str):
+        self.root = Path(root)
+    
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / key[2:4] / key
+    
+    def _write(self, key: str, payload: bytes):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp = path.with_suffix(f".{os.getpid()}.tmp")
+        temp.write_bytes(payload)
+        os.replace(temp, path)
+    
+    def _read(self, key: str) -> Optional[bytes]:
+        try:
+            return self._path(key).read_bytes()
+        except FileNotFoundError:
+            return None
+    
+    def _delete(self, key: str):
+        try:
+            self._path(key).unlink()
+        except FileNotFoundError:
+            pass
+    
+    async def write(self, key: str, payload: bytes):
+        await asyncio.to_thread(self._write, key, payload)
+    
+    async def read(self, key: str) -> Optional[bytes]:
+        return await asyncio.to_thread(self._read, key)
+    
+    async def delete(self, key: str):
+        await asyncio.to_thread(self._delete, key)
+
+
+class GridFSBlobBackend:
+    """Blobs as GridFS files whose _id is the content hash."""
+    
+    def __init__(self, db, bucket_name: str = "html_blobs_fs"):
+        self.bucket = AsyncIOMotorGridFSBucket(db, bucket_name=bucket_name)
+    
+    async def write(self, key: str, payload: bytes):
+        try:
+            await self.bucket.upload_from_stream_with_id(key, key, payload)
+        except DuplicateKeyError:
+            pass  # Stored concurrently by another worker
+    
+    async def read(self, key: str) -> Optional[bytes]:
+        try:
+            stream = await self.bucket.open_download_stream(key)
+        except NoFile:
+            return None
+        return await stream.read()
+    
+    async def delete(self, key: str):
+        try:
+            await self.bucket.delete(key)
+        except NoFile:
+            pass
+
+
+class HtmlBlobStore:
+    """Stores raw HTML out of line and hands back a content-hash reference."""
+    
+    def __init__(self, db, backend=None):
+        self.db = db
+        if backend is None:
+            if settings.html_store_backend == "disk":
+                backend = DiskBlobBackend(settings.html_store_path)
+            else:
+                backend = GridFSBlobBackend(db)
+        self.backend = backend
+    
+    async def put(self, html: str) -> str:
+        """Store a page and return its reference, reusing an identical stored page."""
+        data = html.encode("utf-8")
+        key = hashlib.sha256(data).hexdigest()
+        now = datetime.utcnow()
+        
+        existing = await self.db.html_blobs.find_one_and_update(
+            {"_id": key},
+            {"$set": {"last_used_at": now}}
+        )
+        if existing:
+            return key
+        
+        codec, payload = compress(data)
+        await self.backend.write(key, payload)
+        await self.db.html_blobs.update_one(
+            {"_id": key},
+            {"$setOnInsert": {
+                "codec": codec,
+                "size": len(data),
+                "stored_size": len(payload),
+                "created_at": now
+            },
+             "$set": {"last_used_at": now}},
+            upsert=True
+        )
+        
+        HTML_BLOB_BYTES.labels(kind="raw").inc(len(data))
+        HTML_BLOB_BYTES.labels(kind="stored").inc(len(payload))
+        return key
+    
+    async def get(self, key: Optional[str]) -> Optional[str]:
+        """Load a stored page, or None if it was pruned."""
+        if not key:
+            return None
+        
+        meta = await self.db.html_blobs.find_one({"_id": key})
+        if not meta:
+            return None
+        
+        payload = await self.backend.read(key)
+        if payload is None:
+            logger.warning("HTML blob missing from backend", key=key)
+            return None
+        return decompress(meta["codec"], payload).decode("utf-8")
+    
+    async def prune(self, cutoff: datetime, batch_size: int = 500) -> int:
+        """Delete blobs not used since cutoff and drop references to them."""
+        pruned = 0
+        while True:
+            keys: List[str] = [
+                doc["_id"] async for doc in
+                self.db.html_blobs.find({"last_used_at": {"$lt": cutoff}}, {"_id": 1}).limit(batch_size)
+            ]
+            if not keys:
+                return pruned
+            
+            for key in keys:
+                await self.backend.delete(key)
+            await self.db.html_blobs.delete_many({"_id": {"$in": keys}})
+            await self.db.raw_articles.update_many(
+                {"raw_html_ref": {"$in": keys}},
+                {"$unset": {"raw_html_ref": ""}}
+            )
+            pruned += len(keys)
+
+
+async def load_raw_html(db, raw_article: Dict[str, Any]) -> Optional[str]:
+    """Raw HTML for a raw article, read from the blob store on demand."""
+    if raw_article.get("raw_html"):
+        # Documents written before HTML moved out of line
+        return raw_article["raw_html"]
+    if not raw_article.get("raw_html_ref"):
+        return None
+    return await HtmlBlobStore(db).get(raw_article["raw_html_ref"])
@@ -0,0 +1,130 @@
+"""
+Per-domain boilerplate learned from paragraphs repeated across pages.
+
+Every scraped page adds a hash of its URL to the page set of each of its
+paragraph fingerprints in boilerplate_paragraphs, so re-scraping a page
+never counts twice; a paragraph seen on boilerplate_min_pages distinct
+pages of a domain (newsletter pitches, related-story blurbs,
+cookie notices) is boilerplate and is stripped from later pages before
+they are stored and enriched. Tokens saved are totalled per domain in
+boilerplate_domains.
+"""
+import hashlib
+import re
+import time
+from datetime import datetime
+from typing import Dict, FrozenSet, List, Optional, Tuple
+import structlog
+from pymongo import UpdateOne
+from backend.config import settings
+from utils.metrics import BOILERPLATE_PARAGRAPHS_STRIPPED, BOILERPLATE_TOKENS_SAVED
+from utils.token_budget import count_tokens
+
+logger = structlog.get_logger(__name__)
+
+PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+DIGITS = re.compile(r"\d+")
+
+# domain -> (loaded_at, boilerplate fingerprints)
+_cache: Dict[str, Tuple[float, FrozenSet[str]]] = {}
+
+
+def split_paragraphs(text: str) -> List[str]:
+    """Paragraphs of extracted text, which separates blocks with blank lines."""
+    return [paragraph.strip() for paragraph in PARAGRAPH_BREAK.split(text or "") if paragraph.strip()]
+
+
+def fingerprint(paragraph: str) -> str:
+    """Hash of a paragraph ignoring case, whitespace and numbers (dates, counts)."""
+    normalized = DIGITS.sub("0", " ".join(paragraph.lower().split()))
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def page_hash(page: str) -> str:
+    """Short hash identifying a page within its domain's page sets."""
+    return hashlib.blake2b(page.encode("utf-8"), digest_size=8).hexdigest()
+
+
+class BoilerplateFilter:
+    """Learns and strips per-domain boilerplate paragraphs, cached in process."""
+    
+    def __init__(self, db):
+        self.db = db
+    
+    async def _load(self, domain: str) -> FrozenSet[str]:
+        """A domain's boilerplate fingerprints, refreshing the cache when stale."""
+        cached = _cache.get(domain)
+        if cached and time.monotonic() - cached[0] < settings.boilerplate_refresh_seconds:
+            return cached[1]
+        
+        fingerprints = frozenset([
+            doc["fingerprint"] async for doc in self.db.boilerplate_paragraphs.find(
+                {"domain": domain, "pages": {"$gte": settings.boilerplate_min_pages}},
+                {"fingerprint": 1}
+            )
+        ])
+        _cache[domain] = (time.monotonic(), fingerprints)
+        return fingerprints
+    
+    async def observe(self, domain: str, page: str, paragraphs: List[str]):
+        """Count one page's distinct paragraphs towards the domain's boilerplate, once per page."""
+        now = datetime.utcnow()
+        # The page set only needs to reach boilerplate_min_pages, so it is capped there
+        pages = {"$slice": [
+            {"$setUnion": [{"$ifNull": ["$page_hashes", []]}, [page]]}, settings.boilerplate_min_pages
+        ]}
+        operations = [
+            UpdateOne(
+                {"domain": domain, "fingerprint": key},
+                [
+                    {"$set": {"page_hashes": pages, "last_seen": now,
+                              "first_seen": {"$ifNull": ["$first_seen", now]}}},
+                    {"$set": {"pages": {"$size": "$page_hashes"}}},
+                ],
+                upsert=True
+            )
+            for key in {fingerprint(paragraph) for paragraph in paragraphs}
+        ]
+        if operations:
+            await self.db.boilerplate_paragraphs.bulk_write(operations, ordered=False)
+    
+    async def clean(self, domain: Optional[str], text: str, url: Optional[str] = None) -> Tuple[str, int]:
+        """
+        Learn from a scraped page and return its text without known boilerplate.
+        
+        Also returns the prompt tokens saved. A page made up entirely of
+        known paragraphs is returned unchanged rather than emptied. Pages
+        are told apart by URL, or by their text when no URL is given.
+        """
+        if not settings.boilerplate_enabled or not domain or not text:
+            return text, 0
+        
+        paragraphs = split_paragraphs(text)
+        try:
+            await self.observe(domain, page_hash(url or text), paragraphs)
+            boilerplate = await self._load(domain)
+        except Exception as e:
+            logger.warning("Could not update boilerplate stats", domain=domain, error=str(e))
+            return text, 0
+        
+        kept = [paragraph for paragraph in paragraphs if fingerprint(paragraph) not in boilerplate]
+        stripped = len(paragraphs) - len(kept)
+        if not stripped or not kept:
+            return text, 0
+        
+        cleaned = "\n\n".join(kept)
+        saved = count_tokens(text) - count_tokens(cleaned)
+        BOILERPLATE_PARAGRAPHS_STRIPPED.inc(stripped)
+        BOILERPLATE_TOKENS_SAVED.inc(saved)
+        try:
+            await self.db.boilerplate_domains.update_one(
+                {"domain": domain},
+                {"$inc": {"pages_cleaned": 1, "paragraphs_stripped": stripped, "tokens_saved": saved},
+                 "$set": {"updated_at": datetime.utcnow()}},
+                upsert=True
+            )
+        except Exception as e:
+            logger.warning("Could not record boilerplate savings", domain=domain, error=str(e))
+        
+        logger.debug("Stripped boilerplate", domain=domain, paragraphs=stripped, tokens_saved=saved)
+        return cleaned, saved
@@ -0,0 +1,123 @@
+"""
+URL canonicalization used to deduplicate articles across feeds and sightings.
+"""
+import re
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urljoin, urlparse, urlunparse
+
+# Query parameters that only carry campaign or click tracking
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "yclid", "igshid", "mc_cid", "mc_eid",
+    "ocid", "cmpid", "ito", "ncid", "sr_share", "smid", "smtyp", "taid",
+    "guccounter", "guce_referrer", "guce_referrer_sig", "_ga", "_gl", "oc",
+    "ref_src", "spm",
+}
+TRACKING_PREFIXES = ("utm_", "mc_", "pk_", "hsa_", "__hs", "_hs", "vero_", "at_")
+
+DEFAULT_PORTS = {"http": "80", "https": "443"}
+
+HEAD_END = re.compile(r"</head\s*>|<body[\s>]", re.IGNORECASE)
+LINK_TAG = re.compile(r"<link\b[^>]*>", re.IGNORECASE)
+META_TAG = re.compile(r"<meta\b[^>]*>", re.IGNORECASE)
+ATTRIBUTE = re.compile(r'([a-zA-Z_:-]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+))')
+
+
+def _is_tracking_param(name: str) -> bool:
+    """Return True for query parameters that never change page content."""
+    lowered = name.lower()
+    return lowered in TRACKING_PARAMS or lowered.startswith(TRACKING_PREFIXES)
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Canonicalize an article URL.
+    
+    Lowercases scheme and host, drops default ports, fragments and tracking
+    parameters, and sorts the remaining query so equivalent links compare equal.
+    Query parameters a site needs to serve the page are kept.
+    """
+    parsed = urlparse(url.strip())
+    scheme = parsed.scheme.lower()
+    
+    host = (parsed.hostname or "").rstrip(".")
+    port = parsed.port if parsed.netloc and ":" in parsed.netloc.rsplit("@", 1)[-1] else None
+    netloc = host
+    if port is not None and str(port) != DEFAULT_PORTS.get(scheme):
+        netloc = f"{host}:{port}"
+    
+    query = [
+        (name, value)
+        for name, value in parse_qsl(parsed.query, keep_blank_values=True)
+        if not _is_tracking_param(name)
+    ]
+    query.sort()
+    
+    return urlunparse((scheme, netloc, parsed.path or "/", parsed.params, urlencode(query), ""))
+
+
+def _attributes(tag: str) -> dict:
+    """Parse the attributes of a single HTML tag."""
+    return {
+        match.group(1).lower(): next(value for value in match.groups()[1:] if value is not None)
+        for match in ATTRIBUTE.finditer(tag)
+    }
+
+
+def extract_canonical_url(html: str, base_url: str) -> Optional[str]:
+    """
+    Return the page's declared canonical URL, canonicalized.
+    
+    Reads ``<link rel="canonical">`` and falls back to ``og:url``; only the
+    document head is scanned so this never builds a DOM.
+    """
+    if not html:
+        return None
+    
+    head = html[:200000]
+    end = HEAD_END.search(head)
+    if end:
+        head = head[:end.start()]
+    
+    candidate = None
+    for tag in LINK_TAG.findall(head):
+        attrs = _attributes(tag)
+        if "canonical" in attrs.get("rel", "").lower().split() and attrs.get("href"):
+            candidate = attrs["href"]
+            break
+    
+    if candidate is None:
+        for tag in META_TAG.findall(head):
+            attrs = _attributes(tag)
+            if attrs.get("property", attrs.get("name", "")).lower() == "og:url" and attrs.get("content"):
+                candidate = attrs["content"]
+                break
+    
+    if not candidate:
+        return None
+    
+    absolute = urljoin(base_url, candidate.strip())
+    if urlparse(absolute).scheme not in ("http", "https"):
+        return None
+    return canonicalize_url(absolute)
+
+
+def is_plausible_canonical(declared: str, fetched_url: str) -> bool:
+    """
+    Return True if a declared canonical URL can stand for the fetched article.
+    
+    Sites misconfigured to declare their home page, or syndicated copies
+    pointing at another site, would otherwise merge unrelated articles. The
+    canonical must have a path and share the fetched host, allowing for
+    subdomains such as mobile or AMP hosts.
+    """
+    declared_parsed = urlparse(declared)
+    if declared_parsed.path in ("", "/"):
+        return False
+    
+    declared_host = (declared_parsed.hostname or "").rstrip(".")
+    fetched_host = (urlparse(fetched_url).hostname or "").rstrip(".")
+    if not declared_host or not fetched_host:
+        return False
+    return (declared_host == fetched_host
+            or declared_host.endswith("." + fetched_host)
+            or fetched_host.endswith("." + declared_host))
@@ -0,0 +1,126 @@
+"""
+Per-domain circuit breaker for scraping, persisted in domain_health.
+
+A domain that keeps blocking or failing is opened for an exponentially
+growing cool-down; scrapes fail fast until one probe is let through
+(half-open), which either closes the breaker or re-opens it for longer.
+"""
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+import structlog
+from pymongo import ReturnDocument
+from backend.config import settings
+
+logger = structlog.get_logger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# HTTP statuses that say "this site will not serve us", not "this page is missing"
+BLOCKING_STATUSES = {401, 402, 403, 406, 429, 451, 503}
+
+# Failures that say something about the site rather than the page
+DOMAIN_FAILURES = {"timeout", "unextractable", "content_type", "too_large", "error"}
+
+# Known cool-downs, so open domains fail fast without a database read
+_open_until: Dict[str, datetime] = {}
+
+
+def counts_against_domain(reason: Optional[str]) -> bool:
+    """True for scrape failures that should trip the domain's breaker."""
+    if not reason:
+        return False
+    if reason.startswith("http_"):
+        return reason[5:].isdigit() and int(reason[5:]) in BLOCKING_STATUSES
+    return reason in DOMAIN_FAILURES
+
+
+def cooldown_for(consecutive_failures: int) -> timedelta:
+    """Exponential cool-down once the failure threshold is reached."""
+    exponent = max(0, consecutive_failures - settings.breaker_failure_threshold)
+    seconds = settings.breaker_base_cooldown_seconds * (2 ** min(exponent, 16))
+    return timedelta(seconds=min(seconds, settings.breaker_max_cooldown_seconds))
+
+
+class DomainCircuitBreaker:
+    """Tracks scrape failures per domain and decides whether to attempt a fetch."""
+    
+    def __init__(self, db):
+        self.db = db
+    
+    async def allow(self, domain: Optional[str]) -> bool:
+        """Return True if a scrape of this domain should be attempted now."""
+        if not domain:
+            return True
+        
+        now = datetime.utcnow()
+        if _open_until.get(domain, now) > now:
+            return False
+        
+        health = await self.db.domain_health.find_one({"domain": domain})
+        if not health or health.get("state", CLOSED) == CLOSED:
+            _open_until.pop(domain, None)
+            return True
+        
+        if health["open_until"] > now:
+            _open_until[domain] = health["open_until"]
+            return False
+        
+        # Cool-down over: let exactly one probe through and hold others back
+        # until it reports back (or its slot expires)
+        probe_until = now + timedelta(seconds=settings.request_timeout * 2)
+        claimed = await self.db.domain_health.find_one_and_update(
+            {"domain": domain, "open_until": {"$lte": now}},
+            {"$set": {"state": HALF_OPEN, "open_until": probe_until, "updated_at": now}}
+        )
+        if claimed:
+            logger.info("Circuit half-open, probing domain", domain=domain)
+            return True
+        
+        _open_until[domain] = probe_until
+        return False
+    
+    async def record_success(self, domain: Optional[str]):
+        """Close the breaker after a successful scrape."""
+        if not domain:
+            return
+        
+        _open_until.pop(domain, None)
+        result = await self.db.domain_health.update_one(
+            {"domain": domain, "consecutive_failures": {"$gt": 0}},
+            {"$set": {"state": CLOSED, "consecutive_failures": 0, "updated_at": datetime.utcnow()}}
+        )
+        if result.modified_count:
+            logger.info("Circuit closed", domain=domain)
+    
+    async def record_failure(self, domain: Optional[str], reason: str):
+        """Count a failure and open the breaker past the threshold."""
+        if not domain:
+            return
+        
+        now = datetime.utcnow()
+        health = await self.db.domain_health.find_one_and_update(
+            {"domain": domain},
+            {"$inc": {"consecutive_failures": 1},
+             "$set": {"last_failure": reason, "last_failure_at": now, "updated_at": now},
+             "$setOnInsert": {"state": CLOSED, "open_until": now}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        
+        failures = health["consecutive_failures"]
+        if failures < settings.breaker_failure_threshold:
+            return
+        
+        open_until = now + cooldown_for(failures)
+        await self.db.domain_health.update_one(
+            {"domain": domain},
+            {"$set": {"state": OPEN, "open_until": open_until}}
+        )
+        _open_until[domain] = open_until
+        logger.warning("Circuit opened for domain",
+                       domain=domain,
+                       failures=failures,
+                       reason=reason,
+                       open_until=open_until.isoformat())
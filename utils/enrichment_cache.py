@@ -0,0 +1,67 @@
+"""
+Cache of AI enrichment results keyed on article text, model and prompt version.
+
+Reprocessing, Celery retries and the same text arriving under another id
+all hit the cache instead of paying for a new completion. The prompt
+version is a hash of the prompt template, so editing the template
+invalidates every entry without a manual flush.
+"""
+import hashlib
+import re
+import unicodedata
+from datetime import datetime
+from typing import Any, Dict, Optional
+import structlog
+from backend.config import settings
+from utils.metrics import ENRICHMENT_CACHE_LOOKUPS
+
+logger = structlog.get_logger(__name__)
+
+WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Canonical form of article text: NFC, single spaces, trimmed."""
+    return WHITESPACE.sub(" ", unicodedata.normalize("NFC", text or "")).strip()
+
+
+def cache_key(text: str, model: str, prompt_version: str) -> str:
+    """Cache key for one (text, model, prompt version) combination."""
+    digest = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+    return f"{model}:{prompt_version}:{digest}"
+
+
+class EnrichmentCache:
+    """Enrichment results in enrichment_cache, evicted by a TTL index on created_at."""
+    
+    def __init__(self, db):
+        self.db = db
+    
+    async def get(self, text: str, model: str, prompt_version: str) -> Optional[Dict[str, Any]]:
+        """Stored enrichment for this input, or None."""
+        if not settings.enrichment_cache_enabled:
+            return None
+        
+        try:
+            entry = await self.db.enrichment_cache.find_one({"_id": cache_key(text, model, prompt_version)})
+        except Exception as e:
+            logger.warning("Enrichment cache lookup failed", error=str(e))
+            return None
+        
+        ENRICHMENT_CACHE_LOOKUPS.labels(result="hit" if entry else "miss").inc()
+        return entry["data"] if entry else None
+    
+    async def put(self, text: str, model: str, prompt_version: str, data: Dict[str, Any]):
+        """Store an enrichment result."""
+        if not settings.enrichment_cache_enabled:
+            return
+        
+        try:
+            await self.db.enrichment_cache.replace_one(
+                {"_id": cache_key(text, model, prompt_version)},
+                {"data": data, "model": model, "prompt_version": prompt_version,
+                 "created_at": datetime.utcnow()},
+                upsert=True
+            )
+        except Exception as e:
+            logger.warning("Could not store enrichment in cache", error=str(e))
@@ -0,0 +1,400 @@
+"""
+CPU-bound article text extraction, run off the event loop in a process pool.
+"""
+import asyncio
+import multiprocessing
+import re
+import time
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+import lxml.html
+import structlog
+from lxml import etree
+from newspaper import Article
+from readability import Document
+from bs4 import BeautifulSoup
+from backend.config import settings
+
+logger = structlog.get_logger(__name__)
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_disabled = False
+
+# Caps in-flight extractions per loop so a burst of fetches cannot queue
+# unbounded HTML in the executor
+_slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+
+# Elements that never hold article text
+BOILERPLATE_TAGS = (
+    "script", "style", "noscript", "template", "nav", "footer", "header", "aside",
+    "form", "iframe", "svg", "button", "select",
+)
+TEXT_BLOCK_TAGS = ("p", "h1", "h2", "h3", "h4", "blockquote", "pre", "li")
+HEADING_TAGS = {"h1", "h2", "h3", "h4"}
+
+POSITIVE_HINTS = re.compile(r"article|body|content|entry|main|post|story|text", re.IGNORECASE)
+NEGATIVE_HINTS = re.compile(
+    r"comment|share|social|related|promo|sidebar|newsletter|subscribe|advert|\bads?\b|"
+    r"cookie|footer|menu|breadcrumb|recirc|outbrain|taboola|popular|trending",
+    re.IGNORECASE,
+)
+WHITESPACE = re.compile(r"\s+")
+
+_HTML_PARSERS: Dict[str, lxml.html.HTMLParser] = {}
+
+
+def _html_parser(encoding: str) -> lxml.html.HTMLParser:
+    """Cached lxml HTML parser for a document encoding; raises LookupError if libxml2 lacks it."""
+    parser = _HTML_PARSERS.get(encoding)
+    if parser is None:
+        parser = lxml.html.HTMLParser(encoding=encoding, remove_comments=True, remove_pis=True)
+        _HTML_PARSERS[encoding] = parser
+    return parser
+
+
+def _parse_html(html: bytes, encoding: str):
+    """Parse HTML bytes once, decoding in Python only for charsets libxml2 does not know."""
+    try:
+        parser = _html_parser(encoding)
+    except LookupError:
+        try:
+            html = html.decode(encoding, errors="replace").encode("utf-8")
+        except LookupError:
+            pass
+        parser = _html_parser("utf-8")
+    return lxml.html.document_fromstring(html, parser=parser)
+
+
+def _text(element) -> str:
+    """Whitespace-normalized text content of an element."""
+    return WHITESPACE.sub(" ", element.text_content()).strip()
+
+
+def _link_density(element, text_length: int) -> float:
+    """Share of an element's text that sits inside links."""
+    if not text_length:
+        return 1.0
+    link_length = sum(len(_text(link)) for link in element.iter("a"))
+    return min(1.0, link_length / text_length)
+
+
+def _class_weight(element) -> int:
+    """Bonus or penalty from an element's class and id."""
+    hints = f"{element.get('class', '')} {element.get('id', '')}"
+    weight = 0
+    if POSITIVE_HINTS.search(hints):
+        weight += 25
+    if NEGATIVE_HINTS.search(hints):
+        weight -= 25
+    return weight
+
+
+def _drop_noise(root):
+    """Remove boilerplate tags and blocks whose class/id mark them as page chrome."""
+    etree.strip_elements(root, *BOILERPLATE_TAGS, with_tail=False)
+    
+    noisy = [
+        element for element in root.iter("div", "section", "ul", "ol", "span", "p", "table")
+        if _class_weight(element) < 0
+    ]
+    for element in noisy:
+        parent = element.getparent()
+        if parent is not None:
+            element.drop_tree()
+
+
+def _best_container(root):
+    """Score paragraph parents readability-style and return the top container."""
+    scores: Dict = {}
+    for paragraph in root.iter("p", "pre", "blockquote"):
+        text = _text(paragraph)
+        if len(text) < 25:
+            continue
+        
+        score = 1 + text.count(",") + min(len(text) // 100, 3)
+        parent = paragraph.getparent()
+        if parent is None:
+            continue
+        scores[parent] = scores.get(parent, 0.0) + score
+        grandparent = parent.getparent()
+        if grandparent is not None:
+            scores[grandparent] = scores.get(grandparent, 0.0) + score / 2
+    
+    best, best_score = None, 0.0
+    for element, score in scores.items():
+        text_length = len(_text(element))
+        score = (score + _class_weight(element)) * (1 - _link_density(element, text_length))
+        if element.tag in ("article", "main"):
+            score += 10
+        if score > best_score:
+            best, best_score = element, score
+    return best
+
+
+def _block_texts(container) -> List[str]:
+    """Text of the outermost text blocks in a container, skipping link lists."""
+    blocks = []
+    for element in container.iter(*TEXT_BLOCK_TAGS):
+        if any(ancestor.tag in TEXT_BLOCK_TAGS for ancestor in element.iterancestors()
+               if ancestor is not container):
+            continue
+        
+        text = _text(element)
+        if not text:
+            continue
+        if element.tag not in HEADING_TAGS and _link_density(element, len(text)) > 0.5:
+            continue
+        if element.tag == "li" and len(text) < 40:
+            continue
+        blocks.append(text)
+    return blocks
+
+
+class ExtractionResult(NamedTuple):
+    """Extracted text, the method that produced it and every attempt made."""
+    text: Optional[str]
+    method: Optional[str]
+    attempts: List[Tuple[str, float, bool]]
+
+
+class _Page:
+    """A fetched page whose decoded markup and lxml tree are built once, on first use."""
+    
+    def __init__(self, html: bytes, url: str, encoding: str):
+        self.html = html
+        self.url = url
+        self.encoding = encoding
+        self._markup: Optional[str] = None
+        self._tree = None
+    
+    @property
+    def markup(self) -> str:
+        if self._markup is None:
+            try:
+                self._markup = self.html.decode(self.encoding, errors="replace")
+            except LookupError:
+                self._markup = self.html.decode("utf-8", errors="replace")
+        return self._markup
+    
+    @property
+    def tree(self):
+        if self._tree is None:
+            self._tree = _parse_html(self.html, self.encoding)
+            _drop_noise(self._tree)
+        return self._tree
+
+
+def _method_lxml(page: _Page) -> Optional[str]:
+    """Densest paragraph container of the shared lxml tree."""
+    container = _best_container(page.tree)
+    if container is None:
+        return None
+    return "\n\n".join(_block_texts(container))
+
+
+def _soup_blocks(element) -> str:
+    """Outermost text blocks of a BeautifulSoup element joined with blank lines."""
+    blocks = [
+        block.get_text(separator=' ', strip=True)
+        for block in element.find_all(TEXT_BLOCK_TAGS)
+        if block.find_parent(TEXT_BLOCK_TAGS) is None
+    ]
+    blocks = [block for block in blocks if block]
+    return "\n\n".join(blocks) if blocks else element.get_text(separator=' ', strip=True)
+
+
+def _method_newspaper(page: _Page) -> Optional[str]:
+    """newspaper3k's article body."""
+    article = Article(page.url)
+    article.set_html(page.markup)
+    article.parse()
+    return article.text
+
+
+def _method_readability(page: _Page) -> Optional[str]:
+    """readability-lxml's summary, flattened to text blocks."""
+    readable_html = Document(page.markup).summary()
+    if not readable_html:
+        return None
+    return _soup_blocks(BeautifulSoup(readable_html, 'html.parser'))
+
+
+def _method_soup(page: _Page) -> Optional[str]:
+    """BeautifulSoup main/article/content element."""
+    soup = BeautifulSoup(page.markup, 'html.parser')
+    
+    # Remove script and style elements
+    for script in soup(["script", "style", "nav", "footer", "header", "aside"]):
+        script.decompose()
+    
+    # Try to find main content areas
+    main_content = soup.find('main') or soup.find('article') or soup.find('div', class_=re.compile(r'content|article|story|post'))
+    return _soup_blocks(main_content) if main_content else None
+
+
+def _method_body(page: _Page) -> Optional[str]:
+    """All remaining body text of the shared lxml tree."""
+    body = page.tree.find("body")
+    return _text(body if body is not None else page.tree)
+
+
+EXTRACTION_METHODS: Dict[str, Callable[[_Page], Optional[str]]] = {
+    "lxml": _method_lxml,
+    "newspaper": _method_newspaper,
+    "readability": _method_readability,
+    "soup": _method_soup,
+}
+# Last resort after every content method; always tried, never reordered
+FALLBACK_METHOD = "body"
+
+# The lxml engine is a single parse; other methods only run on domains where
+# ExtractorStats has seen them win
+ENGINE_ORDERS = {
+    "lxml": ["lxml"],
+    "cascade": ["newspaper", "readability", "soup", "lxml"],
+}
+
+
+def default_method_order() -> List[str]:
+    """Extraction methods in the configured engine's preferred order."""
+    return list(ENGINE_ORDERS.get(settings.extraction_engine, ENGINE_ORDERS["lxml"]))
+
+
+def run_extraction(html: bytes, url: str, encoding: str = "utf-8",
+                   order: Optional[List[str]] = None) -> ExtractionResult:
+    """
+    Try extraction methods in order until one yields enough text.
+    
+    Methods share one decoded page and one lxml tree, so each extra parse
+    only happens when a method actually needs it. Module-level and pure so
+    it can run in a worker process.
+    """
+    if order is None:
+        order = default_method_order()
+    methods = [name for name in order if name in EXTRACTION_METHODS] + [FALLBACK_METHOD]
+    
+    page = _Page(html, url, encoding)
+    attempts: List[Tuple[str, float, bool]] = []
+    
+    for name in methods:
+        method = _method_body if name == FALLBACK_METHOD else EXTRACTION_METHODS[name]
+        start = time.perf_counter()
+        try:
+            text = method(page)
+        except Exception as e:
+            logger.warning("Extraction method failed", url=url, method=name, error=str(e))
+            text = None
+        
+        text = text.strip() if text else None
+        ok = bool(text) and len(text) > settings.min_article_length
+        attempts.append((name, time.perf_counter() - start, ok))
+        
+        if ok:
+            logger.debug("Extracted article text", method=name, length=len(text))
+            return ExtractionResult(text, name, attempts)
+    
+    logger.warning("All text extraction methods failed", url=url)
+    return ExtractionResult(None, None, attempts)
+
+
+def extract_article_text(html: bytes, url: str, encoding: str = "utf-8") -> Optional[str]:
+    """Extract cleaned article text from raw HTML bytes with the configured engine."""
+    return run_extraction(html, url, encoding).text
+
+
+def extract_text_lxml(html: bytes, url: str, encoding: str = "utf-8") -> Optional[str]:
+    """
+    Extract article text from a single lxml parse of the page.
+    
+    Strips page chrome, picks the container holding the densest run of
+    paragraphs and joins its text blocks; falls back to the body text.
+    """
+    return run_extraction(html, url, encoding, ["lxml"]).text
+
+
+def extract_text_cascade(html: bytes, url: str, encoding: str = "utf-8") -> Optional[str]:
+    """
+    Extract cleaned article text with the newspaper3k/readability/BeautifulSoup cascade.
+    
+    Parses the page up to four times; kept for comparison with the lxml engine.
+    """
+    return run_extraction(html, url, encoding, ["newspaper", "readability", "soup"]).text
+
+
+def get_extraction_pool() -> Optional[ProcessPoolExecutor]:
+    """Return the shared extraction pool, or None when extraction runs inline."""
+    global _pool
+    if _pool_disabled or settings.extraction_pool_workers <= 0:
+        return None
+    
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=settings.extraction_pool_workers)
+        logger.info("Started extraction process pool", workers=settings.extraction_pool_workers)
+    return _pool
+
+
+def start_extraction_pool() -> Optional[ProcessPoolExecutor]:
+    """
+    Start the extraction pool from a Celery worker process.
+    
+    Prefork children are daemonic, and multiprocessing refuses to start
+    processes from a daemonic one. The pool is shut down with the worker
+    process (worker_process_shutdown), so the flag is cleared here rather
+    than falling back to inline extraction on the event loop.
+    """
+    current = multiprocessing.current_process()
+    if current.daemon:
+        current._config["daemon"] = False
+    return get_extraction_pool()
+
+
+def shutdown_extraction_pool():
+    """
+    Stop the extraction pool's worker processes.
+    
+    Waits for them to exit: a worker process left running can block the
+    exit of the process that owns the pool.
+    """
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=True, cancel_futures=True)
+        _pool = None
+
+
+def _slot() -> asyncio.Semaphore:
+    """Per-loop semaphore bounding queued extractions."""
+    loop = asyncio.get_running_loop()
+    slot = _slots.get(loop)
+    if slot is None:
+        slot = asyncio.Semaphore(max(1, settings.extraction_pool_workers) * settings.extraction_queue_per_worker)
+        _slots[loop] = slot
+    return slot
+
+
+async def extract_text_async(html: bytes, url: str, encoding: str = "utf-8",
+                             order: Optional[List[str]] = None) -> ExtractionResult:
+    """Run run_extraction in the process pool without blocking the loop."""
+    global _pool_disabled
+    pool = get_extraction_pool()
+    if pool is None:
+        return run_extraction(html, url, encoding, order)
+    
+    async with _slot():
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(pool, partial(run_extraction, html, url, encoding, order))
+        except BrokenProcessPool:
+            # A child died (OOM, segfault in a parser); start a fresh pool next time
+            logger.warning("Extraction pool broken, restarting", url=url)
+            shutdown_extraction_pool()
+        except AssertionError as e:
+            # Daemonic processes cannot spawn a pool unless start_extraction_pool ran first
+            logger.warning("Extraction pool unavailable, running inline", error=str(e))
+            shutdown_extraction_pool()
+            _pool_disabled = True
+    
+    return run_extraction(html, url, encoding, order)
@@ -0,0 +1,241 @@
+"""
+Local, CPU-only enrichment used while OpenAI is throttled or down.
+
+Summaries are extractive (TextRank over sentence TF-IDF vectors with
+NumPy), sentiment comes from a small automotive-news lexicon and tags are
+the most weighted terms. Results are published as provisional articles
+that the upgrade task later re-enriches with OpenAI. The fallback turns
+itself on when the ai_processing backlog or the recent OpenAI error rate
+crosses its threshold.
+"""
+import asyncio
+import time
+import weakref
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+import structlog
+from backend.config import settings
+from utils.metrics import ENRICHMENT_FALLBACKS
+from utils.model_router import guess_category, queue_backlog
+from utils.relevance import tokenize
+from utils.token_budget import split_sentences
+
+logger = structlog.get_logger(__name__)
+
+FALLBACK_MODEL = "extractive-fallback"
+
+POSITIVE_WORDS = frozenset("""
+gain gains growth grow grew record rise rises rising rose surge surged strong stronger beat beats boost
+boosted profit profitable improve improved improvement success successful expand expanded expansion
+award win wins won launch launched popular demand upgrade upgraded innovative breakthrough efficient
+recover recovered recovery approve approved milestone best top leading advance advanced
+""".split())
+
+NEGATIVE_WORDS = frozenset("""
+recall recalls recalled defect defects crash crashes crashed fire fires injury injuries death deaths
+killed loss losses decline declined declines drop dropped drops fall fell falling weak weaker miss
+missed cut cuts layoff layoffs lawsuit lawsuits sued fine fined probe investigation delay delayed
+shortage shortages strike strikes halt halted suspend suspended warning risk risks problem problems
+fail failed failure slump slumped plunge plunged worst
+""".split())
+
+NEGATIONS = frozenset(["not", "no", "never", "without"])
+
+DAMPING = 0.85
+
+# Recent enrichment outcomes, one Redis hash per minute
+OUTCOME_KEY = "openai:outcomes:{minute}"
+
+# Process-local fallback decision: (decided_at, active)
+_decision: Optional[Tuple[float, bool]] = None
+
+# One Redis client per event loop; async connections cannot cross loops
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+
+
+def textrank(sentences: List[str]) -> np.ndarray:
+    """TextRank score of each sentence over cosine similarity of TF-IDF vectors."""
+    count = len(sentences)
+    if count < 3:
+        return np.ones(count)
+    
+    bags = [Counter(tokenize(sentence)) for sentence in sentences]
+    vocabulary = {term: index for index, term in enumerate({term for bag in bags for term in bag})}
+    if not vocabulary:
+        return np.ones(count)
+    
+    matrix = np.zeros((count, len(vocabulary)))
+    for row, bag in enumerate(bags):
+        for term, frequency in bag.items():
+            matrix[row, vocabulary[term]] = frequency
+    document_frequency = (matrix > 0).sum(axis=0)
+    matrix *= np.log((1 + count) / (1 + document_frequency)) + 1.0
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    matrix = np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+    
+    similarity = matrix @ matrix.T
+    np.fill_diagonal(similarity, 0.0)
+    out_weight = similarity.sum(axis=1, keepdims=True)
+    # Sentences sharing no terms with the rest link to every sentence equally
+    transition = np.divide(similarity, out_weight, out=np.full_like(similarity, 1.0 / count), where=out_weight > 0)
+    
+    scores = np.full(count, 1.0 / count)
+    for _ in range(50):
+        updated = (1 - DAMPING) / count + DAMPING * (transition.T @ scores)
+        if np.abs(updated - scores).sum() < 1e-6:
+            return updated
+        scores = updated
+    return scores
+
+
+def summarize(sentences: List[str], scores: np.ndarray, max_words: int) -> str:
+    """The highest-ranked sentences within max_words, in their original order."""
+    chosen, words = [], 0
+    for index in np.argsort(-scores, kind="stable"):
+        length = len(sentences[index].split())
+        if words + length > max_words:
+            # Stop rather than fill the gap with lower-ranked short sentences;
+            # a single very long top sentence is cut instead of dropped
+            if not chosen:
+                chosen.append(index)
+            break
+        chosen.append(index)
+        words += length
+    summary = " ".join(sentences[index] for index in sorted(chosen))
+    return " ".join(summary.split()[:max_words])
+
+
+def _clip(text: str, max_chars: int) -> str:
+    """Text cut at a word boundary to at most max_chars."""
+    if len(text) <= max_chars:
+        return text
+    return text[:max_chars].rsplit(" ", 1)[0]
+
+
+def lexicon_sentiment(text: str) -> Tuple[str, float]:
+    """Sentiment label and 0.0-1.0 score from positive and negative word counts."""
+    words = (text or "").lower().split()
+    positive = negative = 0
+    for position, raw in enumerate(words):
+        word = raw.strip(".,;:!?\"'()")
+        polarity = (word in POSITIVE_WORDS) - (word in NEGATIVE_WORDS)
+        if not polarity:
+            continue
+        if position and words[position - 1].strip(".,;:!?\"'()") in NEGATIONS:
+            polarity = -polarity
+        if polarity > 0:
+            positive += 1
+        else:
+            negative += 1
+    
+    total = positive + negative
+    score = 0.5 if not total else round(0.5 + 0.5 * (positive - negative) / (total + 2), 3)
+    if score >= 0.6:
+        return "positive", score
+    if score <= 0.4:
+        return "negative", score
+    return "neutral", score
+
+
+def keyword_tags(title: str, text: str, limit: int = 5) -> List[str]:
+    """The most frequent content words, title words counting double."""
+    counts = Counter(tokenize(text))
+    for word in tokenize(title):
+        counts[word] += 2
+    return [word for word, _ in counts.most_common(limit)]
+
+
+def enrich_locally(title: str, text: str, publisher: str) -> Dict[str, Any]:
+    """Provisional enrichment in the shape of an OpenAI result, without any API call."""
+    sentences = split_sentences(text) or [text]
+    scores = textrank(sentences)
+    sentiment_label, sentiment_score = lexicon_sentiment(f"{title}. {text}")
+    
+    ENRICHMENT_FALLBACKS.inc()
+    return {
+        'ai_title': " ".join(title.split()[:15]),
+        'title_original': title,
+        'publisher': publisher,
+        'industry': 'automotive',
+        'category': guess_category(title, text) or 'opinion',
+        # Clipped to the field lengths of ai_articles
+        'short_summary': _clip(summarize(sentences, scores, 120), 600),
+        'long_summary': _clip(summarize(sentences, scores, 500), 2500),
+        'long_summary_status': 'ready',
+        'sentiment_label': sentiment_label,
+        'sentiment_score': sentiment_score,
+        'entities': [],
+        'tags': keyword_tags(title, text),
+        'provisional': True,
+        'ai_raw_response': {
+            'model': FALLBACK_MODEL,
+            'timestamp': str(datetime.utcnow())
+        },
+        'token_usage': {}
+    }
+
+
+def _redis():
+    """This event loop's Redis client."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        import redis.asyncio as aioredis
+        client = _clients[loop] = aioredis.Redis.from_url(settings.redis_url)
+    return client
+
+
+async def record_outcome(success: bool):
+    """Count an OpenAI enrichment success or failure towards the error rate."""
+    key = OUTCOME_KEY.format(minute=int(time.time() // 60))
+    try:
+        pipe = _redis().pipeline()
+        pipe.hincrby(key, "ok" if success else "error", 1)
+        pipe.expire(key, (settings.fallback_error_window_minutes + 1) * 60)
+        await pipe.execute()
+    except Exception as e:
+        logger.warning("Could not record enrichment outcome", error=str(e))
+
+
+async def recent_error_rate() -> Tuple[float, int]:
+    """Share of failed OpenAI enrichments over the window, and how many were counted."""
+    minute = int(time.time() // 60)
+    pipe = _redis().pipeline()
+    for offset in range(settings.fallback_error_window_minutes):
+        pipe.hmget(OUTCOME_KEY.format(minute=minute - offset), "ok", "error")
+    ok = errors = 0
+    for ok_count, error_count in await pipe.execute():
+        ok += int(ok_count or 0)
+        errors += int(error_count or 0)
+    total = ok + errors
+    return (errors / total if total else 0.0), total
+
+
+async def fallback_active() -> bool:
+    """True while new articles should be enriched locally instead of by OpenAI."""
+    global _decision
+    if settings.fallback_mode == "off":
+        return False
+    if settings.fallback_mode == "on":
+        return True
+    if _decision and time.monotonic() - _decision[0] < settings.fallback_check_seconds:
+        return _decision[1]
+    
+    try:
+        backlog = await queue_backlog()
+        error_rate, calls = await recent_error_rate()
+    except Exception as e:
+        logger.warning("Could not check enrichment health", error=str(e))
+        backlog, error_rate, calls = 0, 0.0, 0
+    
+    active = (
+        backlog >= settings.fallback_queue_backlog
+        or (calls >= settings.fallback_min_calls and error_rate >= settings.fallback_error_rate)
+    )
+    if active != (_decision[1] if _decision else False):
+        logger.warning("Extractive enrichment fallback " + ("enabled" if active else "disabled"),
+                       backlog=backlog, error_rate=round(error_rate, 3), calls=calls)
+    _decision = (time.monotonic(), active)
+    return active
@@ -0,0 +1,115 @@
+"""
+Per-domain record of which text extraction methods work, used to order them.
+"""
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+import structlog
+from pymongo import UpdateOne
+from backend.config import settings
+
+logger = structlog.get_logger(__name__)
+
+# domain -> (loaded_at, {method: {"attempts", "successes", "total_seconds"}})
+_cache: Dict[str, Tuple[float, Dict[str, Dict[str, float]]]] = {}
+
+
+def order_methods(stats: Dict[str, Dict[str, float]], default_order: List[str],
+                  candidates: Optional[List[str]] = None) -> List[str]:
+    """
+    Order extraction methods for a domain from its past outcomes.
+    
+    Methods that have worked come first, by success rate and then mean time;
+    untried methods follow in the default order; methods that failed every
+    one of at least extractor_skip_after_failures attempts are dropped.
+    Candidates outside the default order are only tried on domains where
+    they have worked before or where no default method has worked yet.
+    """
+    candidates = candidates or default_order
+    extras = [method for method in candidates if method not in default_order]
+    
+    def _sort(methods: List[str]):
+        winners, untried, losing = [], [], []
+        for method in methods:
+            record = stats.get(method)
+            if not record or not record.get("attempts"):
+                untried.append(method)
+            elif record.get("successes"):
+                winners.append(method)
+            elif record["attempts"] < settings.extractor_skip_after_failures:
+                losing.append(method)
+        return winners, untried + losing
+    
+    def _rank(method: str):
+        record = stats[method]
+        return (-record["successes"] / record["attempts"], record["total_seconds"] / record["attempts"])
+    
+    winners, rest = _sort(default_order)
+    extra_winners, extra_rest = _sort(extras)
+    order = sorted(winners + extra_winners, key=_rank) + rest
+    return order if winners else order + extra_rest
+
+
+class ExtractorStats:
+    """Per-domain extraction outcomes in extractor_stats, cached in process."""
+    
+    def __init__(self, db):
+        self.db = db
+    
+    async def _load(self, domain: str) -> Dict[str, Dict[str, float]]:
+        """Fetch a domain's method stats, refreshing the cache when stale."""
+        cached = _cache.get(domain)
+        if cached and time.monotonic() - cached[0] < settings.extractor_stats_refresh_seconds:
+            return cached[1]
+        
+        stats: Dict[str, Dict[str, float]] = {}
+        async for doc in self.db.extractor_stats.find({"domain": domain}):
+            stats[doc["method"]] = {
+                "attempts": doc.get("attempts", 0),
+                "successes": doc.get("successes", 0),
+                "total_seconds": doc.get("total_seconds", 0.0),
+            }
+        _cache[domain] = (time.monotonic(), stats)
+        return stats
+    
+    async def method_order(self, domain: Optional[str], default_order: List[str],
+                           candidates: Optional[List[str]] = None) -> List[str]:
+        """Extraction methods to try for a domain, best first."""
+        if not domain:
+            return default_order
+        
+        try:
+            stats = await self._load(domain)
+        except Exception as e:
+            logger.warning("Could not load extractor stats", domain=domain, error=str(e))
+            return default_order
+        return order_methods(stats, default_order, candidates)
+    
+    async def record(self, domain: Optional[str], attempts: List[Tuple[str, float, bool]]):
+        """Add one page's extraction attempts to the domain's stats."""
+        if not domain or not attempts:
+            return
+        
+        # Keep a cached view current; an uncached domain is loaded fresh next time
+        cached = _cache.get(domain)
+        stats = cached[1] if cached else {}
+        now = datetime.utcnow()
+        operations = []
+        
+        for method, seconds, ok in attempts:
+            record = stats.setdefault(method, {"attempts": 0, "successes": 0, "total_seconds": 0.0})
+            record["attempts"] += 1
+            record["successes"] += int(ok)
+            record["total_seconds"] += seconds
+            
+            operations.append(UpdateOne(
+                {"domain": domain, "method": method},
+                {"$inc": {"attempts": 1, "successes": int(ok), "total_seconds": seconds},
+                 "$set": {"updated_at": now}},
+                upsert=True
+            ))
+        
+        try:
+            await self.db.extractor_stats.bulk_write(operations, ordered=False)
+        except Exception as e:
+            logger.warning("Could not record extractor stats", domain=domain, error=str(e))
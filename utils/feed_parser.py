@@ -0,0 +1,174 @@
+"""
+Streaming RSS/Atom feed parser built on lxml iterparse.
+"""
+import re
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from io import BytesIO
+from typing import Any, Callable, Dict, Iterator, Optional
+import structlog
+from lxml import etree
+
+logger = structlog.get_logger(__name__)
+
+# Item elements in RSS 2.0, RSS 1.0 (RDF) and Atom, in any namespace
+ITEM_TAGS = ("{*}item", "{*}entry")
+
+# Strict RFC 822 shape; email.utils is lenient and would misread other formats
+RFC822_DATE = re.compile(
+    r'^(?:[A-Za-z]{3},\s*)?\d{1,2}\s+[A-Za-z]{3}\s+\d{2,4}\s+\d{1,2}:\d{2}(?::\d{2})?'
+    r'(?:\s+(?:[+-]\d{4}|[A-Za-z]{1,5}))?$'
+)
+
+
+def parse_feed_date(value: str) -> datetime:
+    """
+    Parse a feed date into a naive UTC datetime.
+    
+    RFC 822 (RSS) and ISO 8601 (Atom) take a fast path; anything else falls
+    back to dateutil, and unparseable values to the current time.
+    """
+    value = value.strip()
+    parsed = None
+    
+    if value[:1].isdigit():
+        try:
+            parsed = datetime.fromisoformat(value)
+        except ValueError:
+            pass
+    
+    if parsed is None and RFC822_DATE.match(value):
+        try:
+            parsed = parsedate_to_datetime(value)
+        except (TypeError, ValueError, IndexError):
+            pass
+    
+    if parsed is None:
+        from dateutil import parser
+        
+        try:
+            parsed = parser.parse(value)
+        except (ValueError, OverflowError):
+            return datetime.utcnow()
+    
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _local_name(element) -> str:
+    """Return an element's tag without its namespace."""
+    tag = element.tag
+    if not isinstance(tag, str):
+        return ""
+    return tag.rsplit("}", 1)[-1]
+
+
+def _text(element) -> Optional[str]:
+    """Return stripped element text, or None when empty."""
+    text = element.text
+    if text:
+        text = text.strip()
+    return text or None
+
+
+def _parse_item(item) -> Dict[str, Any]:
+    """Pull the fields we use out of an RSS item or Atom entry."""
+    fields: Dict[str, Any] = {
+        "title": None,
+        "link": None,
+        "description": None,
+        "pub_date": None,
+        "guid": None,
+        "source_name": None,
+        "source_url": None,
+    }
+    updated = None
+    
+    for child in item:
+        name = _local_name(child)
+        
+        if name == "title":
+            fields["title"] = _text(child)
+        elif name == "link":
+            # Atom links carry the URL in href; prefer rel="alternate"
+            href = child.get("href")
+            if href:
+                if fields["link"] is None or child.get("rel", "alternate") == "alternate":
+                    fields["link"] = href.strip()
+            elif fields["link"] is None:
+                fields["link"] = _text(child)
+        elif name in ("description", "summary") or (name == "content" and not fields["description"]):
+            fields["description"] = _text(child)
+        elif name in ("pubDate", "published", "date"):
+            fields["pub_date"] = _text(child)
+        elif name in ("updated", "modified"):
+            updated = _text(child)
+        elif name in ("guid", "id"):
+            fields["guid"] = _text(child)
+        elif name == "source":
+            # Google News: <source url="https://publisher.com">Publisher</source>
+            source_title = _text(child)
+            if source_title is None:
+                title_elem = next((c for c in child if _local_name(c) == "title"), None)
+                source_title = _text(title_elem) if title_elem is not None else None
+            fields["source_name"] = source_title
+            fields["source_url"] = child.get("url")
+    
+    if not fields["pub_date"]:
+        fields["pub_date"] = updated
+    
+    return fields
+
+
+def iter_feed_items(content: bytes,
+                    is_known: Optional[Callable[[Dict[str, Any]], bool]] = None,
+                    known_run_limit: int = 0) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily yield items from raw RSS or Atom bytes.
+    
+    Args:
+        content: Raw feed bytes; the XML declaration decides the encoding
+        is_known: Optional predicate telling whether an item was seen before
+        known_run_limit: Stop after this many consecutive known items (0 disables)
+    
+    Yields:
+        Dicts with title, link, description, pub_date, guid, source_name and source_url
+    """
+    parser_events = etree.iterparse(
+        BytesIO(content),
+        events=("end",),
+        tag=ITEM_TAGS,
+        resolve_entities=False,
+        no_network=True,
+        recover=True,
+    )
+    known_run = 0
+    
+    try:
+        for _, item in parser_events:
+            fields = _parse_item(item)
+            
+            # Free the parsed item and any siblings already handled
+            item.clear()
+            parent = item.getparent()
+            if parent is not None:
+                while item.getprevious() is not None:
+                    del parent[0]
+            
+            if not fields["title"] or not fields["link"]:
+                continue
+            
+            if is_known is not None and known_run_limit > 0:
+                if is_known(fields):
+                    known_run += 1
+                    if known_run >= known_run_limit:
+                        logger.debug("Stopping feed parse at known items", run=known_run)
+                        return
+                else:
+                    known_run = 0
+            
+            yield fields
+    
+    except etree.XMLSyntaxError as e:
+        logger.error("Error parsing feed content", error=str(e))
@@ -0,0 +1,142 @@
+"""
+Per-host response latency tracking, adaptive timeouts and hedged requests.
+"""
+import asyncio
+import math
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+import aiohttp
+import structlog
+from backend.config import settings
+from utils.metrics import SCRAPE_HEDGES
+
+logger = structlog.get_logger(__name__)
+
+
+def _percentile(ordered, q: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence."""
+    rank = max(1, math.ceil(q * len(ordered)))
+    return ordered[rank - 1]
+
+
+class HostLatencyTracker:
+    """Sliding window of per-host request latencies, up to the end of the body read."""
+    
+    def __init__(self, window: Optional[int] = None, min_samples: Optional[int] = None):
+        self.window = window or settings.host_latency_window
+        self.min_samples = min_samples or settings.host_latency_min_samples
+        self._samples: Dict[str, Deque[float]] = {}
+        self._requests = 0
+        self._hedges = 0
+    
+    def record(self, host: str, seconds: float):
+        """Add a request-to-body sample (or the time at which a timeout fired)."""
+        samples = self._samples.get(host)
+        if samples is None:
+            samples = self._samples[host] = deque(maxlen=self.window)
+        samples.append(seconds)
+    
+    def percentile(self, host: str, q: float) -> Optional[float]:
+        """Latency percentile for a host, or None until enough samples exist."""
+        samples = self._samples.get(host)
+        if not samples or len(samples) < self.min_samples:
+            return None
+        return _percentile(sorted(samples), q)
+    
+    def timeout_for(self, host: str) -> aiohttp.ClientTimeout:
+        """
+        Connect and read timeouts derived from the host's history.
+        
+        Fast hosts get tight timeouts so a stall is detected in seconds;
+        hosts without history keep the global request_timeout.
+        """
+        total = settings.request_timeout
+        p95 = self.percentile(host, 0.95)
+        p99 = self.percentile(host, 0.99)
+        if p95 is None:
+            return aiohttp.ClientTimeout(total=total)
+        
+        connect = min(total, max(settings.scrape_min_connect_timeout, p95 * settings.scrape_connect_timeout_factor))
+        sock_read = min(total, max(settings.scrape_min_read_timeout, p99 * settings.scrape_read_timeout_factor))
+        return aiohttp.ClientTimeout(total=total, connect=connect, sock_read=sock_read)
+    
+    def hedge_delay(self, host: str) -> Optional[float]:
+        """Seconds after which to fire a hedged request, or None to not hedge."""
+        self._requests += 1
+        if not settings.scrape_hedging_enabled:
+            return None
+        if self._hedges >= self._requests * settings.scrape_hedge_budget:
+            return None
+        return self.percentile(host, 0.95)
+    
+    def hedge_fired(self):
+        """Count a hedge against the budget."""
+        self._hedges += 1
+
+
+_tracker: Optional[HostLatencyTracker] = None
+
+
+def get_latency_tracker() -> HostLatencyTracker:
+    """Return this process's latency tracker."""
+    global _tracker
+    if _tracker is None:
+        _tracker = HostLatencyTracker()
+    return _tracker
+
+
+def _succeeded(task: asyncio.Future) -> bool:
+    """True for a finished request that returned a response."""
+    return not task.cancelled() and task.exception() is None
+
+
+async def hedged_get(session: aiohttp.ClientSession, url: str, timeout: aiohttp.ClientTimeout,
+                     hedge_after: float, tracker: Optional[HostLatencyTracker] = None,
+                     throttle: Optional[Any] = None) -> aiohttp.ClientResponse:
+    """
+    GET a URL, firing a second identical request if the first is slow.
+    
+    The hedge waits its turn on the host's politeness throttle like any
+    other request. Whichever request returns headers first wins; the other
+    is cancelled (or released if it also completed). The caller owns the
+    response.
+    """
+    primary = asyncio.ensure_future(session.get(url, timeout=timeout))
+    done, _ = await asyncio.wait({primary}, timeout=hedge_after)
+    if done:
+        return primary.result()
+    
+    if throttle:
+        await throttle.wait(url)
+        if primary.done() and _succeeded(primary):
+            return primary.result()
+    
+    if tracker:
+        tracker.hedge_fired()
+    SCRAPE_HEDGES.labels(outcome="fired").inc()
+    logger.debug("Hedging slow request", url=url, after=round(hedge_after, 3))
+    
+    hedge = asyncio.ensure_future(session.get(url, timeout=timeout))
+    pending = {primary, hedge}
+    
+    while True:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        winners = [task for task in done if _succeeded(task)]
+        if not winners:
+            if not pending:
+                # Both requests failed: re-raise the last failure (or its cancellation)
+                return next(iter(done)).result()
+            continue
+        
+        winner = winners[0]
+        for task in winners[1:]:
+            task.result().release()
+        for task in pending:
+            task.cancel()
+        for result in await asyncio.gather(*pending, return_exceptions=True):
+            if isinstance(result, aiohttp.ClientResponse):
+                result.release()
+        
+        if winner is hedge:
+            SCRAPE_HEDGES.labels(outcome="won").inc()
+        return winner.result()
@@ -0,0 +1,97 @@
+"""
+Shared HTTP connection pool and per-host politeness for scraping.
+"""
+import asyncio
+import time
+import weakref
+from typing import Dict, Optional
+from urllib.parse import urlparse
+import aiohttp
+import structlog
+from backend.config import settings
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': 'gzip, deflate',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+}
+
+# One pool per event loop; aiohttp sessions cannot cross loops
+_sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]" = weakref.WeakKeyDictionary()
+_throttles: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, HostThrottle]" = weakref.WeakKeyDictionary()
+
+
+class HostThrottle:
+    """Spaces out requests to the same host by a minimum interval."""
+    
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self._next_allowed: Dict[str, float] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+    
+    async def wait(self, url: str):
+        """Sleep until the URL's host may be contacted again."""
+        if self.min_interval <= 0:
+            return
+        
+        host = urlparse(url).netloc.lower()
+        lock = self._locks.setdefault(host, asyncio.Lock())
+        
+        async with lock:
+            delay = self._next_allowed.get(host, 0.0) - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._next_allowed[host] = time.monotonic() + self.min_interval
+
+
+def get_session() -> aiohttp.ClientSession:
+    """Return the long-lived pooled session for the running event loop."""
+    loop = asyncio.get_running_loop()
+    session = _sessions.get(loop)
+    
+    if session is None or session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=settings.scrape_pool_size,
+            limit_per_host=settings.scrape_per_host_limit,
+            ttl_dns_cache=settings.scrape_dns_cache_seconds,
+            keepalive_timeout=settings.scrape_keepalive_seconds,
+            enable_cleanup_closed=True,
+        )
+        session = aiohttp.ClientSession(
+            connector=connector,
+            headers=DEFAULT_HEADERS,
+            timeout=aiohttp.ClientTimeout(total=settings.request_timeout),
+        )
+        _sessions[loop] = session
+        logger.info("Created shared HTTP pool",
+                   limit=settings.scrape_pool_size,
+                   limit_per_host=settings.scrape_per_host_limit)
+    
+    return session
+
+
+def get_throttle() -> HostThrottle:
+    """Return the per-host politeness throttle for the running event loop."""
+    loop = asyncio.get_running_loop()
+    throttle = _throttles.get(loop)
+    
+    if throttle is None:
+        throttle = HostThrottle(settings.scrape_politeness_delay_seconds)
+        _throttles[loop] = throttle
+    
+    return throttle
+
+
+async def close_pool():
+    """Close the pooled session for the running event loop."""
+    loop = asyncio.get_running_loop()
+    session: Optional[aiohttp.ClientSession] = _sessions.pop(loop, None)
+    _throttles.pop(loop, None)
+    
+    if session is not None and not session.closed:
+        await session.close()
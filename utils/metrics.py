@@ -0,0 +1,130 @@
+"""
+Prometheus metrics shared by the API and the Celery workers.
+
+Set PROMETHEUS_MULTIPROC_DIR to a directory shared by every process so the
+API's /metrics endpoint aggregates counters recorded in worker processes.
+"""
+import os
+from typing import Tuple
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest, multiprocess,
+)
+
+# Scraper downloads
+SCRAPE_BYTES_DOWNLOADED = Counter(
+    "scrape_bytes_downloaded_total",
+    "Response body bytes read while scraping articles",
+)
+SCRAPE_BYTES_SAVED = Counter(
+    "scrape_bytes_saved_total",
+    "Declared response bytes never downloaded thanks to early stops and guards",
+)
+SCRAPE_DOWNLOADS_STOPPED = Counter(
+    "scrape_downloads_stopped_total",
+    "Article downloads rejected or cut short, by reason",
+    ["reason"],
+)
+SCRAPE_CIRCUIT_SKIPS = Counter(
+    "scrape_circuit_skips_total",
+    "Article scrapes skipped because the domain's circuit breaker was open",
+)
+SCRAPE_RESPONSE_SECONDS = Histogram(
+    "scrape_response_seconds",
+    "Time from request to response headers for article pages, including hedging",
+    buckets=(0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30),
+)
+SCRAPE_TIMEOUTS = Counter(
+    "scrape_timeouts_total",
+    "Article requests that hit their (adaptive) timeout",
+)
+SCRAPE_HEDGES = Counter(
+    "scrape_hedges_total",
+    "Hedged article requests fired, and how many the hedge answered first",
+    ["outcome"],
+)
+
+# Raw HTML storage
+HTML_BLOB_BYTES = Counter(
+    "html_blob_bytes_total",
+    "Raw HTML bytes written to the blob store, before (raw) and after (stored) compression",
+    ["kind"],
+)
+
+# Boilerplate stripping
+BOILERPLATE_PARAGRAPHS_STRIPPED = Counter(
+    "boilerplate_paragraphs_stripped_total",
+    "Learned per-domain boilerplate paragraphs removed from scraped text",
+)
+BOILERPLATE_TOKENS_SAVED = Counter(
+    "boilerplate_tokens_saved_total",
+    "Prompt tokens removed from scraped text by boilerplate stripping (per domain in boilerplate_domains)",
+)
+
+# AI enrichment
+RELEVANCE_DECISIONS = Counter(
+    "relevance_decisions_total",
+    "Relevance pre-filter decisions before enrichment (keep, deprioritize, drop)",
+    ["decision"],
+)
+
+NEAR_DUPLICATE_CHECKS = Counter(
+    "near_duplicate_checks_total",
+    "Near-duplicate lookups before enrichment, by result (hit reuses an existing enrichment)",
+    ["result"],
+)
+
+ENRICHMENT_TOKENS = Counter(
+    "enrichment_tokens_total",
+    "OpenAI tokens used for enrichment, by kind (prompt or completion)",
+    ["kind"],
+)
+
+OPENAI_THROTTLED = Counter(
+    "openai_throttled_total",
+    "OpenAI calls rejected with 429 rate limit errors",
+)
+
+OPENAI_LIMITER_WAIT_SECONDS = Counter(
+    "openai_limiter_wait_seconds_total",
+    "Time enrichment calls spent waiting for a rate limiter slot",
+)
+
+ENRICHMENT_REPAIRS = Counter(
+    "enrichment_repairs_total",
+    "Fields of an enrichment re-asked after missing or invalid output, by field and result",
+    ["field", "result"],
+)
+
+ENRICHMENT_FALLBACKS = Counter(
+    "enrichment_fallbacks_total",
+    "Articles enriched locally with the extractive fallback instead of OpenAI",
+)
+
+ENRICHMENT_CACHE_LOOKUPS = Counter(
+    "enrichment_cache_lookups_total",
+    "Enrichment cache lookups by text, model and prompt version, by result",
+    ["result"],
+)
+
+ENRICHMENT_LATENCY_SECONDS = Histogram(
+    "enrichment_latency_seconds",
+    "OpenAI enrichment completion latency, by model route",
+    ["route"],
+    buckets=(1, 2, 5, 10, 20, 30, 60, 120),
+)
+
+ENRICHMENT_COST_USD = Counter(
+    "enrichment_cost_usd_total",
+    "Estimated OpenAI enrichment cost in US dollars, by model route",
+    ["route"],
+)
+
+
+def metrics_response() -> Tuple[bytes, str]:
+    """Render all metrics in the Prometheus text format."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
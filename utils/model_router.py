@@ -0,0 +1,164 @@
+"""
+Routing of enrichment requests to a model and token budget.
+
+Short articles go to the light route, long ones to the heavy route and the
+rest to the standard one (settings.openai_model). A backlog in the
+ai_processing queue shifts articles one route lighter so the queue drains,
+and per-category overrides, keyed by a local keyword guess of the
+category, pin a route regardless of both. Each completion's latency and
+cost are recorded under its route.
+"""
+import re
+import time
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+import structlog
+from backend.config import settings
+from utils.metrics import ENRICHMENT_COST_USD, ENRICHMENT_LATENCY_SECONDS
+from utils.token_budget import count_tokens
+
+logger = structlog.get_logger(__name__)
+
+LIGHT = "light"
+STANDARD = "standard"
+HEAVY = "heavy"
+
+# Route one step cheaper, used while the queue is backed up
+LIGHTER = {HEAVY: STANDARD, STANDARD: LIGHT, LIGHT: LIGHT}
+
+# Kombu's Redis transport keeps one list per priority step
+QUEUE_PRIORITY_STEPS = (0, 3, 6, 9)
+QUEUE_PRIORITY_SEP = "\x06\x16"
+
+CATEGORY_KEYWORDS = {
+    "recall": ["recall", "recalls", "recalled", "nhtsa", "defect", "safety risk"],
+    "regulation": ["regulation", "regulator", "rule", "emissions standard", "epa", "tariff", "legislation", "mandate"],
+    "corporate_financial": ["earnings", "quarterly", "profit", "revenue", "shares", "investors", "guidance", "ceo"],
+    "market_sales": ["sales", "deliveries", "market share", "registrations", "demand", "inventory", "dealers"],
+    "product_launch": ["unveil", "unveiled", "launch", "debut", "new model", "revealed", "concept"],
+    "technology": ["software", "autonomous", "battery", "chip", "self-driving", "charging", "lidar"],
+    "opinion": ["opinion", "column", "review", "editorial", "why i", "i think"],
+}
+
+# Text scanned for the category guess; the lead carries the topic
+GUESS_CHARS = 2000
+
+# Process-local queue length reading: (read_at, backlog)
+_backlog_cache: Optional[Tuple[float, int]] = None
+
+
+class Route(NamedTuple):
+    """Model and budgets used for one enrichment request."""
+    name: str
+    model: str
+    max_tokens: int  # Completion tokens
+    input_budget: int  # Article text tokens in the prompt
+
+
+def routes() -> Dict[str, Route]:
+    """The configured routes by name; unset models fall back to openai_model."""
+    return {
+        LIGHT: Route(LIGHT, settings.enrichment_route_light_model or settings.openai_model,
+                     settings.enrichment_route_light_max_tokens, settings.enrichment_route_light_input_budget),
+        STANDARD: Route(STANDARD, settings.openai_model,
+                        settings.openai_max_tokens, settings.openai_input_token_budget),
+        HEAVY: Route(HEAVY, settings.enrichment_route_heavy_model or settings.openai_model,
+                     settings.enrichment_route_heavy_max_tokens, settings.enrichment_route_heavy_input_budget),
+    }
+
+
+def default_route() -> Route:
+    """The route used when routing is off or no route was chosen."""
+    return routes()[STANDARD]
+
+
+def guess_category(title: str, text: str) -> Optional[str]:
+    """Most likely category from keyword hits, title hits counting triple, or None."""
+    title, lead = (title or "").lower(), (text or "")[:GUESS_CHARS].lower()
+    scores = {}
+    for category, keywords in CATEGORY_KEYWORDS.items():
+        score = 0
+        for keyword in keywords:
+            pattern = re.compile(rf"\b{re.escape(keyword)}\b")
+            score += 3 * len(pattern.findall(title)) + len(pattern.findall(lead))
+        if score:
+            scores[category] = score
+    return max(scores, key=scores.get) if scores else None
+
+
+def choose_route(tokens: int, category: Optional[str], backlog: int) -> Route:
+    """Pick a route from the article's token count, category guess and queue backlog."""
+    table = routes()
+    override = settings.enrichment_route_category_overrides.get(category) if category else None
+    if override in table:
+        return table[override]
+    
+    if tokens <= settings.enrichment_route_short_tokens:
+        name = LIGHT
+    elif tokens >= settings.enrichment_route_long_tokens:
+        name = HEAVY
+    else:
+        name = STANDARD
+    
+    if backlog >= settings.enrichment_route_backlog_threshold:
+        name = LIGHTER[name]
+    return table[name]
+
+
+def completion_cost(model: str, usage: Dict[str, int]) -> float:
+    """Dollar cost of a completion from per-1K-token prices; 0.0 for unpriced models."""
+    prices = settings.openai_model_prices.get(model)
+    if not prices:
+        return 0.0
+    prompt_price, completion_price = prices
+    return (usage.get('prompt_tokens', 0) * prompt_price + usage.get('completion_tokens', 0) * completion_price) / 1000
+
+
+def record_route(route: Route, usage: Dict[str, int], latency: float) -> Dict[str, Any]:
+    """Count a completion's latency and cost against its route and return them for storage."""
+    cost = completion_cost(route.model, usage)
+    ENRICHMENT_LATENCY_SECONDS.labels(route=route.name).observe(latency)
+    ENRICHMENT_COST_USD.labels(route=route.name).inc(cost)
+    return {
+        "route": route.name,
+        "model": route.model,
+        "latency_seconds": round(latency, 3),
+        "cost_usd": round(cost, 6)
+    }
+
+
+async def queue_backlog() -> int:
+    """Messages waiting in the ai_processing queue, re-read at most every few seconds."""
+    global _backlog_cache
+    if _backlog_cache and time.monotonic() - _backlog_cache[0] < settings.enrichment_route_backlog_refresh_seconds:
+        return _backlog_cache[1]
+    
+    import redis.asyncio as aioredis
+    client = aioredis.Redis.from_url(settings.redis_url)
+    try:
+        keys = [
+            "ai_processing" if step == 0 else f"ai_processing{QUEUE_PRIORITY_SEP}{step}"
+            for step in QUEUE_PRIORITY_STEPS
+        ]
+        backlog = sum([await client.llen(key) for key in keys])
+    finally:
+        await client.close()
+    
+    _backlog_cache = (time.monotonic(), backlog)
+    return backlog
+
+
+async def route_article(title: str, text: str) -> Route:
+    """The route for enriching one article."""
+    if not settings.enrichment_routing_enabled:
+        return default_route()
+    
+    try:
+        backlog = await queue_backlog()
+    except Exception as e:
+        logger.warning("Could not read enrichment queue backlog", error=str(e))
+        backlog = 0
+    
+    category = guess_category(title, text)
+    route = choose_route(count_tokens(text), category, backlog)
+    logger.debug("Routed article", route=route.name, model=route.model, category_guess=category, backlog=backlog)
+    return route
@@ -0,0 +1,105 @@
+"""
+MinHash fingerprints of scraped text with an LSH index over recent articles.
+
+Wire stories syndicated by many publishers produce near-identical texts;
+spotting them before enrichment lets the copies reuse one completion.
+"""
+import hashlib
+import re
+import zlib
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+import structlog
+from backend.config import settings
+from utils.metrics import NEAR_DUPLICATE_CHECKS
+
+logger = structlog.get_logger(__name__)
+
+WORD = re.compile(r"\w+")
+
+# Universal hashing (a * x + b) mod p over 32-bit shingle hashes; p > 2^32
+_PRIME = np.uint64(4294967311)
+_MAX_HASH = np.uint64(0xFFFFFFFF)
+
+_permutations: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+
+
+def _permutation_params(num_perm: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Fixed-seed hash coefficients, so signatures agree across processes."""
+    if num_perm not in _permutations:
+        rng = np.random.RandomState(1)
+        a = rng.randint(1, 2 ** 31, size=num_perm).astype(np.uint64)
+        b = rng.randint(0, 2 ** 31, size=num_perm).astype(np.uint64)
+        _permutations[num_perm] = (a, b)
+    return _permutations[num_perm]
+
+
+def shingles(text: str, size: Optional[int] = None) -> np.ndarray:
+    """32-bit hashes of the text's overlapping word n-grams."""
+    size = size or settings.near_duplicate_shingle_words
+    words = WORD.findall(text.lower())
+    if len(words) < size:
+        return np.empty(0, dtype=np.uint64)
+    grams = {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+    return np.fromiter((zlib.crc32(gram.encode("utf-8")) for gram in grams), dtype=np.uint64, count=len(grams))
+
+
+def minhash(text: str, num_perm: Optional[int] = None) -> Optional[np.ndarray]:
+    """MinHash signature of a text, or None when it is too short to fingerprint."""
+    num_perm = num_perm or settings.near_duplicate_num_perm
+    hashes = shingles(text)
+    if not hashes.size:
+        return None
+    a, b = _permutation_params(num_perm)
+    # (num_perm, 1) x (1, shingles) -> min over shingles per permutation
+    permuted = (a[:, None] * hashes[None, :] + b[:, None]) % _PRIME
+    return np.minimum(permuted, _MAX_HASH).min(axis=1)
+
+
+def band_keys(signature: np.ndarray, bands: Optional[int] = None) -> List[str]:
+    """LSH bucket keys: one hash per band of consecutive signature rows."""
+    bands = bands or settings.near_duplicate_bands
+    rows = len(signature) // bands
+    return [
+        f"{band}:{hashlib.blake2b(signature[band * rows:(band + 1) * rows].tobytes(), digest_size=8).hexdigest()}"
+        for band in range(bands)
+    ]
+
+
+def similarity(left: np.ndarray, right: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return float(np.mean(left == right))
+
+
+class NearDuplicateIndex:
+    """Fingerprints of recently enriched articles in content_fingerprints."""
+    
+    def __init__(self, db):
+        self.db = db
+    
+    async def find(self, signature: np.ndarray) -> Optional[Dict[str, Any]]:
+        """Best enriched match at or above near_duplicate_threshold, with its score."""
+        best, best_score = None, settings.near_duplicate_threshold
+        async for candidate in self.db.content_fingerprints.find({"bands": {"$in": band_keys(signature)}}):
+            score = similarity(signature, np.array(candidate["signature"], dtype=np.uint64))
+            if score >= best_score:
+                best, best_score = candidate, score
+        
+        NEAR_DUPLICATE_CHECKS.labels(result="hit" if best else "miss").inc()
+        if best:
+            best["similarity"] = best_score
+        return best
+    
+    async def add(self, signature: np.ndarray, raw_article_id, ai_article_id):
+        """Register an enriched article so later copies can reuse it."""
+        await self.db.content_fingerprints.update_one(
+            {"raw_article_id": raw_article_id},
+            {"$set": {
+                "ai_article_id": ai_article_id,
+                "signature": signature.tolist(),
+                "bands": band_keys(signature),
+                "created_at": datetime.utcnow()
+            }},
+            upsert=True
+        )
@@ -0,0 +1,116 @@
+"""
+Publisher name resolution backed by a persistent domain-to-publisher table.
+"""
+import re
+from datetime import datetime
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+import structlog
+from pymongo import UpdateOne
+
+logger = structlog.get_logger(__name__)
+
+# Compiled once; applied to feed descriptions when no better signal exists
+PUBLISHER_PATTERNS = [
+    re.compile(r'via\s+([A-Za-z\s]+)', re.IGNORECASE),
+    re.compile(r'from\s+([A-Za-z\s]+)', re.IGNORECASE),
+    re.compile(r'by\s+([A-Za-z\s]+)', re.IGNORECASE),
+]
+
+# Aggregator hosts that never identify the real publisher
+AGGREGATOR_DOMAINS = {"news.google.com"}
+
+
+def domain_of(url: Optional[str]) -> Optional[str]:
+    """Return the lowercased host of a URL without www. or port."""
+    if not url:
+        return None
+    
+    netloc = urlparse(url).netloc.lower()
+    netloc = netloc.rsplit("@", 1)[-1].split(":", 1)[0]
+    if netloc.startswith("www."):
+        netloc = netloc[4:]
+    return netloc or None
+
+
+def guess_publisher(description: Optional[str], link: Optional[str]) -> str:
+    """Guess a publisher name from description text or the link's domain."""
+    if not description and not link:
+        return "Unknown"
+    
+    # Try to extract from description
+    if description:
+        for pattern in PUBLISHER_PATTERNS:
+            match = pattern.search(description)
+            if match:
+                return match.group(1).strip()
+    
+    # Try to extract from domain
+    domain = domain_of(link)
+    if domain:
+        return domain.split('.')[0].title()
+    
+    return "Unknown"
+
+
+class PublisherDirectory:
+    """Memoized domain-to-publisher mappings persisted in the publishers collection."""
+    
+    def __init__(self, entries: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.entries: Dict[str, Dict[str, Any]] = entries or {}
+        self._pending: Dict[str, str] = {}
+    
+    @classmethod
+    async def load(cls, db) -> "PublisherDirectory":
+        """Load every known mapping from the database."""
+        entries = {}
+        async for doc in db.publishers.find({}, {"domain": 1, "name": 1, "origin": 1}):
+            entries[doc["domain"]] = {"name": doc["name"], "origin": doc.get("origin", "feed")}
+        return cls(entries)
+    
+    def resolve(self, source_name: Optional[str] = None, source_url: Optional[str] = None,
+                description: Optional[str] = None, link: Optional[str] = None) -> str:
+        """
+        Resolve a publisher name for a feed item.
+        
+        Manual entries always win so a bad name can be fixed in one place.
+        Otherwise the feed's own <source> name is used and remembered for
+        its domain, then a remembered name for the link's domain, then a guess.
+        """
+        domain = domain_of(source_url) or domain_of(link)
+        if domain in AGGREGATOR_DOMAINS:
+            domain = None
+        
+        entry = self.entries.get(domain) if domain else None
+        if entry and entry["origin"] == "manual":
+            return entry["name"]
+        
+        if source_name:
+            if domain and entry is None:
+                self.entries[domain] = {"name": source_name, "origin": "feed"}
+                self._pending[domain] = source_name
+            return source_name
+        
+        if entry:
+            return entry["name"]
+        
+        return guess_publisher(description, link)
+    
+    async def flush(self, db):
+        """Persist mappings learned since the last flush."""
+        if not self._pending:
+            return
+        
+        now = datetime.utcnow()
+        operations = [
+            UpdateOne(
+                {"domain": domain},
+                {"$setOnInsert": {"domain": domain, "name": name, "origin": "feed", "created_at": now}},
+                upsert=True
+            )
+            for domain, name in self._pending.items()
+        ]
+        self._pending = {}
+        
+        await db.publishers.bulk_write(operations, ordered=False)
+        logger.info("Stored publisher mappings", count=len(operations))
@@ -0,0 +1,258 @@
+"""
+Cluster-wide OpenAI rate limiting with adaptive concurrency.
+
+Every enrichment call first takes a slot: one request and its estimated
+tokens from shared per-minute buckets, plus a place under a concurrency
+limit that grows slowly while calls succeed quickly and halves on a 429
+(AIMD). State lives in Redis so all Celery workers share one budget; the
+in-memory backend is a per-process stand-in for tests and single-node use.
+"""
+import asyncio
+import random
+import time
+import uuid
+import weakref
+from typing import Optional
+import structlog
+from backend.config import settings
+from utils.metrics import OPENAI_LIMITER_WAIT_SECONDS, OPENAI_THROTTLED
+
+logger = structlog.get_logger(__name__)
+
+OK = "ok"
+THROTTLED = "throttled"
+SLOW = "slow"
+ERROR = "error"  # Failed for another reason; says nothing about capacity
+
+# Seconds to wait before polling again when all concurrency slots are taken
+SLOT_POLL_SECONDS = 0.2
+
+# KEYS: bucket hash, in-flight zset, limit key
+# ARGV: rpm, tpm, request cost, token cost, slot id, slot ttl, initial limit
+# Returns 0 when the slot was taken, otherwise milliseconds to wait
+ACQUIRE_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+local rpm, tpm = tonumber(ARGV[1]), tonumber(ARGV[2])
+local request_cost, token_cost = tonumber(ARGV[3]), tonumber(ARGV[4])
+
+redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', now)
+local limit = tonumber(redis.call('GET', KEYS[3]) or ARGV[7])
+if redis.call('ZCARD', KEYS[2]) >= math.max(1, math.floor(limit)) then
+    return -1
+end
+
+local state = redis.call('HMGET', KEYS[1], 'requests', 'tokens', 'ts')
+local requests = tonumber(state[1]) or rpm
+local tokens = tonumber(state[2]) or tpm
+local elapsed = math.max(0, now - (tonumber(state[3]) or now))
+requests = math.min(rpm, requests + elapsed * rpm / 60)
+tokens = math.min(tpm, tokens + elapsed * tpm / 60)
+token_cost = math.min(token_cost, tpm)
+
+local wait = 0
+if requests < request_cost then
+    wait = math.max(wait, (request_cost - requests) * 60 / rpm)
+end
+if tokens < token_cost then
+    wait = math.max(wait, (token_cost - tokens) * 60 / tpm)
+end
+
+if wait == 0 then
+    requests = requests - request_cost
+    tokens = tokens - token_cost
+    redis.call('ZADD', KEYS[2], now + tonumber(ARGV[6]), ARGV[5])
+end
+redis.call('HSET', KEYS[1], 'requests', requests, 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], 120)
+return math.ceil(wait * 1000)
+"""
+
+# KEYS: bucket hash, in-flight zset
+# ARGV: slot id, tokens to refund, tpm
+RELEASE_SCRIPT = """
+redis.call('ZREM', KEYS[2], ARGV[1])
+local refund = tonumber(ARGV[2])
+if refund > 0 then
+    local tokens = tonumber(redis.call('HGET', KEYS[1], 'tokens'))
+    if tokens then
+        redis.call('HSET', KEYS[1], 'tokens', math.min(tonumber(ARGV[3]), tokens + refund))
+    end
+end
+return 1
+"""
+
+# KEYS: limit key
+# ARGV: outcome, initial, minimum, maximum
+ADJUST_SCRIPT = """
+local limit = tonumber(redis.call('GET', KEYS[1]) or ARGV[2])
+local outcome = ARGV[1]
+if outcome == 'throttled' then
+    limit = limit / 2
+elseif outcome == 'slow' then
+    limit = limit * 0.9
+else
+    limit = limit + 1 / limit
+end
+limit = math.max(tonumber(ARGV[3]), math.min(tonumber(ARGV[4]), limit))
+redis.call('SET', KEYS[1], limit)
+return tostring(limit)
+"""
+
+
+def next_limit(limit: float, outcome: str) -> float:
+    """AIMD step: halve on a 429, back off on slow calls, otherwise grow by 1/limit."""
+    if outcome == THROTTLED:
+        limit /= 2
+    elif outcome == SLOW:
+        limit *= 0.9
+    else:
+        limit += 1 / limit
+    return max(settings.openai_concurrency_min, min(settings.openai_concurrency_max, limit))
+
+
+class MemoryLimiterBackend:
+    """Per-process buckets and concurrency limit with the Redis backend's semantics."""
+    
+    def __init__(self):
+        self.requests = float(settings.openai_rpm_limit)
+        self.tokens = float(settings.openai_tpm_limit)
+        self.updated = time.monotonic()
+        self.limit = float(settings.openai_concurrency_initial)
+        self.in_flight = {}
+    
+    async def try_acquire(self, slot: str, tokens: int) -> float:
+        now = time.monotonic()
+        self.in_flight = {key: expiry for key, expiry in self.in_flight.items() if expiry > now}
+        if len(self.in_flight) >= max(1, int(self.limit)):
+            return -1
+        
+        rpm, tpm = settings.openai_rpm_limit, settings.openai_tpm_limit
+        elapsed = now - self.updated
+        self.updated = now
+        self.requests = min(rpm, self.requests + elapsed * rpm / 60)
+        self.tokens = min(tpm, self.tokens + elapsed * tpm / 60)
+        tokens = min(tokens, tpm)
+        
+        wait = 0.0
+        if self.requests < 1:
+            wait = max(wait, (1 - self.requests) * 60 / rpm)
+        if self.tokens < tokens:
+            wait = max(wait, (tokens - self.tokens) * 60 / tpm)
+        if wait == 0:
+            self.requests -= 1
+            self.tokens -= tokens
+            self.in_flight[slot] = now + settings.openai_slot_ttl_seconds
+        return wait
+    
+    async def release(self, slot: str, refund_tokens: int):
+        self.in_flight.pop(slot, None)
+        if refund_tokens > 0:
+            self.tokens = min(settings.openai_tpm_limit, self.tokens + refund_tokens)
+    
+    async def adjust(self, outcome: str) -> float:
+        self.limit = next_limit(self.limit, outcome)
+        return self.limit
+
+
+class RedisLimiterBackend:
+    """Buckets and concurrency limit shared by every worker through Redis."""
+    
+    def __init__(self, redis_client, prefix: str = "openai:limiter"):
+        self.redis = redis_client
+        self.keys = [f"{prefix}:bucket", f"{prefix}:inflight", f"{prefix}:limit"]
+        self._acquire = redis_client.register_script(ACQUIRE_SCRIPT)
+        self._release = redis_client.register_script(RELEASE_SCRIPT)
+        self._adjust = redis_client.register_script(ADJUST_SCRIPT)
+    
+    async def try_acquire(self, slot: str, tokens: int) -> float:
+        result = await self._acquire(keys=self.keys, args=[
+            settings.openai_rpm_limit, settings.openai_tpm_limit, 1, tokens,
+            slot, settings.openai_slot_ttl_seconds, settings.openai_concurrency_initial
+        ])
+        result = int(result)
+        return -1 if result < 0 else result / 1000
+    
+    async def release(self, slot: str, refund_tokens: int):
+        await self._release(keys=self.keys[:2], args=[slot, max(0, refund_tokens), settings.openai_tpm_limit])
+    
+    async def adjust(self, outcome: str) -> float:
+        limit = await self._adjust(keys=self.keys[2:], args=[
+            outcome, settings.openai_concurrency_initial,
+            settings.openai_concurrency_min, settings.openai_concurrency_max
+        ])
+        return float(limit)
+
+
+class RateLimiter:
+    """Takes and returns OpenAI call slots against a limiter backend."""
+    
+    def __init__(self, backend):
+        self.backend = backend
+    
+    async def acquire(self, tokens: int) -> str:
+        """Wait until a request with this many estimated tokens may be sent; return its slot id."""
+        slot = uuid.uuid4().hex
+        waited = 0.0
+        while True:
+            try:
+                wait = await self.backend.try_acquire(slot, tokens)
+            except Exception as e:
+                # Limiting is best effort: a Redis outage must not stop enrichment
+                logger.warning("Rate limiter unavailable, sending unthrottled", error=str(e))
+                return slot
+            
+            if wait == 0:
+                if waited:
+                    OPENAI_LIMITER_WAIT_SECONDS.inc(waited)
+                return slot
+            
+            # Jitter so workers released together do not retry in lockstep
+            delay = (SLOT_POLL_SECONDS if wait < 0 else wait) * random.uniform(1.0, 1.5)
+            waited += delay
+            await asyncio.sleep(delay)
+    
+    async def release(self, slot: str, outcome: str, latency: float = 0.0, refund_tokens: int = 0):
+        """Return a slot and feed the call's outcome into the concurrency limit."""
+        if outcome == OK and latency > settings.openai_latency_target_seconds:
+            outcome = SLOW
+        if outcome == THROTTLED:
+            OPENAI_THROTTLED.inc()
+        
+        try:
+            await self.backend.release(slot, refund_tokens)
+            if outcome == ERROR:
+                return
+            limit = await self.backend.adjust(outcome)
+        except Exception as e:
+            logger.warning("Could not update rate limiter", error=str(e))
+            return
+        
+        if outcome in (THROTTLED, SLOW):
+            logger.info("OpenAI concurrency limit lowered", outcome=outcome, limit=round(limit, 2))
+
+
+def backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff for retrying a throttled call."""
+    return random.uniform(0, settings.openai_backoff_base_seconds * (2 ** attempt))
+
+
+# One limiter per event loop; async Redis connections cannot cross loops
+_limiters: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, RateLimiter]" = weakref.WeakKeyDictionary()
+
+
+def get_rate_limiter() -> Optional[RateLimiter]:
+    """This event loop's rate limiter, or None when limiting is turned off."""
+    if settings.openai_rate_limiter == "off":
+        return None
+    
+    loop = asyncio.get_running_loop()
+    limiter = _limiters.get(loop)
+    if limiter is None:
+        if settings.openai_rate_limiter == "redis":
+            import redis.asyncio as aioredis
+            backend = RedisLimiterBackend(aioredis.Redis.from_url(settings.redis_url))
+        else:
+            backend = MemoryLimiterBackend()
+        limiter = _limiters[loop] = RateLimiter(backend)
+    return limiter
@@ -0,0 +1,201 @@
+"""
+Local relevance scoring of scraped articles before AI enrichment.
+
+A TF-IDF centroid of the enriched corpus is trained with NumPy and stored
+in app_config; each new article is scored by its cosine similarity to that
+centroid, scaled so a typical training article scores 1.0. Items below
+relevance_drop_below are not enriched, and items below
+relevance_deprioritize_below are queued at low priority.
+"""
+import re
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+import structlog
+from backend.config import settings
+from utils.metrics import RELEVANCE_DECISIONS
+
+logger = structlog.get_logger(__name__)
+
+KEEP = "keep"
+DEPRIORITIZE = "deprioritize"
+DROP = "drop"
+
+MODEL_CONFIG_NAME = "relevance_model"
+
+WORD = re.compile(r"[a-z][a-z0-9\-]{2,}")
+STOPWORDS = frozenset("""
+the and for that with this from have has had are was were been being will would could should
+its their they them there than then into about after before over under more most also just
+said says say which while where when what who whom whose other some such only very can may
+not but out all any our your his her she him you one two new first last year years
+""".split())
+
+# In-process copy of the stored model: (loaded_at, model or None)
+_cache: Optional[Tuple[float, Optional["RelevanceModel"]]] = None
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased content words of a text."""
+    return [word for word in WORD.findall((text or "").lower()) if word not in STOPWORDS]
+
+
+class RelevanceModel:
+    """TF-IDF vocabulary, IDF weights and normalized centroid of relevant articles."""
+    
+    def __init__(self, vocabulary: List[str], idf: np.ndarray, centroid: np.ndarray,
+                 reference: float, documents: int, trained_at: Optional[datetime] = None):
+        self.vocabulary = vocabulary
+        self.index = {term: position for position, term in enumerate(vocabulary)}
+        self.idf = idf
+        self.centroid = centroid
+        self.reference = reference
+        self.documents = documents
+        self.trained_at = trained_at or datetime.utcnow()
+    
+    @classmethod
+    def train(cls, texts: Iterable[str]) -> Optional["RelevanceModel"]:
+        """Fit a model to relevant texts, or None if there are too few."""
+        bags = [Counter(tokenize(text)) for text in texts]
+        bags = [bag for bag in bags if bag]
+        if len(bags) < settings.relevance_min_training_documents:
+            return None
+        
+        document_frequency = Counter(term for bag in bags for term in bag)
+        vocabulary = [
+            term for term, count in document_frequency.most_common(settings.relevance_vocabulary_size)
+            if count >= settings.relevance_min_document_frequency
+        ]
+        if not vocabulary:
+            return None
+        
+        frequencies = np.array([document_frequency[term] for term in vocabulary], dtype=np.float64)
+        idf = np.log((1 + len(bags)) / (1 + frequencies)) + 1.0
+        model = cls(vocabulary, idf, np.zeros(len(vocabulary)), 1.0, len(bags))
+        
+        matrix = np.vstack([model._vector(bag) for bag in bags])
+        centroid = matrix.mean(axis=0)
+        norm = np.linalg.norm(centroid)
+        if not norm:
+            return None
+        model.centroid = centroid / norm
+        
+        # Scale so the median training article scores 1.0
+        similarities = matrix @ model.centroid
+        model.reference = float(np.median(similarities[similarities > 0])) if (similarities > 0).any() else 1.0
+        return model
+    
+    def _vector(self, bag: Counter) -> np.ndarray:
+        """L2-normalized log-TF-IDF vector of a bag of words."""
+        vector = np.zeros(len(self.vocabulary))
+        for term, count in bag.items():
+            position = self.index.get(term)
+            if position is not None:
+                vector[position] = 1.0 + np.log(count)
+        vector *= self.idf
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+    
+    def score(self, text: str) -> float:
+        """Relevance of a text, about 1.0 for a typical relevant article and near 0 off-topic."""
+        similarity = float(self._vector(Counter(tokenize(text))) @ self.centroid)
+        return min(1.0, max(0.0, similarity / self.reference))
+    
+    def to_document(self) -> Dict[str, Any]:
+        """Serializable form for app_config."""
+        return {
+            "vocabulary": self.vocabulary,
+            "idf": self.idf.tolist(),
+            "centroid": self.centroid.tolist(),
+            "reference": self.reference,
+            "documents": self.documents,
+            "trained_at": self.trained_at
+        }
+    
+    @classmethod
+    def from_document(cls, payload: Dict[str, Any]) -> "RelevanceModel":
+        return cls(
+            payload["vocabulary"],
+            np.array(payload["idf"]),
+            np.array(payload["centroid"]),
+            payload["reference"],
+            payload["documents"],
+            payload.get("trained_at")
+        )
+
+
+def decide(score: Optional[float]) -> str:
+    """Keep, deprioritize or drop an article by its relevance score."""
+    if score is None:
+        return KEEP
+    if score < settings.relevance_drop_below:
+        return DROP
+    if score < settings.relevance_deprioritize_below:
+        return DEPRIORITIZE
+    return KEEP
+
+
+class RelevanceFilter:
+    """Scores articles with the stored model, reloading it periodically."""
+    
+    def __init__(self, db):
+        self.db = db
+    
+    async def _model(self) -> Optional[RelevanceModel]:
+        global _cache
+        if _cache and time.monotonic() - _cache[0] < settings.relevance_model_refresh_seconds:
+            return _cache[1]
+        
+        config = await self.db.app_config.find_one({"config_name": MODEL_CONFIG_NAME})
+        model = RelevanceModel.from_document(config["payload"]) if config else None
+        _cache = (time.monotonic(), model)
+        return model
+    
+    async def assess(self, title: str, text: str) -> Tuple[Optional[float], str]:
+        """Relevance score (None without a trained model) and the resulting decision."""
+        if not settings.relevance_filter_enabled:
+            return None, KEEP
+        
+        try:
+            model = await self._model()
+        except Exception as e:
+            logger.warning("Could not load relevance model", error=str(e))
+            model = None
+        
+        score = round(model.score(f"{title}\n{text}"), 4) if model else None
+        decision = decide(score)
+        RELEVANCE_DECISIONS.labels(decision=decision).inc()
+        return score, decision
+    
+    async def train(self) -> Optional[RelevanceModel]:
+        """Retrain from the scraped text of recently enriched articles and store the model."""
+        global _cache
+        pipeline = [
+            {"$sort": {"created_at": -1}},
+            {"$limit": settings.relevance_training_size},
+            {"$lookup": {"from": "raw_articles", "localField": "raw_article_id",
+                         "foreignField": "_id", "as": "raw"}},
+            {"$project": {"title_original": 1, "raw.scraped_text": 1}}
+        ]
+        texts = []
+        async for doc in self.db.ai_articles.aggregate(pipeline):
+            raw_text = doc["raw"][0].get("scraped_text") if doc.get("raw") else None
+            if raw_text:
+                texts.append(f"{doc.get('title_original', '')}\n{raw_text}")
+        
+        model = RelevanceModel.train(texts)
+        if model is None:
+            logger.warning("Not enough enriched articles to train relevance model", documents=len(texts))
+            return None
+        
+        await self.db.app_config.update_one(
+            {"config_name": MODEL_CONFIG_NAME},
+            {"$set": {"payload": model.to_document(), "updated_at": datetime.utcnow()},
+             "$setOnInsert": {"created_at": datetime.utcnow()}},
+            upsert=True
+        )
+        _cache = (time.monotonic(), model)
+        logger.info("Trained relevance model", documents=model.documents, vocabulary=len(model.vocabulary))
+        return model
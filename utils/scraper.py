@@ -1,17 +1,26 @@
 """
 Web scraping utilities for article content extraction.
 """
+import codecs
 import hashlib
 import re
+import time
 import asyncio
 import aiohttp
 from typing import Optional, Tuple
 from urllib.parse import urlparse, urljoin
 import structlog
-from newspaper import Article
-from readability import Document
-from bs4 import BeautifulSoup
 from backend.config import settings
+from utils.circuit_breaker import DomainCircuitBreaker, counts_against_domain
+from utils.extraction import EXTRACTION_METHODS, default_method_order, extract_text_async
+from utils.extractor_stats import ExtractorStats
+from utils.host_latency import HostLatencyTracker, get_latency_tracker, hedged_get
+from utils.http_pool import DEFAULT_HEADERS, get_session, get_throttle
+from utils.metrics import (
+    SCRAPE_BYTES_DOWNLOADED, SCRAPE_BYTES_SAVED, SCRAPE_CIRCUIT_SKIPS, SCRAPE_DOWNLOADS_STOPPED,
+    SCRAPE_RESPONSE_SECONDS, SCRAPE_TIMEOUTS,
+)
+from utils.publishers import domain_of
 
 logger = structlog.get_logger(__name__)
 
@@ -19,28 +28,33 @@ logger = structlog.get_logger(__name__)
 class ArticleScraper:
     """Robust article content scraper with multiple extraction methods."""
     
-    def __init__(self):
-        self.session: Optional[aiohttp.ClientSession] = None
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-        }
+    def __init__(self, session: Optional[aiohttp.ClientSession] = None,
+                 extractor_stats: Optional[ExtractorStats] = None,
+                 circuit_breaker: Optional[DomainCircuitBreaker] = None):
+        self.session: Optional[aiohttp.ClientSession] = session
+        self.extractor_stats = extractor_stats
+        self.circuit_breaker = circuit_breaker
+        self.last_failure: Optional[str] = None
+        self._owns_session = False
+        self.headers = dict(DEFAULT_HEADERS)
     
     async def __aenter__(self):
         """Async context manager entry."""
-        self.session = aiohttp.ClientSession(
-            headers=self.headers,
-            timeout=aiohttp.ClientTimeout(total=settings.request_timeout)
-        )
+        if self.session is None:
+            if settings.scrape_shared_pool:
+                # Reuse the worker's warm connections instead of a fresh connector
+                self.session = get_session()
+            else:
+                self.session = aiohttp.ClientSession(
+                    headers=self.headers,
+                    timeout=aiohttp.ClientTimeout(total=settings.request_timeout)
+                )
+                self._owns_session = True
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit."""
-        if self.session:
+        if self._owns_session and self.session:
             await self.session.close()
     
     def generate_feed_item_id(self, url: str, pub_date: str) -> str:
@@ -65,20 +79,94 @@ class ArticleScraper:
         if not self.session:
             raise RuntimeError("Session not initialized. Use async context manager.")
         
+        self.last_failure = None
+        if self.circuit_breaker is None:
+            return await self._fetch_article(url)
+        
+        domain = domain_of(url)
+        if not await self.circuit_breaker.allow(domain):
+            self.last_failure = "circuit_open"
+            SCRAPE_CIRCUIT_SKIPS.inc()
+            logger.info("Skipping article, domain in cool-down", url=url, domain=domain)
+            return None, None, False
+        
+        result = await self._fetch_article(url)
+        if result[2]:
+            await self.circuit_breaker.record_success(domain)
+        elif counts_against_domain(self.last_failure):
+            await self.circuit_breaker.record_failure(domain, self.last_failure)
+        return result
+    
+    async def _get(self, url: str, host: str, tracker: HostLatencyTracker) -> aiohttp.ClientResponse:
+        """
+        GET with the host's adaptive timeouts, hedging when it runs past p95.
+        
+        Only a timeout is recorded here; the caller records the latency
+        once the body has been read.
+        """
+        timeout = tracker.timeout_for(host)
+        hedge_after = tracker.hedge_delay(host)
+        
+        started = time.monotonic()
+        try:
+            if hedge_after is None:
+                response = await self.session.get(url, timeout=timeout)
+            else:
+                response = await hedged_get(self.session, url, timeout, hedge_after, tracker, get_throttle())
+        except asyncio.TimeoutError:
+            # Count the timeout as a slow sample so a slow host's limits widen
+            tracker.record(host, time.monotonic() - started)
+            raise
+        
+        SCRAPE_RESPONSE_SECONDS.observe(time.monotonic() - started)
+        return response
+    
+    async def _fetch_article(self, url: str) -> Tuple[Optional[str], Optional[str], bool]:
+        """Fetch and extract one article, noting why it failed in last_failure."""
+        host = urlparse(url).netloc.lower()
+        tracker = get_latency_tracker()
         try:
             logger.info("Fetching article", url=url)
             
-            async with self.session.get(url) as response:
+            await get_throttle().wait(url)
+            
+            started = time.monotonic()
+            response = await self._get(url, host, tracker)
+            async with response:
                 if response.status != 200:
+                    tracker.record(host, time.monotonic() - started)
+                    self.last_failure = f"http_{response.status}"
                     logger.warning("Failed to fetch article", url=url, status=response.status)
                     return None, None, False
                 
-                raw_html = await response.text()
+                # Reject PDFs, video and oversized responses before reading the body
+                rejection = _reject_response(response)
+                if rejection:
+                    tracker.record(host, time.monotonic() - started)
+                    self.last_failure = rejection
+                    SCRAPE_DOWNLOADS_STOPPED.labels(reason=rejection).inc()
+                    if response.content_length and not response.headers.get("Content-Encoding"):
+                        SCRAPE_BYTES_SAVED.inc(response.content_length)
+                    logger.warning("Skipping non-article response", url=url, reason=rejection,
+                                   content_type=response.content_type,
+                                   content_length=response.content_length)
+                    return None, None, False
+                
+                # A body that trickles in counts against the host like slow headers;
+                # so does a sock_read timeout partway through it
+                try:
+                    body = await read_html_bounded(response, settings.scrape_max_bytes)
+                finally:
+                    tracker.record(host, time.monotonic() - started)
+                encoding = _response_encoding(response, body)
+                raw_html = body.decode(encoding, errors="replace")
                 
-                # Extract cleaned text using multiple methods
-                cleaned_text = await self._extract_text(raw_html, url)
+                # Extract cleaned text using multiple methods; parsing runs in
+                # the extraction pool so other fetches keep the network busy
+                cleaned_text = await self._extract_text(body, url, encoding)
                 
                 if not cleaned_text or len(cleaned_text.strip()) < settings.min_article_length:
+                    self.last_failure = "unextractable"
                     logger.warning("Article too short or extraction failed", 
                                  url=url, length=len(cleaned_text) if cleaned_text else 0)
                     return raw_html, cleaned_text, False
@@ -88,64 +176,29 @@ class ArticleScraper:
                 return raw_html, cleaned_text, True
                 
         except asyncio.TimeoutError:
+            self.last_failure = "timeout"
+            SCRAPE_TIMEOUTS.inc()
             logger.error("Timeout fetching article", url=url)
             return None, None, False
         except Exception as e:
+            self.last_failure = "error"
             logger.error("Error fetching article", url=url, error=str(e))
             return None, None, False
     
-    async def _extract_text(self, html: str, url: str) -> Optional[str]:
-        """Extract cleaned text using multiple methods."""
-        try:
-            # Method 1: Newspaper3k (most reliable for news articles)
-            article = Article(url)
-            article.set_html(html)
-            article.parse()
-            
-            if article.text and len(article.text.strip()) > settings.min_article_length:
-                logger.debug("Extracted text using newspaper3k", length=len(article.text))
-                return article.text.strip()
-            
-            # Method 2: Readability-lxml
-            doc = Document(html)
-            readable_html = doc.summary()
-            
-            if readable_html:
-                soup = BeautifulSoup(readable_html, 'html.parser')
-                text = soup.get_text(separator=' ', strip=True)
-                
-                if text and len(text.strip()) > settings.min_article_length:
-                    logger.debug("Extracted text using readability", length=len(text))
-                    return text.strip()
-            
-            # Method 3: BeautifulSoup fallback
-            soup = BeautifulSoup(html, 'html.parser')
-            
-            # Remove script and style elements
-            for script in soup(["script", "style", "nav", "footer", "header", "aside"]):
-                script.decompose()
-            
-            # Try to find main content areas
-            main_content = soup.find('main') or soup.find('article') or soup.find('div', class_=re.compile(r'content|article|story|post'))
-            
-            if main_content:
-                text = main_content.get_text(separator=' ', strip=True)
-                if text and len(text.strip()) > settings.min_article_length:
-                    logger.debug("Extracted text using BeautifulSoup main content", length=len(text))
-                    return text.strip()
-            
-            # Fallback: get all text
-            text = soup.get_text(separator=' ', strip=True)
-            if text and len(text.strip()) > settings.min_article_length:
-                logger.debug("Extracted text using BeautifulSoup fallback", length=len(text))
-                return text.strip()
-            
-            logger.warning("All text extraction methods failed", url=url)
-            return None
-            
-        except Exception as e:
-            logger.error("Error in text extraction", url=url, error=str(e))
-            return None
+    async def _extract_text(self, html, url: str, encoding: str = "utf-8") -> Optional[str]:
+        """Extract cleaned text using multiple methods, off the event loop."""
+        if isinstance(html, str):
+            html = html.encode(encoding, errors="replace")
+        
+        if self.extractor_stats is None:
+            return (await extract_text_async(html, url, encoding)).text
+        
+        # Try the methods that have worked on this domain before
+        domain = domain_of(url)
+        order = await self.extractor_stats.method_order(domain, default_method_order(), list(EXTRACTION_METHODS))
+        result = await extract_text_async(html, url, encoding, order)
+        await self.extractor_stats.record(domain, result.attempts)
+        return result.text
     
     def clean_text(self, text: str) -> str:
         """Clean and normalize extracted text."""
@@ -163,6 +216,116 @@ class ArticleScraper:
         return text.strip()
 
 
+HTML_CONTENT_TYPES = {"text/html", "application/xhtml+xml"}
+END_MARKERS = (b"</body", b"</html")
+# Elements whose content is raw text, where end markers may appear inside strings
+RAW_TEXT_OPEN = (b"<script", b"<style")
+RAW_TEXT_CLOSE = (b"</script", b"</style")
+ARTICLE_OPEN = b"<article"
+ARTICLE_CLOSE = b"</article"
+META_CHARSET = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?([\w.:-]+)', re.IGNORECASE)
+# Overlap kept between chunks so markers split across reads are still found
+MARKER_OVERLAP = 16
+
+
+def _reject_response(response) -> Optional[str]:
+    """Reason to skip a response without downloading it, or None."""
+    content_type = (response.headers.get("Content-Type") or "").split(";", 1)[0].strip().lower()
+    if content_type and content_type not in HTML_CONTENT_TYPES:
+        return "content_type"
+    if response.content_length and response.content_length > settings.scrape_max_bytes * 4:
+        # Far past the cap; almost certainly not an article page
+        return "too_large"
+    return None
+
+
+async def read_html_bounded(response, max_bytes: int) -> bytes:
+    """
+    Stream an HTML body, stopping at max_bytes or once the article is captured.
+    
+    Reading stops at ``</body>`` outside any script or style, or once an
+    ``<article>`` closes when it is the only one seen and spans a
+    substantial amount of HTML (small teaser articles may precede the
+    story), so trailing scripts, comments and recirculation widgets are
+    never downloaded.
+    """
+    buffer = bytearray()
+    lowered = bytearray()
+    opened = closed = 0
+    article_start = None
+    reason = None
+    
+    async for chunk in response.content.iter_chunked(settings.scrape_chunk_bytes):
+        scan_from = max(0, len(buffer) - MARKER_OVERLAP)
+        buffer.extend(chunk)
+        lowered.extend(chunk.lower())
+        window = bytes(lowered[scan_from:])
+        
+        # Count only tags that end inside the new data
+        new_from = len(buffer) - len(chunk) - scan_from
+        new_opened = _count_new(window, ARTICLE_OPEN, new_from)
+        if new_opened and article_start is None:
+            article_start = scan_from + window.find(ARTICLE_OPEN, max(0, new_from - len(ARTICLE_OPEN) + 1))
+        opened += new_opened
+        closed += _count_new(window, ARTICLE_CLOSE, new_from)
+        
+        if _find_end_marker(lowered, window, scan_from):
+            # A page whose markup ends here was read in full; only count real savings
+            if not response.content.at_eof():
+                reason = "body_end"
+            break
+        if (settings.scrape_stop_after_article and opened == 1 and closed == 1
+                and len(buffer) - article_start >= settings.scrape_min_article_bytes):
+            reason = "article_end"
+            break
+        if len(buffer) >= max_bytes:
+            del buffer[max_bytes:]
+            reason = "byte_cap"
+            break
+    
+    SCRAPE_BYTES_DOWNLOADED.inc(len(buffer))
+    if reason:
+        SCRAPE_DOWNLOADS_STOPPED.labels(reason=reason).inc()
+        if response.content_length and not response.headers.get("Content-Encoding"):
+            SCRAPE_BYTES_SAVED.inc(max(0, response.content_length - len(buffer)))
+        logger.debug("Stopped reading article early", url=str(response.url),
+                     reason=reason, bytes_read=len(buffer))
+    
+    return bytes(buffer)
+
+
+def _find_end_marker(lowered: bytearray, window: bytes, scan_from: int) -> bool:
+    """True if the window holds a ``</body>`` or ``</html>`` outside script and style content."""
+    for marker in END_MARKERS:
+        position = window.find(marker)
+        while position != -1:
+            at = scan_from + position
+            opened = max(lowered.rfind(tag, 0, at) for tag in RAW_TEXT_OPEN)
+            closed = max(lowered.rfind(tag, 0, at) for tag in RAW_TEXT_CLOSE)
+            if opened <= closed:
+                return True
+            position = window.find(marker, position + 1)
+    return False
+
+
+def _count_new(window: bytes, marker: bytes, new_from: int) -> int:
+    """Occurrences of marker in window that end at or after offset new_from."""
+    return window.count(marker, max(0, new_from - len(marker) + 1))
+
+
+def _response_encoding(response, body: bytes = b"") -> str:
+    """Charset from the Content-Type header, then the page's meta tag, else UTF-8."""
+    encoding = response.charset
+    if not encoding:
+        match = META_CHARSET.search(body[:4096])
+        encoding = match.group(1).decode("ascii") if match else "utf-8"
+    try:
+        codecs.lookup(encoding)
+        return encoding
+    except LookupError:
+        return "utf-8"
+
+
 # Standalone functions for use in workers
 async def scrape_article(url: str) -> Tuple[Optional[str], Optional[str], bool]:
     """Standalone function to scrape an article."""
@@ -0,0 +1,100 @@
+"""
+Consistent-hash partitioning of RSS sources across poller workers.
+"""
+import bisect
+import hashlib
+from typing import Dict, Iterable, List, Optional
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+
+class ConsistentHashRing:
+    """Consistent hash ring with virtual nodes for even source distribution."""
+    
+    def __init__(self, nodes: Iterable[str] = (), replicas: int = 64):
+        self.replicas = replicas
+        self._keys: List[int] = []
+        self._ring: Dict[int, str] = {}
+        self._nodes: set = set()
+        
+        for node in nodes:
+            self.add_node(node)
+    
+    @staticmethod
+    def _hash(key: str) -> int:
+        """Hash a key onto the ring."""
+        return int.from_bytes(hashlib.md5(key.encode()).digest()[:8], "big")
+    
+    @property
+    def nodes(self) -> List[str]:
+        """Nodes currently on the ring, sorted."""
+        return sorted(self._nodes)
+    
+    def add_node(self, node: str):
+        """Add a node and its virtual replicas to the ring."""
+        if node in self._nodes:
+            return
+        
+        self._nodes.add(node)
+        for replica in range(self.replicas):
+            point = self._hash(f"{node}#{replica}")
+            self._ring[point] = node
+            bisect.insort(self._keys, point)
+    
+    def remove_node(self, node: str):
+        """Remove a node and its virtual replicas from the ring."""
+        if node not in self._nodes:
+            return
+        
+        self._nodes.discard(node)
+        for replica in range(self.replicas):
+            point = self._hash(f"{node}#{replica}")
+            if self._ring.get(point) == node:
+                del self._ring[point]
+                index = bisect.bisect_left(self._keys, point)
+                del self._keys[index]
+    
+    def get_node(self, key: str) -> Optional[str]:
+        """Return the node that owns a key, or None for an empty ring."""
+        if not self._keys:
+            return None
+        
+        index = bisect.bisect(self._keys, self._hash(key)) % len(self._keys)
+        return self._ring[self._keys[index]]
+    
+    def assign(self, keys: Iterable[str]) -> Dict[str, List[str]]:
+        """Group keys by owning node."""
+        assignment: Dict[str, List[str]] = {node: [] for node in self._nodes}
+        for key in keys:
+            node = self.get_node(key)
+            if node is not None:
+                assignment[node].append(key)
+        return assignment
+
+
+class WorkerLeaseRegistry:
+    """Tracks live poller workers through expiring Redis leases."""
+    
+    def __init__(self, redis_client, ttl_seconds: int = 30, prefix: str = "poller:lease:"):
+        self.redis = redis_client
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+    
+    def heartbeat(self, worker_id: str):
+        """Create or extend the lease for a worker."""
+        self.redis.set(f"{self.prefix}{worker_id}", "1", ex=self.ttl_seconds)
+    
+    def release(self, worker_id: str):
+        """Drop a worker's lease so its sources move on the next poll."""
+        self.redis.delete(f"{self.prefix}{worker_id}")
+        logger.info("Released poller lease", worker_id=worker_id)
+    
+    def live_workers(self) -> List[str]:
+        """Return the ids of workers holding an unexpired lease."""
+        workers = []
+        for key in self.redis.scan_iter(match=f"{self.prefix}*"):
+            if isinstance(key, bytes):
+                key = key.decode()
+            workers.append(key[len(self.prefix):])
+        return sorted(workers)
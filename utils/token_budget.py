@@ -0,0 +1,118 @@
+"""
+Token counting and sentence selection to fit article text into a prompt budget.
+
+Token counts come from tiktoken when it (and its encoding files) are
+available, and fall back to a four-characters-per-token estimate. tiktoken
+downloads encoding files on first use, so workers load them at start-up
+with preload_encodings rather than inside an enrichment.
+"""
+import re
+from typing import Iterable, List, Optional
+import structlog
+from backend.config import settings
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - estimate instead
+    tiktoken = None
+
+logger = structlog.get_logger(__name__)
+
+CHARS_PER_TOKEN = 4
+SENTENCE_END = re.compile(r"(?:(?<=[.!?])|(?<=[.!?][\"'”’)]))\s+(?=[\"'“‘(]?[A-Z0-9])")
+NUMBER = re.compile(r"\d")
+QUOTE = re.compile(r"[\"“”]")
+
+_encodings = {}
+
+
+def _encoding(model: str):
+    """tiktoken encoding for a model, or None (remembered) when unavailable."""
+    if model not in _encodings:
+        encoding = None
+        if tiktoken is not None:
+            try:
+                encoding = tiktoken.encoding_for_model(model)
+            except KeyError:
+                encoding = tiktoken.get_encoding("cl100k_base")
+            except Exception as e:
+                logger.warning("tiktoken encoding unavailable, estimating tokens", model=model, error=str(e))
+        _encodings[model] = encoding
+    return _encodings[model]
+
+
+def preload_encodings(models: Iterable[str]):
+    """Load (and if need be download) the encodings of these models ahead of use."""
+    for model in {model for model in models if model}:
+        _encoding(model)
+
+
+def count_tokens(text: str, model: Optional[str] = None) -> int:
+    """Number of tokens the model will see for this text."""
+    encoding = _encoding(model or settings.openai_model)
+    if encoding is None:
+        return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+    return len(encoding.encode(text))
+
+
+def truncate_to_tokens(text: str, budget: int, model: Optional[str] = None) -> str:
+    """The start of the text, cut to at most budget tokens."""
+    if budget <= 0:
+        return ""
+    encoding = _encoding(model or settings.openai_model)
+    if encoding is None:
+        return text[:budget * CHARS_PER_TOKEN]
+    return encoding.decode(encoding.encode(text)[:budget])
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split text into sentences, keeping paragraph order."""
+    sentences = []
+    for paragraph in text.split("\n"):
+        sentences.extend(part.strip() for part in SENTENCE_END.split(paragraph) if part.strip())
+    return sentences
+
+
+def _informativeness(index: int, sentence: str) -> float:
+    """Heuristic value of a sentence for summarizing: lead position, quotes, figures."""
+    score = 1.0 / (1 + index)
+    if QUOTE.search(sentence):
+        score += 0.5
+    if NUMBER.search(sentence):
+        score += 0.5
+    return score
+
+
+def fit_to_budget(text: str, budget: Optional[int] = None, model: Optional[str] = None) -> str:
+    """
+    The most informative sentences of the text that fit in the token budget.
+    
+    The lead sentences are always kept, cut to the remaining budget if
+    need be; the rest are chosen by informativeness and emitted in their
+    original order. Text without usable sentence breaks is cut to the
+    budget from its start.
+    """
+    budget = budget or settings.openai_input_token_budget
+    if count_tokens(text, model) <= budget:
+        return text
+    
+    sentences = split_sentences(text)
+    costs = [count_tokens(sentence, model) + 1 for sentence in sentences]
+    lead = settings.prompt_lead_sentences
+    
+    ranked = list(range(min(lead, len(sentences))))
+    ranked += sorted(range(lead, len(sentences)), key=lambda i: -_informativeness(i, sentences[i]))
+    
+    chosen, used = {}, 0
+    for position, index in enumerate(ranked):
+        if used + costs[index] <= budget:
+            chosen[index] = sentences[index]
+            used += costs[index]
+        elif position < lead and budget - used > 1:
+            # An oversized lead sentence is cut rather than dropped
+            chosen[index] = truncate_to_tokens(sentences[index], budget - used - 1, model)
+            used = budget
+    
+    if not chosen:
+        return truncate_to_tokens(text, budget, model)
+    return " ".join(chosen[index] for index in sorted(chosen))
@@ -0,0 +1,158 @@
+"""
+Resolution of Google News redirect links to original article URLs.
+"""
+import base64
+import re
+from datetime import datetime
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlparse
+import aiohttp
+import structlog
+from backend.config import settings
+
+logger = structlog.get_logger(__name__)
+
+GOOGLE_NEWS_HOSTS = {"news.google.com"}
+
+HREF_PATTERN = re.compile(r'href=["\']([^"\']+)["\']', re.IGNORECASE)
+URL_IN_BYTES = re.compile(rb'https?://[\x21-\x7e]+')
+
+
+def is_google_news_url(url: str) -> bool:
+    """Return True for news.google.com redirect links."""
+    return urlparse(url).netloc.lower() in GOOGLE_NEWS_HOSTS
+
+
+def _cache_key(url: str) -> str:
+    """Key a link by its path; Google appends volatile query params like ?oc=5."""
+    parsed = urlparse(url)
+    return f"{parsed.netloc.lower()}{parsed.path}"
+
+
+def _decode_article_id(article_id: str) -> Optional[str]:
+    """Pull the original URL out of a base64 protobuf Google News article id."""
+    try:
+        data = base64.urlsafe_b64decode(article_id + "=" * (-len(article_id) % 4))
+    except (ValueError, TypeError):
+        return None
+    
+    start = data.find(b"http")
+    if start < 0:
+        return None
+    
+    # Prefer the length-delimited field (tag 0x22 + varint length) wrapping the URL
+    if start >= 2 and data[start - 2] == 0x22 and data[start - 1] < 0x80:
+        length = data[start - 1]
+        raw = data[start:start + length]
+    elif start >= 3 and data[start - 3] == 0x22 and data[start - 2] >= 0x80 and data[start - 1] < 0x80:
+        length = (data[start - 2] & 0x7f) | (data[start - 1] << 7)
+        raw = data[start:start + length]
+    else:
+        match = URL_IN_BYTES.match(data, start)
+        raw = match.group(0) if match else b""
+    
+    # A full match leaves only printable ASCII, so decoding cannot fail
+    if not URL_IN_BYTES.fullmatch(raw):
+        return None
+    return raw.decode("ascii")
+
+
+def original_url_from_metadata(link: str, description: Optional[str] = None) -> Optional[str]:
+    """
+    Find the original article URL without a network round trip.
+    
+    Checks the legacy ``url=`` redirect parameter, the URL embedded in the
+    article id, and finally any non-Google link in the item description.
+    """
+    parsed = urlparse(link)
+    
+    target = parse_qs(parsed.query).get("url")
+    if target and target[0].startswith("http"):
+        return target[0]
+    
+    segments = [segment for segment in parsed.path.split("/") if segment]
+    if len(segments) >= 2 and segments[-2] == "articles":
+        decoded = _decode_article_id(segments[-1])
+        if decoded:
+            return decoded
+    
+    if description:
+        for href in HREF_PATTERN.findall(description):
+            if href.startswith("http") and not is_google_news_url(href):
+                return href
+    
+    return None
+
+
+class UrlResolver:
+    """Resolves redirect links once and caches the result in url_resolutions."""
+    
+    def __init__(self, db, session: Optional[aiohttp.ClientSession] = None):
+        self.db = db
+        self.session = session
+        self._owns_session = False
+        self._memo: Dict[str, Optional[str]] = {}
+    
+    async def __aenter__(self):
+        """Async context manager entry."""
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        if self._owns_session and self.session:
+            await self.session.close()
+    
+    async def resolve(self, link: str, description: Optional[str] = None) -> str:
+        """Return the original article URL for a link, or the link itself."""
+        if not is_google_news_url(link):
+            return link
+        
+        key = _cache_key(link)
+        if key in self._memo:
+            return self._memo[key] or link
+        
+        cached = await self.db.url_resolutions.find_one({"source_key": key})
+        if cached:
+            self._memo[key] = cached.get("resolved_url")
+            return cached.get("resolved_url") or link
+        
+        method = "metadata"
+        resolved = original_url_from_metadata(link, description)
+        
+        if resolved is None:
+            method = "redirect"
+            try:
+                resolved = await self._follow_redirects(link)
+            except Exception as e:
+                # Transient failures are not cached so the next sighting retries
+                logger.warning("Failed to resolve redirect", url=link, error=str(e))
+                return link
+        
+        self._memo[key] = resolved
+        await self.db.url_resolutions.update_one(
+            {"source_key": key},
+            {"$setOnInsert": {
+                "source_key": key,
+                "source_url": link,
+                "resolved_url": resolved,
+                "method": method if resolved else "unresolvable",
+                "resolved_at": datetime.utcnow()
+            }},
+            upsert=True
+        )
+        
+        logger.debug("Resolved article URL", url=link, resolved=resolved, method=method)
+        return resolved or link
+    
+    async def _follow_redirects(self, link: str) -> Optional[str]:
+        """Follow HTTP redirects once; None when they never leave Google."""
+        if self.session is None:
+            self.session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=settings.request_timeout)
+            )
+            self._owns_session = True
+        
+        async with self.session.get(link, allow_redirects=True) as response:
+            final_url = str(response.url)
+        
+        return None if is_google_news_url(final_url) else final_url
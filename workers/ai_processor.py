@@ -1,15 +1,26 @@
 """
 AI processing worker for enriching articles with OpenAI.
 """
-import asyncio
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from bson import ObjectId
 import structlog
+from pymongo.errors import DuplicateKeyError
+from backend.config import settings
 from backend.database import get_database
 from backend.models import AIArticle, Entity, EntityTypeEnum
-from utils.ai_processor import process_article_with_ai
-from workers.celery_app import celery_app
+# Aliased: the Celery task below is also named process_article_with_ai and would shadow it
+from utils.ai_processor import process_article_with_ai as enrich_article_with_ai
+from utils.ai_processor import REQUIRED_FIELDS, generate_long_summary, process_articles_in_batches
+from utils.batch_enrichment import BatchItem, is_batchable
+from utils.blob_store import load_raw_html
+from utils.enrichment_cache import EnrichmentCache
+from utils.extractive_fallback import enrich_locally, fallback_active, record_outcome
+from utils.extraction import extract_text_async
+from utils.model_router import route_article, routes
+from utils.near_duplicates import NearDuplicateIndex, minhash
+from utils.relevance import RelevanceFilter
+from workers.celery_app import celery_app, run_async
 
 logger = structlog.get_logger(__name__)
 
@@ -21,13 +32,10 @@ def process_article_with_ai(self, raw_article_id: str, title: str, url: str,
     try:
         logger.info("Starting AI processing", raw_article_id=raw_article_id)
         
-        # Run async task
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        result = loop.run_until_complete(_process_article_with_ai_async(
+        # Run async task on the worker's persistent loop
+        result = run_async(_process_article_with_ai_async(
             raw_article_id, title, url, publisher, published_at
         ))
-        loop.close()
         
         logger.info("AI processing completed", raw_article_id=raw_article_id)
         return result
@@ -63,13 +71,43 @@ async def _process_article_with_ai_async(raw_article_id: str, title: str, url: s
         return {"success": False, "error": "No scraped text available"}
     
     try:
-        # Process with AI
-        ai_data = await process_article_with_ai(
-            title=title,
-            text=raw_article['scraped_text'],
-            url=url,
-            publisher=publisher
-        )
+        # Syndicated copies of an already enriched story reuse its enrichment
+        signature = minhash(raw_article['scraped_text']) if settings.near_duplicate_enabled else None
+        fingerprints = NearDuplicateIndex(db)
+        original = await _find_enriched_duplicate(db, fingerprints, signature)
+        
+        if original:
+            ai_data = original
+            logger.info("Reusing enrichment of near-duplicate",
+                       raw_article_id=raw_article_id,
+                       duplicate_of=str(original['_id']),
+                       similarity=round(original['similarity'], 3))
+        elif await fallback_active():
+            # OpenAI is backed up or failing: publish a provisional local enrichment
+            ai_data = enrich_locally(title, raw_article['scraped_text'], publisher)
+            logger.info("Using extractive fallback enrichment", raw_article_id=raw_article_id)
+        else:
+            # Process with AI, on a model and budget suited to the article
+            route = await route_article(title, raw_article['scraped_text'])
+            try:
+                ai_data = await enrich_article_with_ai(
+                    title=title,
+                    text=raw_article['scraped_text'],
+                    url=url,
+                    publisher=publisher,
+                    cache=EnrichmentCache(db),
+                    fast=settings.progressive_enrichment,
+                    route=route
+                )
+            except Exception as e:
+                await record_outcome(False)
+                if not await fallback_active():
+                    raise
+                logger.warning("AI processing failed, using extractive fallback",
+                               raw_article_id=raw_article_id, error=str(e))
+                ai_data = enrich_locally(title, raw_article['scraped_text'], publisher)
+            else:
+                await record_outcome(True)
         
         # Parse published date
         try:
@@ -82,29 +120,25 @@ async def _process_article_with_ai_async(raw_article_id: str, title: str, url: s
             parsed_published_at = datetime.utcnow()
         
         # Create AI article record
-        ai_article_data = {
-            "raw_article_id": ObjectId(raw_article_id),
-            "ai_title": ai_data['ai_title'],
-            "title_original": title,
-            "publisher": publisher,
-            "published_at": parsed_published_at,
-            "industry": ai_data['industry'],
-            "category": ai_data['category'],
-            "short_summary": ai_data['short_summary'],
-            "long_summary": ai_data['long_summary'],
-            "sentiment_label": ai_data['sentiment_label'],
-            "sentiment_score": ai_data['sentiment_score'],
-            "entities": ai_data['entities'],
-            "tags": ai_data['tags'],
-            "ai_raw_response": ai_data['ai_raw_response'],
-            "created_at": datetime.utcnow(),
-            "updated_at": datetime.utcnow()
-        }
+        ai_article_data = _ai_article_document(ObjectId(raw_article_id), ai_data, title, publisher, parsed_published_at)
+        if original:
+            # No completion was paid for; keep the copy out of route cost and latency stats
+            ai_article_data["token_usage"] = {}
+            ai_article_data["enrichment_route"] = {}
+            ai_article_data["duplicate_of"] = original['_id']
         
         # Insert AI article
         result = await db.ai_articles.insert_one(ai_article_data)
         ai_article_id = result.inserted_id
         
+        # The original's long pass may have finished before this copy existed
+        if original and ai_article_data["long_summary_status"] == "pending":
+            await _sync_copy_long_summary(db, original['_id'], ai_article_id)
+        
+        # Provisional enrichments are not reused; the upgrade adds the fingerprint
+        if signature is not None and not original and not ai_data.get('provisional'):
+            await fingerprints.add(signature, ObjectId(raw_article_id), ai_article_id)
+        
         logger.info("Created AI article", 
                    ai_article_id=str(ai_article_id),
                    category=ai_data['category'],
@@ -113,11 +147,16 @@ async def _process_article_with_ai_async(raw_article_id: str, title: str, url: s
         # Send real-time notification
         send_article_notification.delay(str(ai_article_id))
         
+        # Fast pass published; the long summary follows (copies get the original's)
+        if not original and ai_article_data["long_summary_status"] == "pending":
+            complete_long_summary.delay(str(ai_article_id))
+        
         return {
             "success": True,
             "ai_article_id": str(ai_article_id),
             "category": ai_data['category'],
-            "sentiment": ai_data['sentiment_label']
+            "sentiment": ai_data['sentiment_label'],
+            "duplicate_of": str(original['_id']) if original else None
         }
         
     except Exception as e:
@@ -125,6 +164,333 @@ async def _process_article_with_ai_async(raw_article_id: str, title: str, url: s
         return {"success": False, "error": str(e)}
 
 
+def _ai_article_document(raw_article_id: ObjectId, ai_data: Dict[str, Any], title: str,
+                         publisher: str, published_at: datetime) -> Dict[str, Any]:
+    """The ai_articles record for an enrichment result."""
+    return {
+        "raw_article_id": raw_article_id,
+        "ai_title": ai_data['ai_title'],
+        "title_original": title,
+        "publisher": publisher,
+        "published_at": published_at,
+        "industry": ai_data['industry'],
+        "category": ai_data['category'],
+        "short_summary": ai_data['short_summary'],
+        "long_summary": ai_data['long_summary'],
+        "long_summary_status": ai_data.get('long_summary_status', 'ready'),
+        "sentiment_label": ai_data['sentiment_label'],
+        "sentiment_score": ai_data['sentiment_score'],
+        "entities": ai_data['entities'],
+        "tags": ai_data['tags'],
+        "ai_raw_response": ai_data['ai_raw_response'],
+        "token_usage": ai_data.get('token_usage', {}),
+        "enrichment_route": ai_data.get('enrichment_route', {}),
+        "provisional": ai_data.get('provisional', False),
+        "created_at": datetime.utcnow(),
+        "updated_at": datetime.utcnow()
+    }
+
+
+async def _sync_copy_long_summary(db, original_id: ObjectId, copy_id: ObjectId):
+    """Give a pending copy the long summary its original has since finished or given up on."""
+    current = await db.ai_articles.find_one(
+        {"_id": original_id}, {"long_summary": 1, "long_summary_status": 1}
+    )
+    if not current or current.get('long_summary_status') == 'pending':
+        return
+    
+    await db.ai_articles.update_one(
+        {"_id": copy_id, "long_summary_status": "pending"},
+        {"$set": {"long_summary": current.get('long_summary', ''),
+                  "long_summary_status": current['long_summary_status'],
+                  "updated_at": datetime.utcnow()}}
+    )
+
+
+async def _find_enriched_duplicate(db, fingerprints: NearDuplicateIndex, signature) -> Optional[Dict[str, Any]]:
+    """The enriched article a near-duplicate text can reuse, if one is still around."""
+    if signature is None:
+        return None
+    
+    try:
+        match = await fingerprints.find(signature)
+    except Exception as e:
+        logger.warning("Near-duplicate lookup failed", error=str(e))
+        return None
+    if not match:
+        return None
+    
+    original = await db.ai_articles.find_one({"_id": match["ai_article_id"]})
+    if original:
+        original["similarity"] = match["similarity"]
+    return original
+
+
+@celery_app.task(bind=True, max_retries=3)
+def complete_long_summary(self, ai_article_id: str):
+    """Deferred pass of progressive enrichment: fill in the long summary."""
+    try:
+        result = run_async(_complete_long_summary_async(ai_article_id))
+        logger.info("Long summary pass completed", ai_article_id=ai_article_id)
+        return result
+    
+    except Exception as e:
+        logger.error("Long summary pass failed", ai_article_id=ai_article_id, error=str(e))
+        if self.request.retries >= self.max_retries:
+            run_async(_set_long_summary_failed(ai_article_id))
+            return {"success": False, "error": str(e)}
+        raise self.retry(exc=e, countdown=120)
+
+
+async def _complete_long_summary_async(ai_article_id: str) -> Dict[str, Any]:
+    """Generate the long summary, store it on the article and its copies, and announce it."""
+    db = await get_database()
+    
+    article = await db.ai_articles.find_one({"_id": ObjectId(ai_article_id)})
+    if not article:
+        return {"success": False, "error": "AI article not found"}
+    if article.get('long_summary_status') != 'pending':
+        return {"success": True, "skipped": True}
+    
+    raw_article = await db.raw_articles.find_one({"_id": article['raw_article_id']})
+    if not raw_article or not raw_article.get('scraped_text'):
+        await _set_long_summary_failed(ai_article_id)
+        return {"success": False, "error": "No scraped text available"}
+    
+    # The long summary stays on the route the fast pass took
+    route = routes().get(article.get('enrichment_route', {}).get('route'))
+    result = await generate_long_summary(
+        title=article['title_original'],
+        text=raw_article['scraped_text'],
+        url=raw_article['url'],
+        publisher=article['publisher'],
+        cache=EnrichmentCache(db),
+        route=route
+    )
+    
+    summary = {"long_summary": result['long_summary'], "long_summary_status": "ready",
+               "updated_at": datetime.utcnow()}
+    increments = {f"token_usage.{key}": value for key, value in result['token_usage'].items()}
+    if result.get('enrichment_route'):
+        increments["enrichment_route.cost_usd"] = result['enrichment_route']['cost_usd']
+    await db.ai_articles.update_one(
+        {"_id": article['_id']},
+        {"$set": summary, "$inc": increments}
+    )
+    
+    # Near-duplicates published from the fast pass share this summary
+    copies = [doc['_id'] async for doc in db.ai_articles.find(
+        {"duplicate_of": article['_id'], "long_summary_status": "pending"}, {"_id": 1}
+    )]
+    if copies:
+        await db.ai_articles.update_many({"_id": {"$in": copies}}, {"$set": summary})
+    
+    from workers.notifications import broadcast_article_updated
+    for updated_id in [article['_id']] + copies:
+        broadcast_article_updated.delay(str(updated_id), ["long_summary"])
+    
+    return {"success": True, "copies": len(copies)}
+
+
+async def _set_long_summary_failed(ai_article_id: str):
+    """Stop showing a long summary as pending, on the article and its copies, once its pass has given up."""
+    db = await get_database()
+    article_id = ObjectId(ai_article_id)
+    await db.ai_articles.update_many(
+        {"$or": [{"_id": article_id}, {"duplicate_of": article_id}], "long_summary_status": "pending"},
+        {"$set": {"long_summary_status": "failed", "updated_at": datetime.utcnow()}}
+    )
+
+
+@celery_app.task
+def process_articles_batch(raw_article_ids: List[str]):
+    """Enrich several short articles per OpenAI request (backfills and bursts)."""
+    try:
+        result = run_async(_process_articles_batch_async(raw_article_ids))
+        logger.info("Batch enrichment completed", **result)
+        return result
+    
+    except Exception as e:
+        logger.error("Batch enrichment failed", articles=len(raw_article_ids), error=str(e))
+        return {"success": False, "error": str(e)}
+
+
+async def _process_articles_batch_async(raw_article_ids: List[str], provider=None) -> Dict[str, Any]:
+    """Async batch enrichment; long or unanswered articles go to the single-article task."""
+    db = await get_database()
+    ids = [ObjectId(raw_article_id) for raw_article_id in raw_article_ids]
+    
+    enriched = {doc['raw_article_id'] async for doc in
+                db.ai_articles.find({"raw_article_id": {"$in": ids}}, {"raw_article_id": 1})}
+    raw_articles = [doc async for doc in
+                    db.raw_articles.find({"_id": {"$in": ids}, "scraped_text": {"$nin": [None, ""]}})
+                    if doc['_id'] not in enriched]
+    
+    items = {
+        str(raw['_id']): BatchItem(
+            raw_article_id=str(raw['_id']),
+            title=raw.get('title') or '',
+            text=raw['scraped_text'],
+            url=raw['url'],
+            publisher=raw.get('publisher') or 'Unknown'
+        )
+        for raw in raw_articles
+    }
+    results = await process_articles_in_batches(
+        [item for item in items.values() if is_batchable(item)], provider=provider
+    )
+    
+    created, single = 0, 0
+    for raw in raw_articles:
+        item = items[str(raw['_id'])]
+        published_at = raw.get('published_at') or raw.get('created_at') or datetime.utcnow()
+        ai_data = results.get(item.raw_article_id)
+        
+        if ai_data is None:
+            process_article_with_ai.delay(
+                raw_article_id=item.raw_article_id,
+                title=item.title,
+                url=item.url,
+                publisher=item.publisher,
+                published_at=published_at.isoformat()
+            )
+            single += 1
+            continue
+        
+        try:
+            result = await db.ai_articles.insert_one(
+                _ai_article_document(raw['_id'], ai_data, item.title, item.publisher, published_at)
+            )
+        except DuplicateKeyError:
+            continue  # Enriched concurrently by the single-article path
+        send_article_notification.delay(str(result.inserted_id))
+        created += 1
+    
+    return {"success": True, "batched": created, "queued_single": single,
+            "skipped": len(ids) - len(raw_articles)}
+
+
+@celery_app.task
+def backfill_enrichment(limit: Optional[int] = None):
+    """Queue batch enrichment for scraped articles that were never enriched."""
+    try:
+        result = run_async(_backfill_enrichment_async(limit or settings.batch_backfill_limit))
+        logger.info("Enrichment backfill queued", **result)
+        return result
+    
+    except Exception as e:
+        logger.error("Enrichment backfill failed", error=str(e))
+        return {"success": False, "error": str(e)}
+
+
+async def _backfill_enrichment_async(limit: int) -> Dict[str, Any]:
+    """Find unenriched raw articles and dispatch them in batch tasks."""
+    db = await get_database()
+    
+    pending = await db.raw_articles.aggregate([
+        {"$match": {"scraped_text": {"$nin": [None, ""]}, "duplicate_of": {"$exists": False}}},
+        {"$lookup": {"from": "ai_articles", "localField": "_id",
+                     "foreignField": "raw_article_id", "as": "enrichment"}},
+        {"$match": {"enrichment": {"$size": 0}}},
+        {"$limit": limit},
+        {"$project": {"_id": 1}}
+    ]).to_list(length=limit)
+    
+    raw_article_ids = [str(doc['_id']) for doc in pending]
+    size = settings.batch_task_size
+    for start in range(0, len(raw_article_ids), size):
+        process_articles_batch.delay(raw_article_ids[start:start + size])
+    
+    return {"success": True, "articles": len(raw_article_ids), "tasks": (len(raw_article_ids) + size - 1) // size}
+
+
+@celery_app.task
+def upgrade_provisional_articles():
+    """Re-enrich provisional fallback articles with OpenAI once it is healthy again."""
+    try:
+        result = run_async(_upgrade_provisional_articles_async())
+        logger.info("Provisional article upgrade completed", **result)
+        return result
+    
+    except Exception as e:
+        logger.error("Provisional article upgrade failed", error=str(e))
+        return {"success": False, "error": str(e)}
+
+
+async def _upgrade_provisional_articles_async(limit: Optional[int] = None) -> Dict[str, Any]:
+    """Replace the oldest provisional enrichments in place and announce the changed fields."""
+    if await fallback_active():
+        return {"success": True, "skipped": True}
+    
+    db = await get_database()
+    limit = limit or settings.fallback_upgrade_batch_size
+    articles = await db.ai_articles.find({"provisional": True}).sort("created_at", 1).limit(limit).to_list(length=limit)
+    
+    upgraded = failed = 0
+    for article in articles:
+        raw_article = await db.raw_articles.find_one({"_id": article['raw_article_id']})
+        if not raw_article or not raw_article.get('scraped_text'):
+            continue
+        
+        text = raw_article['scraped_text']
+        try:
+            ai_data = await enrich_article_with_ai(
+                title=article['title_original'],
+                text=text,
+                url=raw_article['url'],
+                publisher=article['publisher'],
+                cache=EnrichmentCache(db),
+                route=await route_article(article['title_original'], text)
+            )
+        except Exception as e:
+            await record_outcome(False)
+            logger.warning("Could not upgrade provisional article", ai_article_id=str(article['_id']), error=str(e))
+            failed += 1
+            # Leave the rest for the next run rather than hammering a failing API
+            break
+        await record_outcome(True)
+        
+        update = _ai_article_document(article['raw_article_id'], ai_data, article['title_original'],
+                                      article['publisher'], article['published_at'])
+        del update['created_at']
+        result = await db.ai_articles.update_one({"_id": article['_id'], "provisional": True}, {"$set": update})
+        if not result.modified_count:
+            continue
+        upgraded += 1
+        
+        # Texts too short to fingerprint have no signature
+        signature = minhash(text) if settings.near_duplicate_enabled else None
+        if signature is not None:
+            await NearDuplicateIndex(db).add(signature, article['raw_article_id'], article['_id'])
+        
+        from workers.notifications import broadcast_article_updated
+        broadcast_article_updated.delay(str(article['_id']), REQUIRED_FIELDS + ["provisional"])
+    
+    return {"success": True, "upgraded": upgraded, "failed": failed}
+
+
+@celery_app.task
+def train_relevance_model():
+    """Retrain the local relevance pre-filter from recently enriched articles."""
+    try:
+        result = run_async(_train_relevance_model_async())
+        logger.info("Relevance model training completed", **result)
+        return result
+    
+    except Exception as e:
+        logger.error("Relevance model training failed", error=str(e))
+        return {"success": False, "error": str(e)}
+
+
+async def _train_relevance_model_async() -> Dict[str, Any]:
+    """Async training logic."""
+    db = await get_database()
+    model = await RelevanceFilter(db).train()
+    if model is None:
+        return {"success": False, "error": "Not enough enriched articles"}
+    return {"success": True, "documents": model.documents, "vocabulary": len(model.vocabulary)}
+
+
 @celery_app.task
 def send_article_notification(ai_article_id: str):
     """Send real-time notification for new AI article."""
@@ -148,11 +514,8 @@ def reprocess_article(raw_article_id: str):
     try:
         logger.info("Reprocessing article", raw_article_id=raw_article_id)
         
-        # Run async task
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        result = loop.run_until_complete(_reprocess_article_async(raw_article_id))
-        loop.close()
+        # Run async task on the worker's persistent loop
+        result = run_async(_reprocess_article_async(raw_article_id))
         
         logger.info("Article reprocessing completed", raw_article_id=raw_article_id)
         return result
@@ -175,6 +538,13 @@ async def _reprocess_article_async(raw_article_id: str) -> Dict[str, Any]:
     # Delete existing AI article if it exists
     await db.ai_articles.delete_many({"raw_article_id": ObjectId(raw_article_id)})
     
+    # Re-extract from the stored page when no text was kept
+    if not raw_article.get('scraped_text'):
+        raw_html = await load_raw_html(db, raw_article)
+        if raw_html:
+            result = await extract_text_async(raw_html.encode("utf-8"), raw_article['url'])
+            raw_article['scraped_text'] = result.text
+    
     # Extract article metadata from raw data
     # This is a simplified version - in production, you'd parse the raw_xml_item
     title = "Reprocessed Article"  # Extract from raw_xml_item
@@ -183,32 +553,16 @@ async def _reprocess_article_async(raw_article_id: str) -> Dict[str, Any]:
     
     # Process with AI
     try:
-        ai_data = await process_article_with_ai(
+        ai_data = await enrich_article_with_ai(
             title=title,
             text=raw_article.get('scraped_text', ''),
             url=raw_article['url'],
-            publisher=publisher
+            publisher=publisher,
+            cache=EnrichmentCache(db)
         )
         
         # Create new AI article
-        ai_article_data = {
-            "raw_article_id": ObjectId(raw_article_id),
-            "ai_title": ai_data['ai_title'],
-            "title_original": title,
-            "publisher": publisher,
-            "published_at": published_at,
-            "industry": ai_data['industry'],
-            "category": ai_data['category'],
-            "short_summary": ai_data['short_summary'],
-            "long_summary": ai_data['long_summary'],
-            "sentiment_label": ai_data['sentiment_label'],
-            "sentiment_score": ai_data['sentiment_score'],
-            "entities": ai_data['entities'],
-            "tags": ai_data['tags'],
-            "ai_raw_response": ai_data['ai_raw_response'],
-            "created_at": datetime.utcnow(),
-            "updated_at": datetime.utcnow()
-        }
+        ai_article_data = _ai_article_document(ObjectId(raw_article_id), ai_data, title, publisher, published_at)
         
         result = await db.ai_articles.insert_one(ai_article_data)
         
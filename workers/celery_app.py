@@ -1,7 +1,9 @@
 """
 Celery application configuration for task queue.
 """
+import asyncio
 from celery import Celery
+from celery.signals import worker_process_init, worker_process_shutdown
 from backend.config import settings
 import structlog
 
@@ -15,7 +17,9 @@ celery_app = Celery(
     include=[
         'workers.rss_poller',
         'workers.ai_processor',
-        'workers.notifications'
+        'workers.notifications',
+        'workers.storage',
+        'workers.retention'
     ]
 )
 
@@ -42,11 +46,29 @@ celery_app.conf.update(
     task_default_exchange='default',
     task_default_exchange_type='direct',
     task_default_routing_key='default',
+    worker_direct=True,  # Per-worker queues for sharded RSS polling
+    broker_transport_options={'queue_order_strategy': 'priority'},  # Low-relevance items queue last
     beat_schedule={
         'poll-rss-feeds': {
             'task': 'workers.rss_poller.poll_rss_feeds',
             'schedule': settings.poll_interval_seconds,
         },
+        'prune-html-blobs': {
+            'task': 'workers.storage.prune_html_blobs',
+            'schedule': 6 * 3600,
+        },
+        'upgrade-provisional-articles': {
+            'task': 'workers.ai_processor.upgrade_provisional_articles',
+            'schedule': 600,
+        },
+        'train-relevance-model': {
+            'task': 'workers.ai_processor.train_relevance_model',
+            'schedule': 24 * 3600,
+        },
+        'archive-old-articles': {
+            'task': 'workers.retention.archive_old_articles',
+            'schedule': 24 * 3600,
+        },
     },
 )
 
@@ -59,3 +81,52 @@ celery_app.conf.update(
 logger.info("Celery app configured", 
            broker=settings.redis_url, 
            poll_interval=settings.poll_interval_seconds)
+
+
+# Long-lived event loop per worker process, so pooled connections
+# (HTTP keep-alive, MongoDB) survive from one task to the next
+_worker_loop = None
+
+
+def run_async(coro):
+    """Run a coroutine on this worker process's long-lived event loop."""
+    global _worker_loop
+    if _worker_loop is None or _worker_loop.is_closed():
+        _worker_loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_worker_loop)
+    return _worker_loop.run_until_complete(coro)
+
+
+@worker_process_init.connect
+def _preload_token_encodings(**kwargs):
+    """Load tiktoken encodings before tasks run; their first use downloads files."""
+    from utils.token_budget import preload_encodings
+    preload_encodings([
+        settings.openai_model, settings.enrichment_route_light_model, settings.enrichment_route_heavy_model
+    ])
+
+
+@worker_process_init.connect
+def _start_extraction_pool(**kwargs):
+    """Start the extraction pool so parsing runs off this process's event loop."""
+    from utils.extraction import start_extraction_pool
+    start_extraction_pool()
+
+
+@worker_process_shutdown.connect
+def _close_worker_loop(**kwargs):
+    """Close pooled connections, the extraction pool and the loop when a worker process exits."""
+    global _worker_loop
+    from utils.extraction import shutdown_extraction_pool
+    if _worker_loop is None or _worker_loop.is_closed():
+        # The extraction pool starts with the process, before any task ran
+        shutdown_extraction_pool()
+        return
+    
+    from utils.http_pool import close_pool
+    try:
+        _worker_loop.run_until_complete(close_pool())
+    finally:
+        shutdown_extraction_pool()
+        _worker_loop.close()
+        _worker_loop = None
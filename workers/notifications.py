@@ -7,7 +7,7 @@ from typing import Dict, Any, List
 import structlog
 from backend.database import get_database
 from backend.models import ArticleResponse, WebSocketMessage
-from workers.celery_app import celery_app
+from workers.celery_app import celery_app, run_async
 
 logger = structlog.get_logger(__name__)
 
@@ -22,12 +22,8 @@ def broadcast_new_article(ai_article_id: str):
     try:
         logger.info("Broadcasting new article", ai_article_id=ai_article_id)
         
-        # Run async task
-        import asyncio
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        result = loop.run_until_complete(_broadcast_new_article_async(ai_article_id))
-        loop.close()
+        # Run async task on the worker's persistent loop
+        result = run_async(_broadcast_new_article_async(ai_article_id))
         
         return result
         
@@ -62,6 +58,8 @@ async def _broadcast_new_article_async(ai_article_id: str) -> Dict[str, Any]:
         category=ai_article['category'],
         short_summary=ai_article['short_summary'],
         long_summary=ai_article['long_summary'],
+        long_summary_status=ai_article.get('long_summary_status', 'ready'),
+        provisional=ai_article.get('provisional', False),
         sentiment_label=ai_article['sentiment_label'],
         sentiment_score=ai_article['sentiment_score'],
         entities=ai_article['entities'],
@@ -90,6 +88,52 @@ async def _broadcast_new_article_async(ai_article_id: str) -> Dict[str, Any]:
     return {"success": True, "connections": len(websocket_connections)}
 
 
+@celery_app.task
+def broadcast_article_updated(ai_article_id: str, fields: List[str]):
+    """Broadcast changed fields of an already published article."""
+    try:
+        logger.info("Broadcasting article update", ai_article_id=ai_article_id, fields=fields)
+        
+        # Run async task on the worker's persistent loop
+        result = run_async(_broadcast_article_updated_async(ai_article_id, fields))
+        
+        return result
+    
+    except Exception as e:
+        logger.error("Error broadcasting article update", ai_article_id=ai_article_id, error=str(e))
+        return {"success": False, "error": str(e)}
+
+
+async def _broadcast_article_updated_async(ai_article_id: str, fields: List[str]) -> Dict[str, Any]:
+    """Async update broadcast logic."""
+    db = await get_database()
+    
+    projection = {field: 1 for field in fields}
+    projection["long_summary_status"] = 1
+    projection["provisional"] = 1
+    ai_article = await db.ai_articles.find_one({"_id": ObjectId(ai_article_id)}, projection)
+    
+    if not ai_article:
+        logger.error("AI article not found for update broadcast", ai_article_id=ai_article_id)
+        return {"success": False, "error": "Article not found"}
+    
+    message = WebSocketMessage(
+        type="article_updated",
+        data={
+            "id": ai_article_id,
+            "fields": {field: ai_article.get(field) for field in fields},
+            "long_summary_status": ai_article.get("long_summary_status", "ready"),
+            "provisional": ai_article.get("provisional", False)
+        }
+    )
+    
+    await _store_notification(json.dumps(message.dict(), default=str))
+    
+    logger.info("Article update broadcasted", ai_article_id=ai_article_id, fields=fields)
+    
+    return {"success": True, "connections": len(websocket_connections)}
+
+
 async def _store_notification(message: str):
     """Store notification for WebSocket clients."""
     # In production, use Redis pub/sub
@@ -121,12 +165,8 @@ def send_bulk_notification(article_ids: List[str]):
     try:
         logger.info("Sending bulk notification", count=len(article_ids))
         
-        # Run async task
-        import asyncio
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        result = loop.run_until_complete(_send_bulk_notification_async(article_ids))
-        loop.close()
+        # Run async task on the worker's persistent loop
+        result = run_async(_send_bulk_notification_async(article_ids))
         
         return result
         
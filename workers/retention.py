@@ -0,0 +1,55 @@
+"""
+Retention tasks: archive old enriched articles out of the hot collection.
+
+TTL indexes (see backend.database.create_indexes) expire failed fetches
+and stale redirect resolutions; raw HTML blobs are pruned by
+workers.storage.prune_html_blobs.
+"""
+from datetime import datetime, timedelta
+from typing import Any, Dict
+import structlog
+from pymongo import ReplaceOne
+from backend.config import settings
+from backend.database import get_database
+from workers.celery_app import celery_app, run_async
+
+logger = structlog.get_logger(__name__)
+
+
+@celery_app.task
+def archive_old_articles():
+    """Move ai_articles older than article_archive_after_days into ai_articles_archive."""
+    try:
+        result = run_async(_archive_old_articles_async())
+        logger.info("Archived old articles", **result)
+        return result
+    
+    except Exception as e:
+        logger.error("Article archiving failed", error=str(e))
+        return {"success": False, "error": str(e)}
+
+
+async def _archive_old_articles_async() -> Dict[str, Any]:
+    """Async archiving logic, in batches so each round trip stays small."""
+    db = await get_database()
+    cutoff = datetime.utcnow() - timedelta(days=settings.article_archive_after_days)
+    
+    archived = 0
+    while True:
+        batch = await db.ai_articles.find(
+            {"created_at": {"$lt": cutoff}}
+        ).sort("created_at", 1).limit(settings.archive_batch_size).to_list(length=settings.archive_batch_size)
+        
+        if not batch:
+            break
+        
+        now = datetime.utcnow()
+        # Upsert by _id so a batch interrupted before the delete is safe to redo
+        await db.ai_articles_archive.bulk_write(
+            [ReplaceOne({"_id": doc["_id"]}, {**doc, "archived_at": now}, upsert=True) for doc in batch],
+            ordered=False
+        )
+        await db.ai_articles.delete_many({"_id": {"$in": [doc["_id"] for doc in batch]}})
+        archived += len(batch)
+    
+    return {"success": True, "archived": archived, "cutoff": cutoff.isoformat()}
@@ -1,33 +1,115 @@
 """
 RSS polling worker for fetching and processing news feeds.
 """
-import asyncio
-import xml.etree.ElementTree as ET
-from datetime import datetime, timezone
-from typing import List, Dict, Any, Optional
+import threading
+from datetime import datetime, timezone, timedelta
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Set
+import redis
 import structlog
+from bs4 import BeautifulSoup
+from celery.signals import worker_ready, worker_shutdown
+from celery.utils.nodenames import worker_direct
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import DuplicateKeyError
 from backend.config import settings
 from backend.database import get_database
 from backend.models import Source, RawArticle
-from utils.scraper import ArticleScraper, generate_feed_item_id, normalize_url
-from workers.celery_app import celery_app
+from utils.blob_store import HtmlBlobStore
+from utils.boilerplate import BoilerplateFilter
+from utils.circuit_breaker import DomainCircuitBreaker, counts_against_domain
+from utils.extractor_stats import ExtractorStats
+from utils.feed_parser import iter_feed_items, parse_feed_date
+from utils.http_pool import get_session
+from utils.publishers import PublisherDirectory, domain_of
+from utils.relevance import DEPRIORITIZE, DROP, KEEP, RelevanceFilter
+from utils.canonical_url import canonicalize_url, extract_canonical_url, is_plausible_canonical
+from utils.scraper import ArticleScraper, generate_feed_item_id
+from utils.sharding import ConsistentHashRing, WorkerLeaseRegistry
+from utils.url_resolver import UrlResolver
+from workers.celery_app import celery_app, run_async
 from workers.ai_processor import process_article_with_ai
 
 logger = structlog.get_logger(__name__)
 
+_heartbeat_stop = threading.Event()
+
+
+def _lease_registry() -> WorkerLeaseRegistry:
+    """Create the poller lease registry backed by the Celery Redis instance."""
+    return WorkerLeaseRegistry(
+        redis.Redis.from_url(settings.redis_url),
+        ttl_seconds=settings.poller_lease_ttl_seconds
+    )
+
+
+@worker_ready.connect
+def _start_poller_heartbeat(sender=None, **kwargs):
+    """Register this worker as a poller and keep its lease alive."""
+    if not settings.poller_sharding_enabled or sender is None:
+        return
+    
+    # Only workers consuming the RSS queue take part in source sharding
+    consume_from = sender.app.amqp.queues.consume_from
+    if consume_from and 'rss_polling' not in consume_from:
+        return
+    
+    worker_id = sender.hostname
+    registry = _lease_registry()
+    interval = max(1, settings.poller_lease_ttl_seconds // 3)
+    
+    def _heartbeat():
+        while True:
+            try:
+                registry.heartbeat(worker_id)
+            except Exception as e:
+                logger.warning("Poller heartbeat failed", worker_id=worker_id, error=str(e))
+            if _heartbeat_stop.wait(interval):
+                break
+    
+    threading.Thread(target=_heartbeat, name="poller-heartbeat", daemon=True).start()
+    logger.info("Registered RSS poller worker", worker_id=worker_id)
+
+
+@worker_shutdown.connect
+def _stop_poller_heartbeat(sender=None, **kwargs):
+    """Release this worker's lease so its sources rebalance immediately."""
+    if not settings.poller_sharding_enabled or sender is None:
+        return
+    
+    _heartbeat_stop.set()
+    try:
+        _lease_registry().release(sender.hostname)
+    except Exception as e:
+        logger.warning("Failed to release poller lease", error=str(e))
+
 
 @celery_app.task(bind=True, max_retries=3)
 def poll_rss_feeds(self):
-    """Poll RSS feeds and process new articles."""
+    """Poll RSS feeds, fanning sources out across live poller workers."""
     try:
         logger.info("Starting RSS polling task")
         
-        # Run async task
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        result = loop.run_until_complete(_poll_rss_feeds_async())
-        loop.close()
+        members = []
+        if settings.poller_sharding_enabled:
+            try:
+                members = _lease_registry().live_workers()
+            except Exception as e:
+                logger.warning("Could not read poller leases, polling inline", error=str(e))
+        
+        if members:
+            # Every shard gets the same membership snapshot so the ring agrees
+            for member in members:
+                poll_rss_shard.apply_async(
+                    args=[member, members],
+                    queue=worker_direct(member),
+                    expires=settings.poll_interval_seconds
+                )
+            
+            logger.info("Dispatched RSS polling shards", shards=len(members))
+            return {"dispatched": len(members), "timestamp": datetime.utcnow().isoformat()}
+        
+        # Run async task on the worker's persistent loop
+        result = run_async(_poll_rss_feeds_async())
         
         logger.info("RSS polling task completed", articles_processed=result.get('processed', 0))
         return result
@@ -37,7 +119,27 @@ def poll_rss_feeds(self):
         raise self.retry(exc=e, countdown=60)
 
 
-async def _poll_rss_feeds_async() -> Dict[str, Any]:
+@celery_app.task(bind=True, max_retries=0)
+def poll_rss_shard(self, worker_id: str, members: List[str]):
+    """Poll the sources that hash to this worker on the membership ring."""
+    try:
+        logger.info("Starting RSS shard polling", worker_id=worker_id, members=len(members))
+        
+        # Run async task on the worker's persistent loop
+        result = run_async(_poll_rss_feeds_async(worker_id, members))
+        
+        logger.info("RSS shard polling completed", 
+                   worker_id=worker_id, 
+                   articles_processed=result.get('processed', 0))
+        return result
+    
+    except Exception as e:
+        logger.error("RSS shard polling failed", worker_id=worker_id, error=str(e))
+        return {"processed": 0, "errors": 1, "error": str(e)}
+
+
+async def _poll_rss_feeds_async(worker_id: Optional[str] = None,
+                                members: Optional[List[str]] = None) -> Dict[str, Any]:
     """Async RSS polling logic."""
     db = await get_database()
     
@@ -48,23 +150,32 @@ async def _poll_rss_feeds_async() -> Dict[str, Any]:
         logger.warning("No RSS sources found")
         return {"processed": 0, "errors": 0}
     
+    if worker_id and members:
+        ring = ConsistentHashRing(members, replicas=settings.poller_ring_replicas)
+        sources = [s for s in sources if ring.get_node(str(s['_id'])) == worker_id]
+    
+    owner = worker_id or "inline"
+    publishers = await PublisherDirectory.load(db)
     total_processed = 0
     total_errors = 0
     
     for source in sources:
+        # A lease keeps a source from being polled twice while shards rebalance
+        if not await _claim_source(db, source, owner):
+            logger.info("Source leased by another poller", source=source['name'])
+            continue
+        
         try:
             logger.info("Polling RSS source", source_name=source['name'])
             
-            # Fetch and parse RSS feed
-            articles = await _fetch_rss_feed(source['url'])
-            
-            if not articles:
-                logger.warning("No articles found in RSS feed", source=source['name'])
-                continue
+            # Fetch RSS feed; items are parsed lazily while being processed
+            known_ids = await _recent_feed_item_ids(db, source)
+            articles = await _fetch_rss_feed(source['url'], known_ids, publishers)
             
             # Process each article
             processed_count = await _process_articles(articles, source, db)
             total_processed += processed_count
+            await publishers.flush(db)
             
             # Update source last_polled timestamp
             await db.sources.update_one(
@@ -81,133 +192,131 @@ async def _poll_rss_feeds_async() -> Dict[str, Any]:
                         source=source.get('name', 'unknown'), 
                         error=str(e))
             total_errors += 1
+        
+        finally:
+            await _release_source(db, source, owner)
     
     return {
         "processed": total_processed,
         "errors": total_errors,
+        "sources": len(sources),
         "timestamp": datetime.utcnow().isoformat()
     }
 
 
-async def _fetch_rss_feed(url: str) -> List[Dict[str, Any]]:
-    """Fetch and parse RSS feed."""
-    import aiohttp
-    
-    async with aiohttp.ClientSession() as session:
-        try:
-            async with session.get(url, timeout=30) as response:
-                if response.status != 200:
-                    logger.error("Failed to fetch RSS feed", url=url, status=response.status)
-                    return []
-                
-                content = await response.text()
-                return _parse_rss_content(content)
-                
-        except Exception as e:
-            logger.error("Error fetching RSS feed", url=url, error=str(e))
-            return []
+async def _claim_source(db, source: Dict[str, Any], owner: str) -> bool:
+    """Take the polling lease on a source if it is free, expired or already ours."""
+    now = datetime.utcnow()
+    result = await db.sources.update_one(
+        {
+            "_id": source['_id'],
+            "$or": [
+                {"poll_lease_until": {"$exists": False}},
+                {"poll_lease_until": {"$lt": now}},
+                {"poll_lease_owner": owner}
+            ]
+        },
+        {"$set": {
+            "poll_lease_owner": owner,
+            "poll_lease_until": now + timedelta(seconds=settings.poller_source_lease_seconds)
+        }}
+    )
+    return result.matched_count == 1
 
 
-def _parse_rss_content(content: str) -> List[Dict[str, Any]]:
-    """Parse RSS XML content."""
-    try:
-        root = ET.fromstring(content)
-        
-        # Handle different RSS namespaces
-        items = []
-        
-        # Try different item selectors
-        for item in root.findall('.//item'):
-            try:
-                title = _get_text(item, 'title')
-                link = _get_text(item, 'link')
-                description = _get_text(item, 'description')
-                pub_date = _get_text(item, 'pubDate')
-                
-                if not title or not link:
-                    continue
-                
-                # Parse publication date
-                published_at = _parse_pub_date(pub_date) if pub_date else datetime.utcnow()
-                
-                # Extract publisher from description or link
-                publisher = _extract_publisher(description, link)
-                
-                items.append({
-                    'title': title,
-                    'link': link,
-                    'description': description or '',
-                    'pub_date': pub_date or '',
-                    'published_at': published_at,
-                    'publisher': publisher
-                })
-                
-            except Exception as e:
-                logger.warning("Error parsing RSS item", error=str(e))
-                continue
-        
-        logger.info("Parsed RSS feed", items_count=len(items))
-        return items
-        
-    except Exception as e:
-        logger.error("Error parsing RSS content", error=str(e))
-        return []
+async def _release_source(db, source: Dict[str, Any], owner: str):
+    """Give up the polling lease on a source."""
+    await db.sources.update_one(
+        {"_id": source['_id'], "poll_lease_owner": owner},
+        {"$unset": {"poll_lease_owner": "", "poll_lease_until": ""}}
+    )
 
 
-def _get_text(element, tag_name: str) -> Optional[str]:
-    """Get text content from XML element."""
+async def _fetch_rss_feed(url: str, known_ids: Optional[Set[str]] = None,
+                          publishers: Optional[PublisherDirectory] = None) -> Iterator[Dict[str, Any]]:
+    """Fetch an RSS feed and return a lazy iterator over its articles."""
+    session = get_session()
     try:
-        elem = element.find(tag_name)
-        return elem.text.strip() if elem is not None and elem.text else None
-    except:
-        return None
-
-
-def _parse_pub_date(pub_date: str) -> datetime:
-    """Parse publication date from various formats."""
-    from dateutil import parser
+        async with session.get(url, timeout=30) as response:
+            if response.status != 200:
+                logger.error("Failed to fetch RSS feed", url=url, status=response.status)
+                return iter(())
+            
+            # Hand raw bytes to the parser so the XML declaration picks the encoding
+            content = await response.read()
     
-    try:
-        return parser.parse(pub_date)
-    except:
-        return datetime.utcnow()
+    except Exception as e:
+        logger.error("Error fetching RSS feed", url=url, error=str(e))
+        return iter(())
+    
+    return _iter_rss_articles(content, known_ids, publishers or PublisherDirectory())
 
 
-def _extract_publisher(description: str, link: str) -> str:
-    """Extract publisher name from description or link."""
-    if not description and not link:
-        return "Unknown"
+def _iter_rss_articles(content: bytes, known_ids: Optional[Set[str]],
+                       publishers: PublisherDirectory) -> Iterator[Dict[str, Any]]:
+    """Stream articles out of raw feed bytes, stopping at a run of known items."""
+    def _is_known(fields: Dict[str, Any]) -> bool:
+        return generate_feed_item_id(fields['link'], fields['pub_date'] or '') in known_ids
     
-    # Try to extract from description
-    if description:
-        # Look for common publisher patterns
-        import re
-        patterns = [
-            r'via\s+([A-Za-z\s]+)',
-            r'from\s+([A-Za-z\s]+)',
-            r'by\s+([A-Za-z\s]+)',
-        ]
+    items_count = 0
+    for fields in iter_feed_items(content,
+                                  is_known=_is_known if known_ids else None,
+                                  known_run_limit=settings.feed_known_run_limit):
+        try:
+            pub_date = fields['pub_date']
+            
+            # Parse publication date
+            published_at = parse_feed_date(pub_date) if pub_date else datetime.utcnow()
+            
+            # Prefer the feed's <source> element, then the domain table, then a guess
+            publisher = publishers.resolve(
+                source_name=fields['source_name'],
+                source_url=fields['source_url'],
+                description=fields['description'],
+                link=fields['link']
+            )
+            
+            items_count += 1
+            yield {
+                'title': fields['title'],
+                'link': fields['link'],
+                'description': fields['description'] or '',
+                'pub_date': pub_date or '',
+                'published_at': published_at,
+                'publisher': publisher
+            }
         
-        for pattern in patterns:
-            match = re.search(pattern, description, re.IGNORECASE)
-            if match:
-                return match.group(1).strip()
+        except Exception as e:
+            logger.warning("Error parsing RSS item", error=str(e))
+            continue
     
-    # Try to extract from domain
-    if link:
-        from urllib.parse import urlparse
-        domain = urlparse(link).netloc
-        if domain:
-            # Remove www. and common TLDs
-            domain = domain.replace('www.', '')
-            domain = domain.split('.')[0]
-            return domain.title()
+    logger.info("Parsed RSS feed", items_count=items_count)
+
+
+async def _recent_feed_item_ids(db, source: Dict[str, Any]) -> Set[str]:
+    """Load feed item ids recently seen for a source, for early parse stop."""
+    since = datetime.utcnow() - timedelta(hours=settings.feed_known_window_hours)
+    cursor = db.raw_articles.find(
+        {"source_id": source['_id'], "last_seen": {"$gte": since}},
+        {"feed_item_id": 1, "alias_feed_item_ids": 1}
+    )
     
-    return "Unknown"
+    known_ids = set()
+    async for doc in cursor:
+        known_ids.add(doc['feed_item_id'])
+        known_ids.update(doc.get('alias_feed_item_ids', []))
+    return known_ids
 
 
-async def _process_articles(articles: List[Dict[str, Any]], source: Dict[str, Any], db) -> int:
+async def _process_articles(articles: Iterable[Dict[str, Any]], source: Dict[str, Any], db) -> int:
     """Process articles from RSS feed."""
+    async with UrlResolver(db, session=get_session()) as resolver:
+        return await _store_new_articles(articles, source, db, resolver)
+
+
+async def _store_new_articles(articles: Iterable[Dict[str, Any]], source: Dict[str, Any],
+                              db, resolver: UrlResolver) -> int:
+    """Insert raw records for unseen feed items and queue their processing."""
     processed_count = 0
     
     for article_data in articles:
@@ -226,36 +335,45 @@ async def _process_articles(articles: List[Dict[str, Any]], source: Dict[str, An
                 )
                 continue
             
-            # Normalize URL
-            normalized_url = normalize_url(article_data['link'])
+            # Resolve aggregator redirects to the publisher's URL, then canonicalize
+            resolved_url = await resolver.resolve(article_data['link'], article_data.get('description'))
+            canonical_url = canonicalize_url(resolved_url)
+            
+            # The same story under a new pubDate or from another source is not new
+            if await _mark_seen_by_canonical_url(db, canonical_url, feed_item_id):
+                continue
             
             # Create raw article record
             raw_article = {
                 "source_id": source['_id'],
                 "feed_item_id": feed_item_id,
-                "url": normalized_url,
+                "url": canonical_url,
+                "canonical_url": canonical_url,
+                "feed_url": article_data['link'],
+                "title": article_data['title'],
+                "description": article_data.get('description', ''),
+                "publisher": article_data['publisher'],
+                "published_at": article_data['published_at'],
                 "raw_xml_item": str(article_data),  # Store as string for now
                 "created_at": datetime.utcnow(),
                 "last_seen": datetime.utcnow(),
                 "fetch_status": "fetched"
             }
             
-            # Insert raw article
-            result = await db.raw_articles.insert_one(raw_article)
+            # Insert raw article; the unique canonical_url index settles races between pollers
+            try:
+                result = await db.raw_articles.insert_one(raw_article)
+            except DuplicateKeyError:
+                await _mark_seen_by_canonical_url(db, canonical_url, feed_item_id)
+                continue
             raw_article_id = result.inserted_id
             
             logger.info("Created raw article record", 
                        raw_article_id=str(raw_article_id),
-                       url=normalized_url)
+                       url=canonical_url)
             
-            # Queue AI processing task
-            process_article_with_ai.delay(
-                raw_article_id=str(raw_article_id),
-                title=article_data['title'],
-                url=normalized_url,
-                publisher=article_data['publisher'],
-                published_at=article_data['published_at'].isoformat()
-            )
+            # Queue scraping; AI enrichment is queued once text is available
+            scrape_article_content.delay(str(raw_article_id))
             
             processed_count += 1
             
@@ -268,17 +386,42 @@ async def _process_articles(articles: List[Dict[str, Any]], source: Dict[str, An
     return processed_count
 
 
+async def _mark_seen_by_canonical_url(db, canonical_url: str, feed_item_id: str) -> bool:
+    """Record a sighting against the article already stored for a canonical URL."""
+    result = await db.raw_articles.update_one(
+        {"canonical_url": canonical_url},
+        {
+            "$set": {"last_seen": datetime.utcnow()},
+            "$addToSet": {"alias_feed_item_ids": feed_item_id}
+        }
+    )
+    if result.matched_count:
+        logger.debug("Skipping already stored article", canonical_url=canonical_url)
+    return bool(result.matched_count)
+
+
+def _description_fallback(raw_article: Dict[str, Any], failure: Optional[str]) -> Optional[str]:
+    """Plain text of the feed description, when the page itself cannot be scraped."""
+    if not settings.scrape_description_fallback:
+        return None
+    if failure != "circuit_open" and not counts_against_domain(failure):
+        return None
+    
+    description = raw_article.get('description') or ''
+    text = BeautifulSoup(description, 'html.parser').get_text(separator=' ', strip=True)
+    if len(text) < settings.description_fallback_min_length:
+        return None
+    return text
+
+
 @celery_app.task(bind=True, max_retries=3)
 def scrape_article_content(self, raw_article_id: str):
     """Scrape content for a raw article."""
     try:
         logger.info("Starting article scraping", raw_article_id=raw_article_id)
         
-        # Run async task
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        result = loop.run_until_complete(_scrape_article_content_async(raw_article_id))
-        loop.close()
+        # Run async task on the worker's persistent loop
+        result = run_async(_scrape_article_content_async(raw_article_id))
         
         logger.info("Article scraping completed", raw_article_id=raw_article_id)
         return result
@@ -303,36 +446,79 @@ async def _scrape_article_content_async(raw_article_id: str) -> Dict[str, Any]:
     
     try:
         # Scrape article content
-        async with ArticleScraper() as scraper:
+        async with ArticleScraper(extractor_stats=ExtractorStats(db),
+                                  circuit_breaker=DomainCircuitBreaker(db)) as scraper:
             raw_html, scraped_text, success = await scraper.fetch_article(raw_article['url'])
+            failure = scraper.last_failure
         
-        # Update raw article with scraped content
+        # Drop paragraphs this site repeats on every page before anything reads the text
+        if success and scraped_text:
+            scraped_text, tokens_saved = await BoilerplateFilter(db).clean(
+                domain_of(raw_article['url']), scraped_text, raw_article['url']
+            )
+        else:
+            tokens_saved = 0
+        
+        # Update raw article with scraped content; the HTML itself lives in the blob store
         update_data = {
-            "raw_html": raw_html,
             "scraped_text": scraped_text,
             "scraped_at": datetime.utcnow(),
             "fetch_status": "fetched" if success else "failed"
         }
+        if tokens_saved:
+            update_data["boilerplate_tokens_saved"] = tokens_saved
+        if raw_html:
+            update_data["raw_html_ref"] = await HtmlBlobStore(db).put(raw_html)
+            update_data["raw_html_size"] = len(raw_html.encode("utf-8"))
         
         if not success:
-            update_data["fetch_error"] = "Failed to extract content"
-        
-        await db.raw_articles.update_one(
-            {"_id": ObjectId(raw_article_id)},
-            {"$set": update_data}
-        )
+            update_data["fetch_error"] = failure or "Failed to extract content"
+            
+            # Blocked or cooling-down domains still get enriched from the feed's own text
+            fallback_text = _description_fallback(raw_article, failure)
+            if fallback_text:
+                scraped_text = fallback_text
+                success = True
+                update_data["scraped_text"] = fallback_text
+                update_data["fetch_status"] = "description_fallback"
         
+        # Off-topic items are not worth an OpenAI call
+        decision = KEEP
         if success and scraped_text:
-            # Queue AI processing
-            process_article_with_ai.delay(
-                raw_article_id=raw_article_id,
-                title=raw_article.get('title', ''),
-                url=raw_article['url'],
-                publisher=raw_article.get('publisher', 'Unknown'),
-                published_at=raw_article.get('published_at', datetime.utcnow()).isoformat()
+            score, decision = await RelevanceFilter(db).assess(raw_article.get('title') or '', scraped_text)
+            if score is not None:
+                update_data["relevance_score"] = score
+                update_data["relevance_decision"] = decision
+        
+        if success and decision != DROP:
+            update = {"$set": update_data, "$unset": {"expire_at": ""}}
+        else:
+            update_data["expire_at"] = _failed_fetch_expiry()
+            update = {"$set": update_data}
+        await db.raw_articles.update_one({"_id": ObjectId(raw_article_id)}, update)
+        
+        # The page's rel=canonical may reveal an article we already have
+        duplicate_of = await _apply_declared_canonical(db, raw_article, raw_html)
+        if duplicate_of:
+            return {"success": success, "scraped": bool(scraped_text), "duplicate_of": str(duplicate_of)}
+        
+        if decision == DROP:
+            logger.info("Skipping enrichment of irrelevant article",
+                       raw_article_id=raw_article_id, relevance=update_data.get("relevance_score"))
+        elif success and scraped_text:
+            # Queue AI processing; low-relevance items wait behind the rest
+            process_article_with_ai.apply_async(
+                kwargs={
+                    "raw_article_id": raw_article_id,
+                    "title": raw_article.get('title', ''),
+                    "url": raw_article['url'],
+                    "publisher": raw_article.get('publisher', 'Unknown'),
+                    "published_at": raw_article.get('published_at', datetime.utcnow()).isoformat()
+                },
+                priority=settings.relevance_low_priority if decision == DEPRIORITIZE else None
             )
         
-        return {"success": success, "scraped": bool(scraped_text)}
+        return {"success": success, "scraped": bool(scraped_text), "relevance": decision}
         
     except Exception as e:
         logger.error("Error scraping article", raw_article_id=raw_article_id, error=str(e))
@@ -342,8 +528,50 @@ async def _scrape_article_content_async(raw_article_id: str) -> Dict[str, Any]:
             {"_id": ObjectId(raw_article_id)},
             {"$set": {
                 "fetch_status": "failed",
-                "fetch_error": str(e)
+                "fetch_error": str(e),
+                "expire_at": _failed_fetch_expiry()
             }}
         )
         
         return {"success": False, "error": str(e)}
+
+
+def _failed_fetch_expiry() -> datetime:
+    """When a failed fetch is dropped by the raw_articles expire_at TTL index."""
+    return datetime.utcnow() + timedelta(days=settings.failed_fetch_retention_days)
+
+
+async def _apply_declared_canonical(db, raw_article: Dict[str, Any], raw_html: Optional[str]):
+    """
+    Adopt the canonical URL declared by the page.
+    
+    Returns the id of the existing raw article when another record already
+    owns that canonical URL, in which case this one is marked as its duplicate.
+    Canonicals pointing at a home page or another host are ignored.
+    """
+    declared = extract_canonical_url(raw_html, raw_article['url']) if raw_html else None
+    if not declared or declared == raw_article.get('canonical_url'):
+        return None
+    if not is_plausible_canonical(declared, raw_article['url']):
+        logger.debug("Ignoring implausible canonical URL", url=raw_article['url'], canonical_url=declared)
+        return None
+    
+    try:
+        await db.raw_articles.update_one(
+            {"_id": raw_article['_id']},
+            {"$set": {"canonical_url": declared}}
+        )
+        return None
+    except DuplicateKeyError:
+        original = await db.raw_articles.find_one({"canonical_url": declared}, {"_id": 1})
+        if not original:
+            return None
+        
+        await db.raw_articles.update_one(
+            {"_id": raw_article['_id']},
+            {"$set": {"duplicate_of": original['_id']}}
+        )
+        logger.info("Scraped article duplicates an existing one",
+                   raw_article_id=str(raw_article['_id']),
+                   duplicate_of=str(original['_id']))
+        return original['_id']
@@ -0,0 +1,73 @@
+"""
+Maintenance tasks for the raw HTML blob store.
+"""
+from datetime import datetime, timedelta
+from typing import Any, Dict
+import structlog
+from backend.config import settings
+from backend.database import get_database
+from utils.blob_store import HtmlBlobStore
+from workers.celery_app import celery_app, run_async
+
+logger = structlog.get_logger(__name__)
+
+
+@celery_app.task
+def prune_html_blobs():
+    """Delete raw HTML blobs unused for html_retention_days."""
+    try:
+        result = run_async(_prune_html_blobs_async())
+        logger.info("Pruned HTML blobs", **result)
+        return result
+    
+    except Exception as e:
+        logger.error("HTML blob pruning failed", error=str(e))
+        return {"success": False, "error": str(e)}
+
+
+async def _prune_html_blobs_async() -> Dict[str, Any]:
+    """Async pruning logic."""
+    db = await get_database()
+    cutoff = datetime.utcnow() - timedelta(days=settings.html_retention_days)
+    
+    pruned = await HtmlBlobStore(db).prune(cutoff)
+    return {"success": True, "pruned": pruned, "cutoff": cutoff.isoformat()}
+
+
+@celery_app.task
+def migrate_inline_raw_html(batch_size: int = 200):
+    """Move raw_html still stored inline on raw_articles into the blob store."""
+    try:
+        result = run_async(_migrate_inline_raw_html_async(batch_size))
+        logger.info("Migrated inline raw HTML", **result)
+        return result
+    
+    except Exception as e:
+        logger.error("Inline raw HTML migration failed", error=str(e))
+        return {"success": False, "error": str(e)}
+
+
+async def _migrate_inline_raw_html_async(batch_size: int) -> Dict[str, Any]:
+    """Async migration logic; re-queues itself until no inline HTML is left."""
+    db = await get_database()
+    store = HtmlBlobStore(db)
+    
+    migrated = 0
+    cursor = db.raw_articles.find(
+        {"raw_html": {"$type": "string"}},
+        {"raw_html": 1}
+    ).limit(batch_size)
+    
+    async for doc in cursor:
+        ref = await store.put(doc["raw_html"])
+        await db.raw_articles.update_one(
+            {"_id": doc["_id"]},
+            {"$set": {"raw_html_ref": ref, "raw_html_size": len(doc["raw_html"].encode("utf-8"))},
+             "$unset": {"raw_html": ""}}
+        )
+        migrated += 1
+    
+    if migrated == batch_size:
+        migrate_inline_raw_html.delay(batch_size)
+    
+    return {"success": True, "migrated": migrated}